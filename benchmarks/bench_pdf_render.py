@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+PDF 렌더링 벤치마크
+페이지 수별로 단일 프로세스 / 작업자 프로세스 렌더링 시간을 비교합니다.
+
+    python benchmarks/bench_pdf_render.py --pages 10 50 200 --workers 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.pdf_converter import PDFConverter, PYMUPDF_AVAILABLE
+
+
+def _make_pdf(path: str, page_count: int) -> None:
+    """표 형태의 텍스트가 있는 테스트 PDF 생성"""
+    import fitz
+    with fitz.open() as doc:
+        for number in range(page_count):
+            page = doc.new_page()
+            for row in range(40):
+                y = 72 + row * 16
+                page.draw_line((72, y - 12), (540, y - 12))
+                page.insert_text((80, y), f"DMCA-{number}-{row}N-SA    {row + 1}")
+        doc.save(path)
+
+
+def _render_seconds(converter: PDFConverter, pdf_path: str) -> float:
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        converter.convert_to_images(pdf_path, output_folder)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 렌더링 벤치마크")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=8, help="작업자당 페이지 수")
+    parser.add_argument("--dpi", type=int, default=300)
+    args = parser.parse_args()
+
+    if not PYMUPDF_AVAILABLE:
+        print("PyMuPDF가 설치되지 않았습니다: pip install PyMuPDF")
+        return
+
+    sequential = PDFConverter(args.dpi, render_workers=1, chunk_pages=args.chunk)
+    parallel = PDFConverter(args.dpi, render_workers=args.workers, chunk_pages=args.chunk)
+    print(f"DPI {args.dpi}, 작업자 {args.workers}개, 작업자당 {args.chunk}페이지")
+    print(f"{'페이지':>6} {'단일(초)':>10} {'병렬(초)':>10} {'속도 향상':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for page_count in args.pages:
+            pdf_path = os.path.join(work_dir, f"bench_{page_count}.pdf")
+            _make_pdf(pdf_path, page_count)
+            single = _render_seconds(sequential, pdf_path)
+            multi = _render_seconds(parallel, pdf_path)
+            print(f"{page_count:>6} {single:>10.2f} {multi:>10.2f} {single / multi:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,57 +3,532 @@
 주문서 OCR 처리 도구
 리팩토링된 메인 진입점
 """
+from __future__ import annotations
+
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
+import argparse
+import datetime
+import multiprocessing
+import signal
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.gui.main_window import MainWindow
-from src.core.document_processor import DocumentProcessor
-from src.utils.file_utils import save_json_result
-from src.config.settings import app_settings
+# CLI 시작 시에는 설정만 불러오고, 처리 파이프라인 / 서버 / 색인 / 내보내기 모듈은 사용하는 모드 함수에서 불러옴
+# (GUI 모듈(PyQt5)은 main_gui에서 불러옴: 헤드리스 서버에서 Qt 불필요)
+from src.config.settings import app_settings, import_qt_settings
+from src.config.runtime import RuntimeConfig
 
+if TYPE_CHECKING:
+    from src.core.document_processor import DocumentProcessor
+    from src.core.hedging import HedgingPolicy
+    from src.core.search_index import SearchIndex
+    from src.models.document import ProcessedDocument
+    from src.utils.cancellation import CancellationToken
+
+
+def _process_files(
+    processor: DocumentProcessor,
+    file_paths: List[str],
+    output_dir: Optional[str] = None,
+    jsonl: bool = False,
+    history: Optional[SearchIndex] = None,
+    cancel_token: Optional[CancellationToken] = None
+) -> Iterator[ProcessedDocument]:
+    """파일들을 하나씩 처리하고 결과를 저장한 뒤 문서를 넘겨줌"""
+    from src.utils.file_utils import append_jsonl_result, save_json_result
+
+    for index, file_path in enumerate(file_paths):
+        print(f"문서 처리 시작: {file_path}")
+
+        # 이전 실행에서 같은 설정으로 끝난 파일은 API를 호출하지 않고 기록된 결과를 저장 (--reprocess면 다시 처리)
+        try:
+            document = processor.completed_document(file_path)
+        except OSError:
+            document = None
+        if document is not None:
+            print(f"이전 실행에서 처리를 마친 파일이라 기록된 결과를 사용합니다 (항목 {document.total_items}개)")
+        else:
+            try:
+                # 문서 처리
+                document = processor.process_document(file_path, cancel_token=cancel_token)
+            except Exception as e:
+                print(f"오류 발생: {e}")
+                continue
+
+        # 결과 저장 (JSON Lines 모드면 날짜별 파일에 한 줄 추가)
+        if jsonl:
+            output_file = append_jsonl_result(document.to_dict(), output_dir)
+        else:
+            output_file = save_json_result(document.to_dict(), file_path, output_dir)
+
+        # 검색 이력 색인에 추가
+        if history is not None:
+            try:
+                history.add_document(document, doc_key=document.source_key)
+            except Exception as e:
+                print(f"경고: 검색 색인 추가 실패: {e}")
 
-def main_cli(file_path: str = None):
-    """CLI 모드 실행"""
-    if not file_path:
-        file_path = "./data/주문서 (미국).pdf"
-    
-    print(f"문서 처리 시작: {file_path}")
-    
-    # API 키 확인 (모킹 모드가 아닌 경우)
-    if not app_settings.mock_mode and not app_settings.api_key:
-        print("오류: OpenAI API 키가 설정되지 않았습니다.")
-        print("설정에서 API 키를 입력하거나 모킹 모드를 활성화해주세요.")
-        return
-    
-    try:
-        # 문서 처리
-        processor = DocumentProcessor()
-        document = processor.process_document(file_path)
-        
-        # 결과 저장
-        output_file = save_json_result(document.to_dict(), file_path)
-        
         print(f"\n결과가 다음 파일에 저장되었습니다: {output_file}")
         print(f"추출된 항목 수: {document.total_items}")
-        print(f"추정 API 비용: {app_settings.format_cost(document.processing_cost)}")
-        
+        if document.invalid_row_count:
+            print(f"검증 실패로 제외된 행 수: {document.invalid_row_count} (결과 파일의 invalid_rows 참고)")
+        print(f"추정 API 비용: {processor.config.format_cost(document.processing_cost)}")
+        escalated = [page for page in document.pages if len(page.raw_content.get("cascade", [])) > 1]
+        if escalated:
+            print(f"상위 모델로 다시 처리한 페이지: {len(escalated)}개 "
+                  f"({', '.join(str(page.page_number) for page in escalated)}페이지)")
+        retry_pages = document.pages_to_retry
+        if retry_pages:
+            print(f"실패 / 보류된 페이지: {len(retry_pages)}개 "
+                  f"({', '.join(str(page.page_number) for page in retry_pages)}페이지)")
+            for page in retry_pages:
+                if page.raw_content.get("error"):
+                    print(f"  {page.page_number}페이지: {page.raw_content['error']}")
+            if not jsonl:
+                print(f"다시 처리: python main.py --cli \"{file_path}\" --retry \"{output_file}\"")
+
         # 추출된 항목 출력
         if document.total_items > 0:
             print("\n추출된 항목:")
             for i, item in enumerate(document.all_items, 1):
-                print(f"{i:2d}. {item.product_code}: {item.quantity}개")
-        
+                line = f"{i:2d}. {item.product_code}: {item.quantity}개"
+                if processor.catalog is not None:
+                    if item.matched_code is None:
+                        line += "  (카탈로그 미등록)"
+                    elif item.match_distance:
+                        line += f"  → {item.matched_code} (거리 {item.match_distance:g})"
+                print(line)
+
+        yield document
+
+        if cancel_token is not None and cancel_token.cancelled:
+            print(f"작업을 취소했습니다. 처리하지 않은 파일: {len(file_paths) - index - 1}개")
+            return
+
+        # 예산 한도에 걸렸으면 남은 파일도 같은 한도에 걸리므로 대기열 전체를 멈춤
+        if processor.governor is not None and processor.governor.halted:
+            print(f"예산 한도에 도달해 처리를 멈춥니다. 처리하지 않은 파일: {len(file_paths) - index - 1}개")
+            return
+
+
+def _consolidate(documents: Iterator[ProcessedDocument], export_path: Optional[str] = None):
+    """문서들의 항목을 품번별로 통합해 출력하거나 내보내기"""
+    from src.core.aggregation import CONSOLIDATED_COLUMNS, aggregate_documents, iter_consolidated_rows
+    from src.utils.exporters import export_rows
+
+    items = aggregate_documents(documents)
+
+    if export_path:
+        row_count = export_rows(iter_consolidated_rows(items), export_path, CONSOLIDATED_COLUMNS)
+        print(f"\n통합된 {row_count}개 품번을 다음 파일로 내보냈습니다: {export_path}")
+        return
+
+    print("\n품번별 통합:")
+    for item in items:
+        print(f"{item.product_code}\t{item.total_quantity}개\t{item.occurrences}건\t{item.source_text}")
+    print(f"\n{len(items)}개 품번, 합계 수량 {sum(item.total_quantity for item in items)}개")
+
+
+def _print_backend_summary(processor: DocumentProcessor):
+    """백엔드별 차단기 상태 / 헤지 요청 통계 / 지출 한도 출력"""
+    from src.core.circuit_breaker import CircuitBreakerBackend
+    from src.core.hedging import HedgedBackend
+
+    if processor.governor is not None:
+        print(f"[Budget] {processor.governor.summary()}")
+    for backend in processor.scheduler.backends:
+        while backend is not None:
+            if isinstance(backend, CircuitBreakerBackend):
+                print(f"[Circuit] {backend.breaker.summary()}")
+            if isinstance(backend, HedgedBackend) and backend.stats.requests:
+                stats = backend.stats
+                print(f"[{backend.name}] 헤지 요청 {stats.hedges}/{stats.requests}회, "
+                      f"헤지 선착 {stats.wins}회, 예산 초과로 생략 {stats.budget_skips}회, "
+                      f"추가 비용 ${stats.extra_cost:.4f}")
+            backend = getattr(backend, "inner", None)
+
+
+def _preflight(
+    file_paths: List[str],
+    config: RuntimeConfig,
+    cascade_models: Optional[List[str]] = None,
+    budget: Optional[float] = None
+) -> bool:
+    """API 호출 없이 예상 비용 / 소요 시간 출력 (예산을 넘으면 False)"""
+    from src.core.estimator import CostEstimator, LatencyHistory, format_duration
+
+    batch = CostEstimator(config, LatencyHistory(), cascade_models=cascade_models).estimate(file_paths)
+    print("사전 예상 (API 호출 없음):")
+    for estimate in batch.files:
+        if estimate.error:
+            print(f"  {estimate.path}: 확인 오류: {estimate.error}")
+            continue
+        print(f"  {estimate.path}: {estimate.pages}페이지 (API {estimate.ocr_pages}페이지), "
+              f"입력 {estimate.prompt_tokens:,} / 출력 {estimate.completion_tokens:,} 토큰, "
+              f"{config.format_cost(estimate.cost)}, 약 {format_duration(estimate.seconds)}")
+    latency_source = "관측값" if batch.latency_observed else "기본값"
+    print(f"합계: {batch.pages}페이지, 예상 비용 {config.format_cost(batch.cost)} "
+          f"(최대 {config.format_cost(batch.max_cost)}), 예상 소요 시간 {format_duration(batch.seconds)}")
+    print(f"모델 {batch.model}, 페이지당 {batch.latency:.1f}초({latency_source}), 동시 요청 {config.max_concurrency}개"
+          + (f", 분당 {config.requests_per_minute}회" if config.requests_per_minute else ""))
+    if config.mock_mode:
+        print("(모킹 모드: 실제 API 비용은 발생하지 않습니다)")
+    if budget is not None and batch.max_cost > budget:
+        print(f"오류: 최대 예상 비용 ${batch.max_cost:.4f}이(가) 예산 ${budget:.4f}을(를) 넘어 처리하지 않습니다.")
+        return False
+    return True
+
+
+def _build_processor(
+    config: RuntimeConfig,
+    catalog_path: Optional[str] = None,
+    backend_names: Optional[List[str]] = None,
+    replay_paths: Optional[List[str]] = None,
+    hedge_policy: Optional[HedgingPolicy] = None,
+    cascade_models: Optional[List[str]] = None,
+    breaker_fallback: Optional[str] = None
+) -> Optional[DocumentProcessor]:
+    """설정대로 백엔드를 구성한 문서 처리기 생성 (설정 오류면 메시지 출력 후 None)"""
+    from src.core.backends import CAP_OFFLINE, create_backends
+    from src.core.budget import apply_budget, create_governor
+    from src.core.cascade import apply_cascade
+    from src.core.catalog import ProductCatalog
+    from src.core.circuit_breaker import apply_circuit_breakers
+    from src.core.document_processor import DocumentProcessor
+    from src.core.hedging import apply_hedging, hedging_policy_from_settings
+
+    catalog = None
+    if catalog_path:
+        try:
+            catalog = ProductCatalog.from_csv(catalog_path)
+            print(f"품번 카탈로그 로드: {len(catalog)}개 ({catalog_path})")
+        except Exception as e:
+            print(f"오류: 품번 카탈로그를 불러올 수 없습니다: {e}")
+            return None
+
+    try:
+        backends = create_backends(backend_names, replay_paths or (), config)
+        backends = apply_cascade(backends, cascade_models, catalog, config=config)
+        backends = apply_hedging(backends, hedge_policy or hedging_policy_from_settings(config))
+        backends = apply_circuit_breakers(backends, breaker_fallback, config)
+        governor = create_governor(config)
+        backends = apply_budget(backends, governor, config)
+    except ValueError as e:
+        print(f"오류: {e}")
+        return None
+
+    # API 키 확인 (모킹 모드가 아니고 API를 호출하는 백엔드가 있는 경우)
+    if not config.mock_mode and not config.api_key and \
+            any(CAP_OFFLINE not in backend.capabilities for backend in backends):
+        print("오류: OpenAI API 키가 설정되지 않았습니다.")
+        print("설정에서 API 키를 입력하거나 모킹 모드를 활성화해주세요.")
+        return None
+
+    return DocumentProcessor(catalog=catalog, backends=backends, config=config, governor=governor)
+
+
+def main_cli(
+    file_paths: Optional[List[str]] = None,
+    export_path: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    jsonl: bool = False,
+    catalog_path: Optional[str] = None,
+    consolidate: bool = False,
+    backend_names: Optional[List[str]] = None,
+    replay_paths: Optional[List[str]] = None,
+    hedge_policy: Optional[HedgingPolicy] = None,
+    cascade_models: Optional[List[str]] = None,
+    breaker_fallback: Optional[str] = None,
+    config: Optional[RuntimeConfig] = None,
+    estimate_only: bool = False,
+    budget: Optional[float] = None
+):
+    """CLI 모드 실행"""
+    from src.core.search_index import SearchIndex
+    from src.utils.cancellation import CancellationToken
+    from src.utils.exporters import export_documents
+
+    if not file_paths:
+        file_paths = ["./data/주문서 (미국).pdf"]
+    config = config or RuntimeConfig.load()
+
+    # 사전 예상 (--estimate면 예상만 출력, --budget을 넘으면 처리하지 않음)
+    if estimate_only or budget is not None:
+        if not _preflight(file_paths, config, cascade_models, budget) or estimate_only:
+            return
+
+    processor = _build_processor(config, catalog_path, backend_names, replay_paths, hedge_policy,
+                                 cascade_models, breaker_fallback)
+    if processor is None:
+        return
+    try:
+        history = SearchIndex()
     except Exception as e:
-        print(f"오류 발생: {e}")
+        print(f"경고: 검색 색인을 열 수 없습니다: {e}")
+        history = None
+    # Ctrl+C는 처리 중인 페이지를 기다리지 않고 완료된 페이지까지 저장한 뒤 멈춤 (한 번 더 누르면 즉시 종료)
+    cancel_token = CancellationToken()
+
+    def cancel(signum, frame):
+        print("\n취소 요청: 완료된 페이지까지 저장하고 멈춥니다...")
+        cancel_token.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    previous_handler = signal.signal(signal.SIGINT, cancel)
+    documents = _process_files(processor, file_paths, output_dir, jsonl, history, cancel_token)
+
+    try:
+        if consolidate:
+            try:
+                _consolidate(documents, export_path)
+            except Exception as e:
+                print(f"통합 오류: {e}")
+        elif not export_path:
+            for _ in documents:
+                pass
+        else:
+            # 처리된 문서들을 하나의 파일로 내보내기 (문서 단위 스트리밍)
+            try:
+                row_count = export_documents(documents, export_path)
+                print(f"\n{row_count}개 항목을 다음 파일로 내보냈습니다: {export_path}")
+            except Exception as e:
+                print(f"내보내기 오류: {e}")
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        processor.close()
+
+    _print_backend_summary(processor)
+
+
+def main_retry(result_path: str, file_path: Optional[str] = None, config: Optional[RuntimeConfig] = None):
+    """결과 파일에서 실패 / 보류된 페이지만 원본 파일로 다시 처리해 같은 결과 파일에 저장"""
+    from src.core.document_processor import DocumentProcessor
+    from src.models.document import ProcessedDocument
+    from src.utils.file_utils import load_json_result
+    from src.utils.serialization import dumps
+
+    try:
+        document = ProcessedDocument.from_dict(load_json_result(result_path))
+    except (OSError, ValueError) as e:
+        print(f"오류: 결과 파일을 읽을 수 없습니다: {e}")
+        return
+    if not document.pages_to_retry:
+        print("다시 처리할 페이지가 없습니다.")
+        return
+    file_path = file_path or os.path.join(os.path.dirname(result_path), document.filename)
+    if not os.path.exists(file_path):
+        print(f"오류: 원본 파일을 찾을 수 없습니다: {file_path} (--cli로 원본 파일 경로 지정)")
+        return
+
+    config = config or RuntimeConfig.load()
+    if not config.mock_mode and not config.api_key:
+        print("오류: OpenAI API 키가 설정되지 않았습니다.")
+        return
+    processor = DocumentProcessor(config=config)
+    try:
+        document = processor.retry_failed_pages(document, file_path)
+    finally:
+        processor.close()
+    with open(result_path, 'wb') as f:
+        f.write(dumps(document.to_dict(), pretty=True))
+
+    remaining = document.pages_to_retry
+    print(f"결과 파일을 갱신했습니다: {result_path} (항목 {document.total_items}개, "
+          f"비용 {config.format_cost(document.processing_cost)})")
+    if remaining:
+        print(f"아직 실패 / 보류된 페이지: {', '.join(str(page.page_number) for page in remaining)}")
+
+
+def main_watch(
+    directory: str,
+    config: RuntimeConfig,
+    workers: int = 2,
+    use_inotify: bool = True,
+    catalog_path: Optional[str] = None,
+    backend_names: Optional[List[str]] = None,
+    replay_paths: Optional[List[str]] = None,
+    hedge_policy: Optional[HedgingPolicy] = None,
+    cascade_models: Optional[List[str]] = None,
+    breaker_fallback: Optional[str] = None
+):
+    """감시 폴더 모드 (새 주문서를 자동 처리, Ctrl+C / SIGTERM으로 종료)"""
+    from src.core.hot_folder import HotFolder
+
+    if not os.path.isdir(directory):
+        print(f"오류: 감시할 폴더가 없습니다: {directory}")
+        return
+    processor = _build_processor(config, catalog_path, backend_names, replay_paths, hedge_policy,
+                                 cascade_models, breaker_fallback)
+    if processor is None:
+        return
+    folder = HotFolder(directory, processor, workers=workers, use_inotify=use_inotify)
+
+    def stop(signum, frame):
+        print("\n종료 요청: 처리 중인 문서는 완료된 페이지까지 기록하고 멈춥니다...")
+        folder.stop()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    previous_handlers = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        folder.run()
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        processor.close()
+    _print_backend_summary(processor)
+
+
+def main_serve(
+    config: RuntimeConfig,
+    host: str,
+    port: int,
+    workers: int = 2,
+    catalog_path: Optional[str] = None,
+    backend_names: Optional[List[str]] = None,
+    replay_paths: Optional[List[str]] = None,
+    hedge_policy: Optional[HedgingPolicy] = None,
+    cascade_models: Optional[List[str]] = None,
+    breaker_fallback: Optional[str] = None
+):
+    """작업 API 서버 모드 (다른 프로그램이 HTTP로 주문서를 보내 처리, Ctrl+C / SIGTERM으로 종료)"""
+    from src.core.job_server import create_job_server
+
+    processor = _build_processor(config, catalog_path, backend_names, replay_paths, hedge_policy,
+                                 cascade_models, breaker_fallback)
+    if processor is None:
+        return
+    try:
+        server = create_job_server(processor, host, port, workers)
+    except OSError as e:
+        print(f"오류: 서버를 시작할 수 없습니다 ({host}:{port}): {e}")
+        return
+
+    def stop(signum, frame):
+        print("\n종료 요청: 처리 중인 작업은 완료된 페이지까지 기록하고 멈춥니다...")
+        # serve_forever가 도는 스레드에서 shutdown을 직접 부르면 멈추므로 별도 스레드에서 호출
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    previous_handlers = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    print(f"작업 API 서버 시작: http://{host}:{server.server_address[1]} (동시 처리 {workers}개)")
+    print(f"업로드 예: curl --data-binary @주문서.pdf \"http://{host}:{server.server_address[1]}/jobs?filename=주문서.pdf\"")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.service.close()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        processor.close()
+    _print_backend_summary(processor)
+
+
+def main_archive(
+    archive_paths: List[str],
+    export_path: Optional[str] = None,
+    filename: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    consolidate: bool = False
+):
+    """보관된 결과 파일(JSON / JSON Lines)에서 문서를 불러와 요약 또는 내보내기"""
+    from src.utils.archive_reader import ArchiveReader
+    from src.utils.exporters import export_documents
+
+    def iter_documents() -> Iterator[ProcessedDocument]:
+        for archive_path in archive_paths:
+            reader = ArchiveReader(archive_path)
+            for document in reader.iter_documents(filename, date_from, date_to):
+                if not export_path and not consolidate:
+                    print(f"{document.filename}: {document.total_pages}페이지, "
+                          f"{document.total_items}개 항목, "
+                          f"{app_settings.format_cost(document.processing_cost)}")
+                yield document
+
+    try:
+        if consolidate:
+            _consolidate(iter_documents(), export_path)
+        elif export_path:
+            row_count = export_documents(iter_documents(), export_path)
+            print(f"{row_count}개 항목을 다음 파일로 내보냈습니다: {export_path}")
+        else:
+            for _ in iter_documents():
+                pass
+    except Exception as e:
+        print(f"보관 파일 처리 오류: {e}")
+
+
+def main_index(archive_paths: List[str], index_path: Optional[str] = None):
+    """보관된 결과 파일들을 검색 색인에 추가"""
+    from src.core.search_index import SearchIndex
+
+    index = SearchIndex(index_path)
+    for archive_path in archive_paths:
+        try:
+            count = index.add_archive(archive_path)
+            print(f"{archive_path}: {count}개 항목 색인됨")
+        except Exception as e:
+            print(f"{archive_path}: 색인 오류: {e}")
+    print(f"전체 색인 항목 수: {index.entry_count}")
+
+
+def main_search(
+    query: str,
+    prefix: bool = False,
+    index_path: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    limit: int = 200
+):
+    """검색 색인에서 품번 검색"""
+    from src.core.search_index import SearchIndex
+
+    index = SearchIndex(index_path)
+    start = time.perf_counter()
+    hits = index.search(query, prefix=prefix, limit=limit, date_from=date_from, date_to=date_to)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for hit in hits:
+        print(f"{hit.date}\t{hit.filename}\tp.{hit.page}\t{hit.product_code}\t{hit.quantity}개")
+    print(f"\n{len(hits)}건 ({elapsed_ms:.1f}ms)")
+
+
+def main_probe(file_paths: List[str], dpi: Optional[int] = None):
+    """문서를 렌더링하지 않고 페이지 수 / 크기 / 텍스트 레이어 여부 출력"""
+    from src.utils.pdf_converter import probe_document
+
+    dpi = dpi or 300
+    total_pages = 0
+    for file_path in file_paths:
+        try:
+            probe = probe_document(file_path, dpi)
+        except Exception as e:
+            print(f"{file_path}: 정보 확인 오류: {e}")
+            continue
+        total_pages += probe.page_count
+        sizes = sorted({(round(page.width), round(page.height)) for page in probe.pages})
+        print(f"{file_path}: {probe.document_type} {probe.page_count}페이지, "
+              f"텍스트 레이어 {probe.text_pages}페이지, "
+              f"크기 {', '.join(f'{w}x{h}' for w, h in sizes)}, "
+              f"렌더링 {probe.render_megapixels:.1f}MP ({probe.elapsed_ms:.1f}ms)"
+              + (", 암호화됨" if probe.encrypted else ""))
+    if len(file_paths) > 1:
+        print(f"\n전체 {total_pages}페이지")
 
 
 def main_gui():
     """GUI 모드 실행"""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+    from src.gui.main_window import MainWindow
+
+    if import_qt_settings(app_settings.settings):
+        app_settings.load_settings()
+
     # QApplication 생성 전에 High DPI 설정
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -79,17 +554,138 @@ def main_gui():
     sys.exit(app.exec_())
 
 
+def _name_list(value: str) -> List[str]:
+    """쉼표로 구분된 이름 목록 파싱 (--backends / --cascade)"""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
 def main():
     """메인 함수"""
     # 명령줄 인자 확인
-    if len(sys.argv) > 1 and sys.argv[1] == "--cli":
+    parser = argparse.ArgumentParser(description="주문서 OCR 처리 도구")
+    parser.add_argument("--cli", nargs="*", metavar="FILE",
+                        help="CLI 모드로 실행 (처리할 파일 경로들)")
+    parser.add_argument("--export", metavar="PATH",
+                        help="처리 결과를 하나의 CSV/XLSX/Parquet 파일로 내보내기")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="결과 파일 저장 디렉토리 (기본: 현재 디렉토리)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="결과를 날짜별 JSON Lines 파일(ocr_results_YYYYMMDD.jsonl)에 추가")
+    parser.add_argument("--catalog", metavar="CSV",
+                        help="품번 카탈로그 CSV (설정의 카탈로그 대신 사용)")
+    parser.add_argument("--backends", type=_name_list,
+                        metavar="NAME,...",
+                        help="--cli: 사용할 OCR 백엔드 (예: cache,openai / mock / text_layer)")
+    parser.add_argument("--replay", nargs="+", metavar="FILE",
+                        help="--cli: 보관된 결과 파일에 같은 파일명·페이지가 있으면 OCR 대신 재사용")
+    parser.add_argument("--hedge", type=float, metavar="PERCENTILE",
+                        help="--cli: 최근 지연 시간의 이 백분위(예: 95)를 넘은 요청에 중복 요청")
+    parser.add_argument("--hedge-budget", type=float, default=5.0, metavar="PERCENT",
+                        help="--cli: 헤지 요청 추가 비용 상한 (기본 5%%)")
+    parser.add_argument("--cascade", type=_name_list, metavar="MODEL,...",
+                        help="--cli: 저렴한 모델부터 처리하고 검증 실패 페이지만 다음 모델로 (예: gpt-4.1-nano,gpt-4o-mini,gpt-4o)")
+    parser.add_argument("--breaker-fallback", metavar="MODE",
+                        help="--cli: OCR 백엔드 차단 시 대체 경로 (fail / defer / 백엔드 이름 / model:모델명)")
+    parser.add_argument("--config", metavar="JSON",
+                        help="--cli: 작업 설정 파일 (설정 이름: 값, 앱 설정보다 우선)")
+    parser.add_argument("--model", help="--cli: 이번 작업에 사용할 모델")
+    parser.add_argument("--concurrency", type=int, metavar="N", help="--cli: 이번 작업의 동시 API 요청 수")
+    parser.add_argument("--dpi", type=int, help="--cli: PDF 페이지 이미지 해상도 (기본 300)")
+    parser.add_argument("--render-workers", type=int, metavar="N",
+                        help="--cli: PDF 렌더링 작업자 프로세스 수 (기본: CPU 수, 1이면 단일 프로세스)")
+    parser.add_argument("--estimate", action="store_true",
+                        help="--cli: API 호출 없이 예상 비용 / 소요 시간만 출력")
+    parser.add_argument("--budget", type=float, metavar="USD",
+                        help="--cli: 최대 예상 비용이 이 금액을 넘으면 처리하지 않고, 처리 중 지출이 이 금액에 이르면 중단")
+    parser.add_argument("--daily-budget", type=float, metavar="USD",
+                        help="--cli: 하루 지출 한도 (모든 실행 합계, 가까워지면 속도 제한 → 저렴한 모델 → 중단)")
+    parser.add_argument("--customer-budget", type=float, metavar="USD", help="--cli: 고객별 한 달 지출 한도")
+    parser.add_argument("--customer", help="--cli: 지출을 기록할 고객 이름")
+    parser.add_argument("--retry", metavar="RESULT_JSON",
+                        help="결과 파일의 실패 / 보류된 페이지만 다시 처리해 결과 파일에 합침 (--cli로 원본 파일 지정)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="--cli: 이전 실행의 처리 기록을 무시하고 모든 페이지를 다시 처리")
+    parser.add_argument("--reprocess", action="store_true",
+                        help="--cli: 같은 설정으로 처리를 마친 파일도 기록된 결과를 쓰지 않고 다시 처리")
+    parser.add_argument("--watch", metavar="DIR",
+                        help="감시 폴더 모드: 폴더에 들어온 PDF / 이미지를 자동 처리해 done / failed 폴더로 이동")
+    parser.add_argument("--watch-workers", type=int, default=2, metavar="N",
+                        help="--watch: 동시에 처리할 파일 수 (기본 2)")
+    parser.add_argument("--watch-poll", action="store_true",
+                        help="--watch: inotify 대신 폴링으로 감시 (네트워크 드라이브용)")
+    parser.add_argument("--serve", action="store_true",
+                        help="작업 API 서버 모드: HTTP로 파일을 받아 처리 (상태 / 결과 / 페이지 스트리밍)")
+    parser.add_argument("--host", default="127.0.0.1", help="--serve: 서버 주소 (기본 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="--serve: 서버 포트 (기본 8765)")
+    parser.add_argument("--serve-workers", type=int, default=2, metavar="N",
+                        help="--serve: 동시에 처리할 작업 수 (기본 2)")
+    parser.add_argument("--rpm", type=int, metavar="N", help="--cli: API 분당 요청 한도 (예상 시간 계산용)")
+    parser.add_argument("--consolidate", action="store_true",
+                        help="--cli / --archive: 여러 페이지·문서의 같은 품번을 합쳐서 출력 또는 내보내기")
+    parser.add_argument("--archive", nargs="+", metavar="FILE",
+                        help="보관된 결과 파일(JSON / JSON Lines)에서 문서 불러오기")
+    parser.add_argument("--filename", help="--archive: 원본 파일명으로 필터")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="--archive / --search: 시작 날짜로 필터")
+    parser.add_argument("--until", type=datetime.date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="--archive / --search: 종료 날짜로 필터")
+    parser.add_argument("--probe", nargs="+", metavar="FILE",
+                        help="렌더링 없이 문서의 페이지 수 / 크기 / 텍스트 레이어 여부 확인")
+    parser.add_argument("--index", nargs="+", metavar="FILE",
+                        help="보관된 결과 파일(JSON / JSON Lines)을 검색 색인에 추가")
+    parser.add_argument("--search", metavar="QUERY", help="검색 색인에서 품번 검색 (부분 일치)")
+    parser.add_argument("--prefix", action="store_true", help="--search: 앞부분 일치로 검색")
+    parser.add_argument("--index-db", metavar="PATH", help="검색 색인 파일 경로")
+    args = parser.parse_args()
+    hedge_policy = None
+    if args.hedge:
+        from src.core.hedging import HedgingPolicy
+        hedge_policy = HedgingPolicy(percentile=args.hedge / 100, budget_ratio=args.hedge_budget / 100)
+
+    if args.probe:
+        main_probe(args.probe, args.dpi)
+    elif args.index:
+        main_index(args.index, args.index_db)
+    elif args.search:
+        main_search(args.search, args.prefix, args.index_db, args.since, args.until)
+    elif args.archive:
+        main_archive(args.archive, args.export, args.filename, args.since, args.until, args.consolidate)
+    elif args.cli is not None or args.retry or args.watch or args.serve:
         # CLI 모드
-        file_path = sys.argv[2] if len(sys.argv) > 2 else None
-        main_cli(file_path)
+        try:
+            config = RuntimeConfig.load(args.config, model_name=args.model,
+                                        max_concurrency=args.concurrency, dpi=args.dpi,
+                                        render_workers=args.render_workers, requests_per_minute=args.rpm,
+                                        budget_run=args.budget, budget_day=args.daily_budget,
+                                        budget_customer=args.customer_budget, customer=args.customer,
+                                        resume=False if args.no_resume else None,
+                                        reuse_completed=False if args.reprocess else None,
+                                        # 처리 기록의 설정 비교(checkpoint_fingerprint)에 CLI 값도 반영
+                                        catalog_path=args.catalog,
+                                        cascade_models=",".join(args.cascade) if args.cascade else None)
+        except (OSError, ValueError) as e:
+            print(f"오류: 작업 설정을 불러올 수 없습니다: {e}")
+            return
+        if args.retry:
+            main_retry(args.retry, args.cli[0] if args.cli else None, config)
+            return
+        if args.watch:
+            main_watch(args.watch, config, args.watch_workers, not args.watch_poll, args.catalog,
+                       args.backends, args.replay, hedge_policy, args.cascade, args.breaker_fallback)
+            return
+        if args.serve:
+            main_serve(config, args.host, args.port, args.serve_workers, args.catalog,
+                       args.backends, args.replay, hedge_policy, args.cascade, args.breaker_fallback)
+            return
+        main_cli(args.cli, args.export, args.output_dir, args.jsonl, args.catalog, args.consolidate,
+                 args.backends, args.replay, hedge_policy, args.cascade, args.breaker_fallback, config,
+                 args.estimate, args.budget)
     else:
         # GUI 모드
         main_gui()
 
 
 if __name__ == "__main__":
+    # 실행 파일로 묶었을 때 렌더링 작업 프로세스가 다시 main()을 실행하지 않도록 가장 먼저 호출
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import json
+import os
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
+from .settings import DEFAULT_MODEL_PRICES, ENV_PREFIX, AppSettings
+
+# 작업별 설정 파일 경로 환경 변수 (RuntimeConfig.load에 경로를 주지 않았을 때)
+CONFIG_PATH_ENV = ENV_PREFIX + "CONFIG"
+
+# 필드 이름과 다른 설정 / 환경 변수 이름
+_SETTING_KEYS = {"model_name": "model"}
+_FIELD_NAMES = {setting: name for name, setting in _SETTING_KEYS.items()}
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """처리 작업에 쓰는 불변 설정 스냅샷 (pickle 가능, 프로세스 풀 작업자에 그대로 전달)"""
+    api_key: str = ""
+    model_name: str = "gpt-4o-mini"
+    input_cost: float = 0.10
+    output_cost: float = 0.40
+    exchange_rate: float = 1399.0
+    mock_mode: bool = True
+    catalog_path: str = ""
+    ocr_backends: str = ""
+    max_concurrency: int = 4
+    requests_per_minute: int = 0  # API 분당 요청 한도 (0이면 제한 없음, 예상 시간 계산용)
+    dpi: int = 300
+    render_workers: int = 0       # PDF 렌더링 작업자 프로세스 수 (0이면 CPU 수)
+    render_chunk_pages: int = 8   # 작업자 하나가 한 번에 렌더링할 페이지 수
+    hedge_percentile: float = 0.0
+    hedge_budget: float = 0.05
+    cascade_models: str = ""
+    min_confidence: float = 0.8
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    breaker_latency_threshold: float = 0.0
+    breaker_fallback: str = "fail"
+    budget_run: float = 0.0       # 지출 한도 USD (0이면 제한 없음): 이번 실행
+    budget_day: float = 0.0       # 하루 (모든 실행 합계)
+    budget_customer: float = 0.0  # 고객별 한 달
+    customer: str = ""
+    budget_fallback_model: str = ""  # 한도에 가까워지면 쓸 모델 (비우면 가장 저렴한 모델)
+    resume: bool = True           # 중단된 이전 실행의 처리 기록이 있으면 끝난 페이지는 건너뜀
+    reuse_completed: bool = True  # 같은 설정으로 처리를 마친 파일은 다시 처리하지 않고 기록된 결과 사용
+
+    @classmethod
+    def from_settings(cls, settings: Optional[AppSettings] = None) -> "RuntimeConfig":
+        """앱 설정(설정 파일 + 환경 변수)의 현재 값으로 생성"""
+        if settings is None:
+            from .settings import app_settings
+            settings = app_settings
+        values = {
+            field.name: getattr(settings, field.name)
+            for field in fields(cls) if hasattr(type(settings), field.name)
+        }
+        values["api_key"] = values.get("api_key") or ""
+        # 단가는 앱 설정에서 백만 토큰당 값으로 이름이 다름
+        values["input_cost"] = settings.input_cost_per_million
+        values["output_cost"] = settings.output_cost_per_million
+        return cls(**values)
+
+    @classmethod
+    def load(cls, config_path: Optional[str] = None, **overrides) -> "RuntimeConfig":
+        """앱 설정 < 작업 설정 파일(JSON) < DKLOK_* 환경 변수 < 인자 순으로 적용해 생성"""
+        config = cls.from_settings()
+        config_path = config_path or os.environ.get(CONFIG_PATH_ENV)
+        if config_path:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = config.with_overrides(**json.load(f))
+        config = config.with_overrides(**config._env_overrides())
+        return config.with_overrides(**overrides)
+
+    def _env_overrides(self) -> Dict[str, Any]:
+        values = {}
+        for field in fields(self):
+            env_key = ENV_PREFIX + _SETTING_KEYS.get(field.name, field.name).upper()
+            env_value = os.environ.get(env_key)
+            if env_value is None:
+                continue
+            try:
+                values[field.name] = _convert(env_value, field.type)
+            except ValueError:
+                # 잘못된 환경 변수 값 하나 때문에 모든 실행이 실패하지 않도록 무시
+                print(f"경고: 환경 변수 {env_key} 값이 잘못되어 무시합니다: {env_value!r}")
+        return values
+
+    def with_overrides(self, **overrides) -> "RuntimeConfig":
+        """일부 값을 바꾼 새 설정 (None 값은 무시, 문자열은 필드 타입으로 변환)"""
+        known = {field.name: field.type for field in fields(self)}
+        values = {}
+        for key, value in overrides.items():
+            key = _FIELD_NAMES.get(key, key)
+            if key not in known:
+                raise ValueError(f"알 수 없는 설정: {key}")
+            if value is None:
+                continue
+            values[key] = _convert(value, known[key])
+        return replace(self, **values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환 (API 키 제외)"""
+        data = asdict(self)
+        data.pop("api_key")
+        return data
+
+    def model_prices(self, model_name: Optional[str] = None) -> Tuple[float, float]:
+        """모델의 (입력, 출력) 단가 (기본 모델이거나 모르는 모델이면 설정 단가)"""
+        if model_name and model_name != self.model_name and model_name in DEFAULT_MODEL_PRICES:
+            return DEFAULT_MODEL_PRICES[model_name]
+        return self.input_cost, self.output_cost
+
+    def calculate_cost(self, prompt_tokens: int, completion_tokens: int, model_name: Optional[str] = None) -> float:
+        """토큰 사용량에 따른 API 비용 계산"""
+        input_price, output_price = self.model_prices(model_name)
+        return (prompt_tokens / 1000000.0) * input_price + (completion_tokens / 1000000.0) * output_price
+
+    def format_cost(self, cost_usd: float) -> str:
+        """비용을 USD와 KRW로 형식화"""
+        return f"${cost_usd:.4f} (₩{int(cost_usd * self.exchange_rate):,})"
+
+
+def _convert(value: Any, field_type: Any) -> Any:
+    """설정 파일 / 환경 변수 값을 필드 타입으로 변환"""
+    if field_type in (bool, "bool"):
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+    if field_type in (int, "int"):
+        return int(value)
+    if field_type in (float, "float"):
+        return float(value)
+    return str(value)
@@ -1,19 +1,108 @@
 import os
-from PyQt5.QtCore import QSettings
-from typing import Optional
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.file_utils import get_app_data_dir
+
+
+# 모델별 기본 단가 (USD / 1M 토큰: 입력, 출력), 설정한 기본 모델은 설정 단가 사용
+DEFAULT_MODEL_PRICES = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+# 환경 변수로 설정값 지정 (예: DKLOK_API_KEY, DKLOK_MOCK_MODE=false)
+ENV_PREFIX = "DKLOK_"
+
+
+class FileSettingsStore:
+    """JSON 파일 설정 저장소 (환경 변수가 있으면 파일 값보다 우선, Qt 불필요)"""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_app_data_dir(), "settings.json")
+        self._values: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._values = {key: str(value) for key, value in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                print(f"경고: 설정 파일을 읽을 수 없습니다: {e}")
+    
+    @staticmethod
+    def env_key(key: str) -> str:
+        return ENV_PREFIX + key.upper()
+    
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+    
+    def value(self, key: str, default: str = "") -> str:
+        env_value = os.environ.get(self.env_key(key))
+        if env_value is not None:
+            return env_value
+        return self._values.get(key, default)
+    
+    def setValue(self, key: str, value: Any) -> None:
+        # 환경 변수로 지정한 값 (API 키 등)은 파일에 저장하지 않음
+        if self.env_key(key) in os.environ:
+            return
+        self._values[key] = str(value)
+    
+    def sync(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self._values, f, ensure_ascii=False, indent=2)
+
+
+def import_qt_settings(store: FileSettingsStore) -> int:
+    """이전 버전의 QSettings 값을 설정 파일로 옮김 (설정 파일이 없을 때만, GUI 모드에서 호출)"""
+    if store.exists():
+        return 0
+    try:
+        from PyQt5.QtCore import QSettings
+    except ImportError:
+        return 0
+    qt_settings = QSettings("OCR App", "GPT OCR Converter")
+    keys = qt_settings.allKeys()
+    for key in keys:
+        store.setValue(key, qt_settings.value(key))
+    if keys:
+        store.sync()
+        print(f"[Settings] 이전 설정 {len(keys)}개를 {store.path}로 옮겼습니다.")
+    return len(keys)
 
 
 class AppSettings:
     """애플리케이션 설정 관리"""
     
-    def __init__(self):
-        self.settings = QSettings("OCR App", "GPT OCR Converter")
+    def __init__(self, store: Optional[FileSettingsStore] = None):
+        self.settings = store or FileSettingsStore()
         self._api_key: Optional[str] = None
         self._model_name: str = "gpt-4o-mini"
         self._input_cost: float = 0.10
         self._output_cost: float = 0.40
         self._exchange_rate: float = 1399.0
         self._mock_mode: bool = True
+        self._catalog_path: str = ""
+        self._ocr_backends: str = ""
+        self._max_concurrency: int = 4
+        self._hedge_percentile: float = 0.0
+        self._hedge_budget: float = 0.05
+        self._cascade_models: str = ""
+        self._min_confidence: float = 0.8
+        self._breaker_failure_threshold: int = 5
+        self._breaker_reset_timeout: float = 30.0
+        self._breaker_latency_threshold: float = 0.0
+        self._breaker_fallback: str = "fail"
+        self._budget_day: float = 0.0
+        self._budget_customer: float = 0.0
+        self._customer: str = ""
+        self._budget_fallback_model: str = ""
         
         self.load_settings()
     
@@ -21,10 +110,34 @@ class AppSettings:
         """설정 파일에서 설정 불러오기"""
         self._api_key = self.settings.value("api_key", "")
         self._model_name = self.settings.value("model", "gpt-4o-mini")
-        self._input_cost = float(self.settings.value("input_cost", "0.10"))
-        self._output_cost = float(self.settings.value("output_cost", "0.40"))
-        self._exchange_rate = float(self.settings.value("exchange_rate", "1399"))
+        self._input_cost = self._number("input_cost", 0.1, float)
+        self._output_cost = self._number("output_cost", 0.4, float)
+        self._exchange_rate = self._number("exchange_rate", 1399.0, float)
         self._mock_mode = self.settings.value("mock_mode", "true").lower() == "true"
+        self._catalog_path = self.settings.value("catalog_path", "")
+        self._ocr_backends = self.settings.value("ocr_backends", "")
+        self._max_concurrency = self._number("max_concurrency", 4, int)
+        self._hedge_percentile = self._number("hedge_percentile", 0.0, float)
+        self._hedge_budget = self._number("hedge_budget", 0.05, float)
+        self._cascade_models = self.settings.value("cascade_models", "")
+        self._min_confidence = self._number("min_confidence", 0.8, float)
+        self._breaker_failure_threshold = self._number("breaker_failure_threshold", 5, int)
+        self._breaker_reset_timeout = self._number("breaker_reset_timeout", 30.0, float)
+        self._breaker_latency_threshold = self._number("breaker_latency_threshold", 0.0, float)
+        self._breaker_fallback = self.settings.value("breaker_fallback", "fail")
+        self._budget_day = self._number("budget_day", 0.0, float)
+        self._budget_customer = self._number("budget_customer", 0.0, float)
+        self._customer = self.settings.value("customer", "")
+        self._budget_fallback_model = self.settings.value("budget_fallback_model", "")
+    
+    def _number(self, key: str, default: Any, convert: Callable[[str], Any]) -> Any:
+        """숫자 설정값 (잘못된 값이면 경고를 출력하고 기본값 사용)"""
+        value = self.settings.value(key, str(default))
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            print(f"경고: 설정 {key} 값이 잘못되어 기본값 {default}을(를) 사용합니다: {value!r}")
+            return default
     
     def save_settings(self):
         """설정을 파일에 저장"""
@@ -34,6 +147,21 @@ class AppSettings:
         self.settings.setValue("output_cost", self._output_cost)
         self.settings.setValue("exchange_rate", self._exchange_rate)
         self.settings.setValue("mock_mode", str(self._mock_mode).lower())
+        self.settings.setValue("catalog_path", self._catalog_path or "")
+        self.settings.setValue("ocr_backends", self._ocr_backends or "")
+        self.settings.setValue("max_concurrency", self._max_concurrency)
+        self.settings.setValue("hedge_percentile", self._hedge_percentile)
+        self.settings.setValue("hedge_budget", self._hedge_budget)
+        self.settings.setValue("cascade_models", self._cascade_models or "")
+        self.settings.setValue("min_confidence", self._min_confidence)
+        self.settings.setValue("breaker_failure_threshold", self._breaker_failure_threshold)
+        self.settings.setValue("breaker_reset_timeout", self._breaker_reset_timeout)
+        self.settings.setValue("breaker_latency_threshold", self._breaker_latency_threshold)
+        self.settings.setValue("breaker_fallback", self._breaker_fallback or "fail")
+        self.settings.setValue("budget_day", self._budget_day)
+        self.settings.setValue("budget_customer", self._budget_customer)
+        self.settings.setValue("customer", self._customer or "")
+        self.settings.setValue("budget_fallback_model", self._budget_fallback_model or "")
         self.settings.sync()
     
     @property
@@ -85,16 +213,157 @@ class AppSettings:
     def mock_mode(self, value: bool):
         self._mock_mode = value
     
-    def calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
-        """토큰 사용량에 따른 API 비용 계산"""
-        input_cost = (prompt_tokens / 1000000.0) * self._input_cost
-        output_cost = (completion_tokens / 1000000.0) * self._output_cost
-        return input_cost + output_cost
+    @property
+    def catalog_path(self) -> str:
+        """품번 카탈로그 CSV 경로 (비어 있으면 카탈로그 매칭 사용 안 함)"""
+        return self._catalog_path
+    
+    @catalog_path.setter
+    def catalog_path(self, value: str):
+        self._catalog_path = value
+    
+    @property
+    def ocr_backends(self) -> str:
+        """사용할 OCR 백엔드 이름 목록 (쉼표 구분, 비어 있으면 모킹 모드/API 키에 따라 자동)"""
+        return self._ocr_backends
+    
+    @ocr_backends.setter
+    def ocr_backends(self, value: str):
+        self._ocr_backends = value
+    
+    @property
+    def max_concurrency(self) -> int:
+        """비전 API 백엔드의 동시 요청 수"""
+        return self._max_concurrency
+    
+    @max_concurrency.setter
+    def max_concurrency(self, value: int):
+        self._max_concurrency = value
+    
+    @property
+    def hedge_percentile(self) -> float:
+        """헤지 요청 기준 백분위 (0.95 = p95, 0이면 헤지 사용 안 함)"""
+        return self._hedge_percentile
+    
+    @hedge_percentile.setter
+    def hedge_percentile(self, value: float):
+        self._hedge_percentile = value
+    
+    @property
+    def hedge_budget(self) -> float:
+        """헤지 요청 추가 비용 상한 비율 (0.05 = 5%)"""
+        return self._hedge_budget
+    
+    @hedge_budget.setter
+    def hedge_budget(self, value: float):
+        self._hedge_budget = value
+    
+    @property
+    def cascade_models(self) -> str:
+        """저렴한 모델부터 시도할 모델 목록 (쉼표 구분, 비어 있으면 기본 모델만 사용)"""
+        return self._cascade_models
+    
+    @cascade_models.setter
+    def cascade_models(self, value: str):
+        self._cascade_models = value
+    
+    @property
+    def min_confidence(self) -> float:
+        """이 값보다 신뢰도가 낮은 응답은 상위 모델로 다시 처리"""
+        return self._min_confidence
+    
+    @min_confidence.setter
+    def min_confidence(self, value: float):
+        self._min_confidence = value
+    
+    @property
+    def breaker_failure_threshold(self) -> int:
+        """이 횟수만큼 연속 실패하면 OCR 백엔드 요청 차단"""
+        return self._breaker_failure_threshold
+    
+    @breaker_failure_threshold.setter
+    def breaker_failure_threshold(self, value: int):
+        self._breaker_failure_threshold = value
+    
+    @property
+    def breaker_reset_timeout(self) -> float:
+        """차단 후 복구 확인 요청까지 기다릴 시간 (초)"""
+        return self._breaker_reset_timeout
+    
+    @breaker_reset_timeout.setter
+    def breaker_reset_timeout(self, value: float):
+        self._breaker_reset_timeout = value
+    
+    @property
+    def breaker_latency_threshold(self) -> float:
+        """이보다 느린 응답은 실패로 셈 (초, 0이면 사용 안 함)"""
+        return self._breaker_latency_threshold
+    
+    @breaker_latency_threshold.setter
+    def breaker_latency_threshold(self, value: float):
+        self._breaker_latency_threshold = value
+    
+    @property
+    def breaker_fallback(self) -> str:
+        """차단 시 대체 경로 ("fail", "defer", 백엔드 이름 또는 "model:모델명")"""
+        return self._breaker_fallback
+    
+    @breaker_fallback.setter
+    def breaker_fallback(self, value: str):
+        self._breaker_fallback = value
+    
+    @property
+    def budget_day(self) -> float:
+        """하루 지출 한도 (USD, 0이면 제한 없음)"""
+        return self._budget_day
+    
+    @budget_day.setter
+    def budget_day(self, value: float):
+        self._budget_day = value
+    
+    @property
+    def budget_customer(self) -> float:
+        """고객별 한 달 지출 한도 (USD, 0이면 제한 없음)"""
+        return self._budget_customer
+    
+    @budget_customer.setter
+    def budget_customer(self, value: float):
+        self._budget_customer = value
+    
+    @property
+    def customer(self) -> str:
+        """지출을 기록할 고객 이름"""
+        return self._customer
+    
+    @customer.setter
+    def customer(self, value: str):
+        self._customer = value
+    
+    @property
+    def budget_fallback_model(self) -> str:
+        """지출 한도에 가까워지면 사용할 모델 (비우면 가장 저렴한 모델)"""
+        return self._budget_fallback_model
+    
+    @budget_fallback_model.setter
+    def budget_fallback_model(self, value: str):
+        self._budget_fallback_model = value
+    
+    def model_prices(self, model_name: Optional[str] = None) -> Tuple[float, float]:
+        """모델의 (입력, 출력) 단가 (RuntimeConfig.model_prices 사용)"""
+        return self._runtime_config().model_prices(model_name)
+    
+    def calculate_cost(self, prompt_tokens: int, completion_tokens: int, model_name: Optional[str] = None) -> float:
+        """토큰 사용량에 따른 API 비용 계산 (RuntimeConfig.calculate_cost 사용)"""
+        return self._runtime_config().calculate_cost(prompt_tokens, completion_tokens, model_name)
     
     def format_cost(self, cost_usd: float) -> str:
-        """비용을 USD와 KRW로 형식화"""
-        cost_krw = cost_usd * self._exchange_rate
-        return f"${cost_usd:.4f} (₩{int(cost_krw):,})"
+        """비용을 USD와 KRW로 형식화 (RuntimeConfig.format_cost 사용)"""
+        return self._runtime_config().format_cost(cost_usd)
+    
+    def _runtime_config(self):
+        """현재 설정 값의 RuntimeConfig (runtime 모듈이 이 모듈을 불러오므로 여기서 import)"""
+        from .runtime import RuntimeConfig
+        return RuntimeConfig.from_settings(self)
 
 
 # 전역 설정 인스턴스
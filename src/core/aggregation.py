@@ -0,0 +1,149 @@
+from array import array
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from ..models.document import ProcessedDocument
+from ..models.item_store import ItemStore
+from ..models.order_item import normalize_product_code
+
+# 대량 집계를 위한 선택적 라이브러리
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+CONSOLIDATED_COLUMNS = ["품번", "합계 수량", "건수", "출처"]
+
+
+@dataclass
+class AggregatedItem:
+    """품번별 통합 항목"""
+    product_code: str
+    total_quantity: int
+    occurrences: int
+    page_ids: Sequence[int] = field(default=(), repr=False)                # 저장소 페이지 인덱스
+    page_table: Sequence[Tuple[str, int]] = field(default=(), repr=False)  # (파일명, 페이지 번호) 테이블
+
+    @cached_property
+    def sources(self) -> List[Tuple[str, List[int]]]:
+        """(파일명, 페이지 목록) 출처 목록 (처음 접근할 때 계산)"""
+        page_ids = self.page_ids.tolist() if hasattr(self.page_ids, "tolist") else self.page_ids
+        sources: Dict[str, Dict[int, None]] = {}
+        for page_id in page_ids:
+            filename, page_number = self.page_table[page_id]
+            sources.setdefault(filename, {})[page_number] = None
+        return [(filename, sorted(pages)) for filename, pages in sources.items()]
+
+    @property
+    def source_text(self) -> str:
+        """출처 요약 문자열 (예: a.pdf(p.1,2); b.pdf(p.3))"""
+        return "; ".join(
+            f"{filename}(p.{','.join(str(page) for page in pages)})"
+            for filename, pages in self.sources
+        )
+
+    def to_row(self) -> Tuple[str, int, int, str]:
+        return self.product_code, self.total_quantity, self.occurrences, self.source_text
+
+
+def _group_codes(store: ItemStore, key_func: Callable[[str], str]) -> Tuple[List[str], array]:
+    """문자열 테이블의 품번을 정규화 키로 묶음 (품번 종류 수만큼만 계산)"""
+    group_names: List[str] = []
+    group_ids: Dict[str, int] = {}
+    group_of_code = array('I')
+    for code in store.codes:
+        key = key_func(code)
+        group_id = group_ids.get(key)
+        if group_id is None:
+            group_id = len(group_names)
+            group_ids[key] = group_id
+            group_names.append(key)
+        group_of_code.append(group_id)
+    return group_names, group_of_code
+
+
+def _aggregate_numpy(store: ItemStore, group_names: List[str], group_of_code: array) -> List[AggregatedItem]:
+    group_lookup = np.frombuffer(group_of_code, dtype=np.uint32) if len(group_of_code) else np.zeros(0, np.uint32)
+    code_index = np.frombuffer(store.code_index, dtype=np.uint32)
+    quantities = np.frombuffer(store.quantities, dtype=np.int64)
+    page_index = np.frombuffer(store.page_index, dtype=np.uint32)
+
+    groups = group_lookup[code_index].astype(np.int64)
+    group_count = len(group_names)
+    page_count = len(store.pages)
+
+    # 그룹별 건수 / 합계 (float64 누적은 2**53 미만에서 정확)
+    counts = np.bincount(groups, minlength=group_count)
+    totals = np.bincount(groups, weights=quantities, minlength=group_count).astype(np.int64)
+    present_groups = np.flatnonzero(counts)
+
+    # (그룹, 페이지) 쌍을 정수 키로 만들어 정렬 후 중복 제거 (np.unique보다 빠름)
+    pair_keys = groups * page_count + page_index
+    pair_keys.sort()
+    distinct = np.empty(len(pair_keys), dtype=bool)
+    distinct[0] = True
+    np.not_equal(pair_keys[1:], pair_keys[:-1], out=distinct[1:])
+    pairs = pair_keys[distinct]
+    pair_groups = pairs // page_count
+    pair_pages = pairs % page_count
+    pair_bounds = np.searchsorted(pair_groups, np.arange(group_count + 1))
+
+    result = []
+    for group, total, count in zip(present_groups.tolist(), totals[present_groups].tolist(),
+                                   counts[present_groups].tolist()):
+        page_ids = pair_pages[pair_bounds[group]:pair_bounds[group + 1]]
+        result.append(AggregatedItem(group_names[group], total, count, page_ids, store.pages))
+    return result
+
+
+def _aggregate_python(store: ItemStore, group_names: List[str], group_of_code: array) -> List[AggregatedItem]:
+    group_count = len(group_names)
+    totals = [0] * group_count
+    counts = [0] * group_count
+    page_sets: List[Dict[int, None]] = [{} for _ in range(group_count)]
+
+    for code_id, quantity, page_id in zip(store.code_index, store.quantities, store.page_index):
+        group = group_of_code[code_id]
+        totals[group] += quantity
+        counts[group] += 1
+        page_sets[group][page_id] = None
+
+    return [
+        AggregatedItem(group_names[group], totals[group], counts[group],
+                       sorted(page_sets[group]), store.pages)
+        for group in range(group_count)
+        if counts[group]
+    ]
+
+
+def aggregate_store(
+    store: ItemStore,
+    key_func: Callable[[str], str] = normalize_product_code
+) -> List[AggregatedItem]:
+    """열 지향 저장소의 항목을 품번별로 통합 (합계 수량 기준 내림차순)"""
+    if len(store) == 0:
+        return []
+    group_names, group_of_code = _group_codes(store, key_func)
+    if NUMPY_AVAILABLE:
+        result = _aggregate_numpy(store, group_names, group_of_code)
+    else:
+        result = _aggregate_python(store, group_names, group_of_code)
+    result.sort(key=lambda item: (-item.total_quantity, item.product_code))
+    return result
+
+
+def aggregate_documents(documents: Iterable[ProcessedDocument], use_catalog: bool = True) -> List[AggregatedItem]:
+    """여러 문서의 항목을 품번별로 통합 (카탈로그 매칭 품번이 있으면 그 품번 기준)"""
+    store = ItemStore()
+    for document in documents:
+        store.add_document(document, prefer_matched=use_catalog)
+    return aggregate_store(store)
+
+
+def iter_consolidated_rows(items: Iterable[AggregatedItem]) -> Iterator[Tuple[str, int, int, str]]:
+    """통합 결과를 내보내기용 행으로 변환"""
+    for item in items:
+        yield item.to_row()
@@ -0,0 +1,387 @@
+import hashlib
+import inspect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from importlib.metadata import entry_points
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..config.runtime import RuntimeConfig
+from ..models.document import DocumentPage
+from ..utils.file_utils import get_app_data_dir
+from ..utils.archive_reader import ArchiveReader
+from ..utils.serialization import dumps, loads
+from .ocr_service import OCR_PROMPT_VERSION, MockOCRService, OCRResult, RealOCRService
+from .triage import PageInput, parse_text_layer_result
+
+# 외부 패키지가 백엔드를 등록하는 entry point 그룹
+ENTRY_POINT_GROUP = "dklok_ocr.backends"
+
+# 백엔드 기능 플래그
+CAP_IMAGE = "image"            # 페이지 이미지를 처리
+CAP_TEXT_LAYER = "text_layer"  # PDF 텍스트 레이어를 처리
+CAP_OFFLINE = "offline"        # 네트워크 / API 비용 없이 동작
+CAP_CACHEABLE = "cacheable"    # 결과를 캐시에 저장해도 됨
+CAP_LOOKUP = "lookup"          # 저장된 결과만 반환 (없으면 다음 백엔드로)
+
+# 비전 API 페이지당 예상 토큰 수 (비용 모델 기본값)
+ESTIMATED_PROMPT_TOKENS = 1500
+ESTIMATED_COMPLETION_TOKENS = 300
+
+# 관측 지연 시간 이동 평균 가중치
+_LATENCY_ALPHA = 0.2
+
+
+class CircuitOpenError(RuntimeError):
+    """차단기가 열려 있어 백엔드에 요청하지 않음"""
+
+
+class OCRBackend(ABC):
+    """OCR 백엔드 기본 클래스 (동시 처리 한도, 비용 모델, 기능 플래그 선언)"""
+
+    name = "base"
+    capabilities: FrozenSet[str] = frozenset()
+    max_concurrency = 1
+    expected_latency = 1.0  # 관측값이 없을 때의 예상 지연 시간 (초)
+
+    def __init__(self):
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency = self.expected_latency
+
+    def can_process(self, page: PageInput) -> bool:
+        """페이지를 처리할 수 있는지 (필요한 입력이 있는지)"""
+        if CAP_IMAGE in self.capabilities and page.image_path:
+            return True
+        return CAP_TEXT_LAYER in self.capabilities and bool(page.text)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        """페이지 하나의 예상 비용 (USD)"""
+        return 0.0
+
+    def estimate_wait(self) -> float:
+        """현재 부하를 고려한 예상 완료 시간 (초)"""
+        return self.latency * (1 + self.in_flight // self.max_concurrency)
+
+    @abstractmethod
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        """페이지 처리 (처리할 수 없으면 None)"""
+
+    def run(self, page: PageInput) -> Optional[OCRResult]:
+        """동시 처리 한도 안에서 페이지 처리 후 지연 시간 기록"""
+        with self._lock:
+            self.in_flight += 1
+        try:
+            with self._semaphore:
+                start = time.perf_counter()
+                result = self.process_page(page)
+                elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latency += _LATENCY_ALPHA * (elapsed - self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if result is not None and result.backend is None:
+            result.backend = self.name
+        return result
+
+    def close(self) -> None:
+        """백엔드가 가진 스레드 등 자원 정리 (래퍼는 감싼 백엔드도 정리)"""
+        inner = getattr(self, "inner", None)
+        if inner is not None:
+            inner.close()
+
+
+class MockBackend(OCRBackend):
+    """개발용 모킹 백엔드"""
+
+    name = "mock"
+    capabilities = frozenset({CAP_IMAGE, CAP_OFFLINE})
+    max_concurrency = 4
+
+    def __init__(self, model_name: Optional[str] = None):
+        super().__init__()
+        self.service = MockOCRService(model_name)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        return 0.0055
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        return self.service.process_image_detailed(page.image_path, page.cancel_token)
+
+
+class OpenAIBackend(OCRBackend):
+    """OpenAI 비전 API 백엔드"""
+
+    name = "openai"
+    capabilities = frozenset({CAP_IMAGE, CAP_CACHEABLE})
+    expected_latency = 8.0
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        config: Optional[RuntimeConfig] = None
+    ):
+        self.config = config or RuntimeConfig.from_settings()
+        self.max_concurrency = max_concurrency or self.config.max_concurrency
+        super().__init__()
+        self.service = RealOCRService(model_name, config=self.config)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        return self.config.calculate_cost(ESTIMATED_PROMPT_TOKENS, ESTIMATED_COMPLETION_TOKENS,
+                                          self.service.model_name)
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        return self.service.process_image_detailed(page.image_path, page.cancel_token)
+
+
+class TextLayerBackend(OCRBackend):
+    """PDF 텍스트 레이어를 로컬에서 파싱하는 백엔드"""
+
+    name = "text_layer"
+    capabilities = frozenset({CAP_TEXT_LAYER, CAP_OFFLINE})
+    max_concurrency = 8
+    expected_latency = 0.001
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        return parse_text_layer_result(page.text or "")
+
+
+class OCRCache:
+    """페이지 이미지 내용(sha256) + 모델 / 프롬프트 기준 OCR 결과 캐시"""
+
+    def __init__(self, cache_dir: Optional[str] = None, config: Optional[RuntimeConfig] = None):
+        config = config or RuntimeConfig.from_settings()
+        self.cache_dir = cache_dir or os.path.join(get_app_data_dir(), "ocr_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 같은 이미지라도 모델 / 모델 단계 / 프롬프트가 바뀌면 이전 결과를 사용하지 않음
+        self.variant = "|".join([config.model_name, config.cascade_models, OCR_PROMPT_VERSION])
+        self.models = frozenset(
+            [config.model_name] + [name.strip() for name in config.cascade_models.split(',') if name.strip()]
+        )
+
+    def page_key(self, page: PageInput) -> Optional[str]:
+        if not page.image_path or not os.path.exists(page.image_path):
+            return None
+        digest = hashlib.sha256()
+        with open(page.image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b"\0" + self.variant.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, page: PageInput) -> Optional[OCRResult]:
+        key = self.page_key(page)
+        if key is None or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key), 'rb') as f:
+            return OCRResult.from_dict(loads(f.read()))
+
+    def put(self, page: PageInput, result: OCRResult) -> None:
+        if result.model is not None and result.model not in self.models:
+            return  # 예산 한도 등으로 설정과 다른 모델이 처리한 결과는 저장하지 않음
+        key = self.page_key(page)
+        if key is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 스레드가 읽는 중에도 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(dumps(result.to_dict()))
+        os.replace(temp_path, path)
+
+
+class CacheBackend(OCRBackend):
+    """캐시에 있는 결과만 반환하는 백엔드 (비용 없음)"""
+
+    name = "cache"
+    capabilities = frozenset({CAP_IMAGE, CAP_OFFLINE, CAP_LOOKUP})
+    max_concurrency = 8
+    expected_latency = 0.005
+
+    def __init__(self, cache: Optional[OCRCache] = None, config: Optional[RuntimeConfig] = None):
+        super().__init__()
+        self.cache = cache or OCRCache(config=config)
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        result = self.cache.get(page)
+        if result is None or result.status != "ok":
+            return None
+        # 캐시 결과는 다시 비용이 들지 않음
+        return OCRResult(result.items, 0.0, result.parse_stats, result.invalid_rows, f"cache:{result.backend}")
+
+
+class ReplayBackend(OCRBackend):
+    """보관된 결과 파일에서 같은 파일명 / 페이지의 결과를 재사용하는 백엔드"""
+
+    name = "replay"
+    capabilities = frozenset({CAP_IMAGE, CAP_TEXT_LAYER, CAP_OFFLINE, CAP_LOOKUP})
+    max_concurrency = 8
+    expected_latency = 0.001
+
+    def __init__(self, archive_paths: Iterable[str] = ()):
+        super().__init__()
+        self.archive_paths = list(archive_paths)
+        self._pages = None
+        self._load_lock = threading.Lock()
+
+    def _load(self) -> Dict[Tuple[str, int], DocumentPage]:
+        with self._load_lock:
+            if self._pages is None:
+                pages = {}
+                for archive_path in self.archive_paths:
+                    for archived in ArchiveReader(archive_path).iter_pages():
+                        # 같은 페이지가 여러 번 있으면 나중 결과 사용
+                        pages[(archived.filename, archived.page.page_number)] = archived.page
+                self._pages = pages
+        return self._pages
+
+    def can_process(self, page: PageInput) -> bool:
+        return bool(page.filename) and bool(self.archive_paths)
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        archived = self._load().get((page.filename, page.page_number))
+        if archived is None:
+            return None
+        return OCRResult(archived.items, 0.0)
+
+
+BackendFactory = Callable[..., OCRBackend]
+
+
+class BackendRegistry:
+    """이름으로 OCR 백엔드를 생성하는 레지스트리 (외부 패키지는 entry point로 등록)"""
+
+    def __init__(self):
+        self._factories: Dict[str, BackendFactory] = {}
+        self._entry_points_loaded = False
+
+    def register(self, name: str, factory: BackendFactory) -> None:
+        self._factories[name] = factory
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """설치된 패키지의 entry point 백엔드 등록 (내장 백엔드 이름은 덮어쓰지 않음)"""
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=group):
+            if entry_point.name in self._factories:
+                continue
+            try:
+                self._factories[entry_point.name] = entry_point.load()
+            except Exception as e:
+                print(f"경고: OCR 백엔드 '{entry_point.name}'을(를) 불러올 수 없습니다: {e}")
+
+    def names(self) -> List[str]:
+        self.load_entry_points()
+        return sorted(self._factories)
+
+    def factory(self, name: str) -> BackendFactory:
+        if name not in self._factories:
+            self.load_entry_points()
+        factory = self._factories.get(name)
+        if factory is None:
+            raise ValueError(f"알 수 없는 OCR 백엔드: {name} (사용 가능: {', '.join(self.names())})")
+        return factory
+
+    def accepts(self, name: str, option: str) -> bool:
+        """백엔드 생성 함수가 해당 인자를 받는지 (생성 중 TypeError와 구분하기 위해 시그니처로 확인)"""
+        try:
+            parameters = inspect.signature(self.factory(name)).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(parameter.name == option or parameter.kind is inspect.Parameter.VAR_KEYWORD
+                   for parameter in parameters)
+
+    def create(self, name: str, **options) -> OCRBackend:
+        return self.factory(name)(**options)
+
+
+registry = BackendRegistry()
+registry.register(MockBackend.name, MockBackend)
+registry.register(OpenAIBackend.name, OpenAIBackend)
+registry.register(TextLayerBackend.name, TextLayerBackend)
+registry.register(CacheBackend.name, CacheBackend)
+registry.register(ReplayBackend.name, ReplayBackend)
+
+
+def default_vision_backend(config: Optional[RuntimeConfig] = None) -> str:
+    """모킹 모드이거나 API 키가 없으면 mock, 아니면 openai"""
+    config = config or RuntimeConfig.from_settings()
+    if config.mock_mode or not config.api_key:
+        return MockBackend.name
+    return OpenAIBackend.name
+
+
+def create_backend(name: str, config: Optional[RuntimeConfig] = None, **options) -> OCRBackend:
+    """설정을 넘겨 백엔드 생성 (설정 인자를 받지 않는 백엔드는 설정 없이 생성)"""
+    if config is not None and registry.accepts(name, "config"):
+        options["config"] = config
+    return registry.create(name, **options)
+
+
+def create_backends(
+    names: Optional[Iterable[str]] = None,
+    replay_paths: Iterable[str] = (),
+    config: Optional[RuntimeConfig] = None
+) -> List[OCRBackend]:
+    """백엔드 이름 목록으로 백엔드 생성 (기본: 설정값, 없으면 캐시 + 비전 백엔드)"""
+    config = config or RuntimeConfig.from_settings()
+    if names is None:
+        names = [name.strip() for name in config.ocr_backends.split(',') if name.strip()]
+        if not names:
+            names = [CacheBackend.name, default_vision_backend(config)]
+    backends = [create_backend(name, config) for name in names if name != ReplayBackend.name]
+    replay_paths = list(replay_paths)
+    if replay_paths or ReplayBackend.name in names:
+        backends.insert(0, ReplayBackend(replay_paths))
+    return backends
+
+
+class BackendScheduler:
+    """페이지마다 비용 → 예상 지연 시간 순으로 백엔드를 골라 처리"""
+
+    def __init__(self, backends: List[OCRBackend]):
+        self.backends = backends
+        self.cache = next((backend.cache for backend in backends if isinstance(backend, CacheBackend)), None)
+
+    @property
+    def max_parallel_pages(self) -> int:
+        """동시에 처리할 페이지 수 (실제로 이미지를 처리하는 백엔드의 동시 처리 한도 합)"""
+        limits = [backend.max_concurrency for backend in self.backends
+                  if CAP_IMAGE in backend.capabilities and CAP_LOOKUP not in backend.capabilities]
+        return max(1, sum(limits))
+
+    def candidates(self, page: PageInput) -> List[OCRBackend]:
+        """처리 가능한 백엔드를 (예상 비용, 예상 지연 시간) 순으로 정렬"""
+        usable = [backend for backend in self.backends if backend.can_process(page)]
+        return sorted(usable, key=lambda backend: (backend.estimate_cost(page), backend.estimate_wait()))
+
+    def process(self, page: PageInput) -> OCRResult:
+        blocked = None
+        for backend in self.candidates(page):
+            try:
+                result = backend.run(page)
+            except CircuitOpenError as e:
+                # 차단기가 열린 백엔드는 건너뛰고 다음 백엔드 시도
+                blocked = e
+                continue
+            if result is None:
+                continue
+            # 보류된 결과(빈 결과)를 캐시하면 다음 처리에서 항목 없는 정상 페이지로 재사용되므로 정상 결과만 저장
+            if self.cache is not None and CAP_CACHEABLE in backend.capabilities and result.status == "ok":
+                try:
+                    self.cache.put(page, result)
+                except OSError as e:
+                    print(f"경고: OCR 캐시 저장 실패: {e}")
+            return result
+        if blocked is not None:
+            raise blocked
+        raise RuntimeError(f"페이지 {page.page_number}을(를) 처리할 수 있는 OCR 백엔드가 없습니다.")
@@ -0,0 +1,266 @@
+import datetime
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..config.runtime import RuntimeConfig
+from ..config.settings import DEFAULT_MODEL_PRICES
+from ..utils.file_utils import get_app_data_dir
+from ..utils.serialization import dumps, loads
+from .backends import CAP_IMAGE, CAP_LOOKUP, OCRBackend, create_backend, registry
+from .ocr_service import OCRResult
+from .triage import PageInput
+
+# 예산 사용률에 따른 조치
+ACTION_OK = "ok"                # 그대로 처리
+ACTION_SLOW = "slow"            # 요청 사이에 대기
+ACTION_DOWNGRADE = "downgrade"  # 저렴한 모델로 처리
+ACTION_HALT = "halt"            # 처리 중단 (대기열 정지)
+
+ACTION_LABELS = {
+    ACTION_OK: "정상",
+    ACTION_SLOW: "속도 제한",
+    ACTION_DOWNGRADE: "저렴한 모델 사용",
+    ACTION_HALT: "중단",
+}
+
+
+class BudgetExceededError(RuntimeError):
+    """예산 한도에 도달해 더 이상 API를 호출하지 않음"""
+
+
+@dataclass(frozen=True)
+class BudgetLimits:
+    """지출 한도 (USD, None이면 제한 없음)"""
+    run: Optional[float] = None       # 이번 실행
+    day: Optional[float] = None       # 오늘 (모든 실행 합계)
+    customer: Optional[float] = None  # 고객별 이번 달
+
+    def is_empty(self) -> bool:
+        return self.run is None and self.day is None and self.customer is None
+
+
+class SpendLedger:
+    """API 지출 기록 (JSON Lines에 한 줄씩 추가해 재시작 후에도 일별 / 고객별 합계 유지)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_app_data_dir(), "spend_ledger.jsonl")
+        self._daily: Dict[str, float] = {}
+        self._monthly: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    continue  # 기록 중 종료되어 잘린 마지막 줄
+                self._add(entry["date"], entry.get("customer", ""), entry["cost"])
+
+    def _add(self, date: str, customer: str, cost: float) -> None:
+        self._daily[date] = self._daily.get(date, 0.0) + cost
+        key = (customer, date[:7])
+        self._monthly[key] = self._monthly.get(key, 0.0) + cost
+
+    def record(self, cost: float, customer: str = "", model: Optional[str] = None,
+               date: Optional[datetime.date] = None) -> None:
+        date_text = (date or datetime.date.today()).isoformat()
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "date": date_text,
+            "customer": customer,
+            "cost": round(cost, 8),
+            "model": model,
+        }
+        with self._lock:
+            self._add(date_text, customer, cost)
+            with open(self.path, 'ab') as f:
+                f.write(dumps(entry) + b"\n")
+
+    def day_total(self, date: Optional[datetime.date] = None) -> float:
+        with self._lock:
+            return self._daily.get((date or datetime.date.today()).isoformat(), 0.0)
+
+    def customer_total(self, customer: str, date: Optional[datetime.date] = None) -> float:
+        """고객의 해당 월 지출 합계"""
+        month = (date or datetime.date.today()).isoformat()[:7]
+        with self._lock:
+            return self._monthly.get((customer, month), 0.0)
+
+
+class SpendGovernor:
+    """예산 사용률에 따라 요청 속도를 늦추거나, 저렴한 모델로 바꾸거나, 처리를 멈춤"""
+
+    def __init__(
+        self,
+        limits: BudgetLimits,
+        ledger: Optional[SpendLedger] = None,
+        customer: str = "",
+        slow_at: float = 0.7,
+        downgrade_at: float = 0.85,
+        slow_delay: float = 2.0
+    ):
+        self.limits = limits
+        self.ledger = ledger or SpendLedger()
+        self.customer = customer
+        self.slow_at = slow_at
+        self.downgrade_at = downgrade_at
+        self.slow_delay = slow_delay
+        self.run_spent = 0.0
+        self.halted = 0       # 예산 때문에 처리하지 않은 요청 수
+        self._reserved = 0.0  # 처리 중인 요청의 예상 비용 (동시 요청이 함께 한도를 넘지 않도록)
+        self._lock = threading.Lock()
+
+    def _usage(self, pending: float = 0.0) -> List[Tuple[str, float, float]]:
+        """(이름, 사용 금액 + 예정 금액, 한도) 목록"""
+        usage = []
+        if self.limits.run is not None:
+            usage.append(("실행", self.run_spent + pending, self.limits.run))
+        if self.limits.day is not None:
+            usage.append(("일일", self.ledger.day_total() + pending, self.limits.day))
+        if self.limits.customer is not None:
+            name = f"고객 {self.customer}" if self.customer else "고객"
+            usage.append((name, self.ledger.customer_total(self.customer) + pending, self.limits.customer))
+        return usage
+
+    def usage_ratio(self, pending: float = 0.0) -> float:
+        """가장 많이 사용한 한도의 사용률 (한도가 없으면 0)"""
+        ratios = [spent / limit if limit > 0 else float("inf") for _, spent, limit in self._usage(pending)]
+        return max(ratios, default=0.0)
+
+    def acquire(self, estimated_cost: float) -> str:
+        """요청 전에 조치 결정 후 예상 비용 예약 (처리 중인 요청까지 더해 한도를 넘으면 중단)"""
+        with self._lock:
+            ratio = self.usage_ratio(self._reserved + estimated_cost)
+            if ratio > 1.0:
+                return ACTION_HALT
+            self._reserved += estimated_cost
+        if ratio >= self.downgrade_at:
+            return ACTION_DOWNGRADE
+        if ratio >= self.slow_at:
+            return ACTION_SLOW
+        return ACTION_OK
+
+    def release(self, estimated_cost: float, cost: float = 0.0, model: Optional[str] = None) -> None:
+        """예약을 풀고 실제 비용 기록"""
+        with self._lock:
+            self._reserved -= estimated_cost
+            self.run_spent += cost
+        if cost > 0:
+            self.ledger.record(cost, self.customer, model)
+
+    def exceeded_error(self, estimated_cost: float) -> BudgetExceededError:
+        with self._lock:
+            self.halted += 1
+            usage = self._usage(self._reserved + estimated_cost)
+        details = ", ".join(f"{name} ${spent:.4f}/${limit:.4f}" for name, spent, limit in usage if spent > limit)
+        return BudgetExceededError(f"예산 한도에 도달해 처리를 멈춥니다 ({details}).")
+
+    def summary(self) -> str:
+        with self._lock:
+            usage = self._usage()
+        parts = [f"{name} ${spent:.4f}/${limit:.4f}" for name, spent, limit in usage]
+        return f"이번 실행 지출 ${self.run_spent:.4f}" + (f" (한도: {', '.join(parts)})" if parts else "")
+
+
+class BudgetedBackend(OCRBackend):
+    """요청 전에 지출 한도를 확인하고, 처리 후 실제 비용을 기록하는 백엔드 래퍼"""
+
+    def __init__(self, inner: OCRBackend, governor: SpendGovernor, cheaper: Optional[OCRBackend] = None):
+        self.inner = inner
+        self.governor = governor
+        self.cheaper = cheaper
+        self.name = inner.name
+        self.capabilities = inner.capabilities
+        self.max_concurrency = inner.max_concurrency
+        self.expected_latency = inner.expected_latency
+        super().__init__()
+
+    @property
+    def service(self):
+        return getattr(self.inner, "service", None)
+
+    def can_process(self, page: PageInput) -> bool:
+        return self.inner.can_process(page)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        return self.inner.estimate_cost(page)
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        backend = self.inner
+        estimated_cost = backend.estimate_cost(page)
+        action = self.governor.acquire(estimated_cost)
+        if action in (ACTION_DOWNGRADE, ACTION_HALT) and self.cheaper is not None:
+            # 한도에 가깝거나 이번 요청으로 넘는 경우 저렴한 모델로 남은 예산 안에서 처리
+            if action == ACTION_DOWNGRADE:
+                self.governor.release(estimated_cost)
+            backend = self.cheaper
+            estimated_cost = backend.estimate_cost(page)
+            action = self.governor.acquire(estimated_cost)
+            if action != ACTION_HALT:
+                action = ACTION_DOWNGRADE
+        if action == ACTION_HALT:
+            raise self.governor.exceeded_error(estimated_cost)
+
+        cost, model = 0.0, None
+        try:
+            if action in (ACTION_SLOW, ACTION_DOWNGRADE):
+                time.sleep(self.governor.slow_delay)
+            result = backend.run(page)
+            if result is not None:
+                cost, model = result.cost, result.model or result.backend
+                if action != ACTION_OK:
+                    result.timing["budget"] = action
+            return result
+        finally:
+            self.governor.release(estimated_cost, cost, model)
+
+
+def cheapest_model(config: RuntimeConfig) -> str:
+    """예산이 부족할 때 사용할 모델 (설정이 없으면 단가표에서 가장 저렴한 모델)"""
+    if config.budget_fallback_model:
+        return config.budget_fallback_model
+    return min(DEFAULT_MODEL_PRICES, key=lambda model: sum(DEFAULT_MODEL_PRICES[model]))
+
+
+def create_governor(config: RuntimeConfig, ledger: Optional[SpendLedger] = None) -> Optional[SpendGovernor]:
+    """설정된 한도로 지출 관리자 생성 (한도가 없으면 None)"""
+    limits = BudgetLimits(
+        run=config.budget_run or None,
+        day=config.budget_day or None,
+        customer=config.budget_customer or None
+    )
+    if limits.is_empty():
+        return None
+    return SpendGovernor(limits, ledger, config.customer)
+
+
+def apply_budget(
+    backends: List[OCRBackend],
+    governor: Optional[SpendGovernor],
+    config: Optional[RuntimeConfig] = None
+) -> List[OCRBackend]:
+    """이미지를 실제로 처리하는 백엔드에 지출 한도 적용 (캐시 / 재사용 백엔드 제외)"""
+    if governor is None:
+        return backends
+    config = config or RuntimeConfig.from_settings()
+    model = cheapest_model(config)
+    result = []
+    for backend in backends:
+        if CAP_IMAGE in backend.capabilities and CAP_LOOKUP not in backend.capabilities:
+            try:
+                # 모델 지정을 지원하지 않는 백엔드는 속도 제한 / 중단만 적용
+                accepts_model = registry.accepts(backend.name, "model_name")
+            except ValueError:
+                accepts_model = False  # 등록되지 않은 백엔드 (직접 만든 백엔드 등)
+            cheaper = create_backend(backend.name, config, model_name=model) if accepts_model else None
+            result.append(BudgetedBackend(backend, governor, cheaper))
+        else:
+            result.append(backend)
+    return result
@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..config.runtime import RuntimeConfig
+from .backends import CAP_IMAGE, CAP_LOOKUP, OCRBackend, create_backend, registry
+from .catalog import ProductCatalog
+from .ocr_service import OCRResult
+from .triage import PageClassifier, PageInput
+
+# 상위 모델로 다시 처리하는 이유
+REASON_EMPTY = "empty"                    # 추출된 항목이 없음
+REASON_INVALID_ROWS = "invalid_rows"      # 수량 등 검증 실패 행이 있음
+REASON_CATALOG_MISMATCH = "catalog_mismatch"  # 카탈로그에 없는 품번이 있음
+REASON_LOW_CONFIDENCE = "low_confidence"  # 모델이 응답한 신뢰도가 낮음
+
+
+@dataclass(frozen=True)
+class CascadePolicy:
+    """모델 단계 상승 조건"""
+    min_confidence: float = 0.8
+    escalate_on_empty: bool = True
+    escalate_on_invalid: bool = True
+    escalate_on_mismatch: bool = True
+
+
+def escalation_reasons(
+    result: OCRResult,
+    policy: CascadePolicy,
+    catalog: Optional[ProductCatalog] = None,
+    expects_items: bool = True
+) -> List[str]:
+    """결과를 검증해 상위 모델로 넘겨야 하는 이유 목록 반환 (비어 있으면 통과)
+
+    expects_items가 False이면(표지, 약관 등 주문 항목이 없을 페이지) 빈 결과를 실패로 보지 않음
+    """
+    reasons = []
+    if policy.escalate_on_empty and expects_items and not result.items and not result.invalid_rows:
+        reasons.append(REASON_EMPTY)
+    if policy.escalate_on_invalid and result.invalid_rows:
+        reasons.append(REASON_INVALID_ROWS)
+    if policy.escalate_on_mismatch and catalog is not None and any(
+        catalog.match(item.product_code).matched_code is None for item in result.items
+    ):
+        reasons.append(REASON_CATALOG_MISMATCH)
+    if result.confidence is not None and result.confidence < policy.min_confidence:
+        reasons.append(REASON_LOW_CONFIDENCE)
+    return reasons
+
+
+class CascadeBackend(OCRBackend):
+    """저렴한 모델부터 처리하고, 검증에 실패한 페이지만 상위 모델로 다시 처리하는 백엔드"""
+
+    def __init__(
+        self,
+        tiers: List[OCRBackend],
+        policy: Optional[CascadePolicy] = None,
+        catalog: Optional[ProductCatalog] = None,
+        classifier: Optional[PageClassifier] = None
+    ):
+        if not tiers:
+            raise ValueError("모델 단계가 하나 이상 필요합니다.")
+        self.tiers = tiers
+        self.policy = policy or CascadePolicy()
+        self.catalog = catalog
+        self.classifier = classifier or PageClassifier()
+        self.name = tiers[0].name
+        self.capabilities = tiers[0].capabilities
+        self.max_concurrency = tiers[0].max_concurrency
+        self.expected_latency = tiers[0].expected_latency
+        super().__init__()
+
+    def can_process(self, page: PageInput) -> bool:
+        return self.tiers[0].can_process(page)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        # 대부분의 페이지는 첫 단계에서 끝나므로 첫 단계 비용으로 추정
+        return self.tiers[0].estimate_cost(page)
+
+    def close(self) -> None:
+        for tier in self.tiers:
+            tier.close()
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        attempts = []
+        total_cost = 0.0
+        expects_items = None
+        for tier in self.tiers:
+            result = tier.run(page)
+            if result is None:
+                continue
+            if expects_items is None and not result.items and not result.invalid_rows:
+                # 빈 결과일 때만 페이지를 분류 (표나 품번 줄이 없는 페이지는 비어 있는 게 정상)
+                expects_items = self.classifier.looks_like_order_page(page)
+            reasons = escalation_reasons(result, self.policy, self.catalog, expects_items is not False)
+            total_cost += result.cost
+            attempts.append((result, reasons))
+            if not reasons:
+                break
+
+        if not attempts:
+            return None
+
+        # 모든 단계가 실패하면 실패 이유가 가장 적은 결과 (같으면 상위 모델) 사용
+        chosen, _ = min(reversed(attempts), key=lambda attempt: len(attempt[1]))
+        path = [
+            {
+                "model": result.model,
+                "backend": result.backend,
+                "cost": round(result.cost, 6),
+                "items": len(result.items),
+                "reasons": reasons,
+            }
+            for result, reasons in attempts
+        ]
+        chosen.cascade = path
+        chosen.cost = total_cost
+        return chosen
+
+
+def parse_model_list(value: str) -> List[str]:
+    """쉼표로 구분된 모델 목록 파싱"""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def apply_cascade(
+    backends: List[OCRBackend],
+    models: Optional[List[str]] = None,
+    catalog: Optional[ProductCatalog] = None,
+    policy: Optional[CascadePolicy] = None,
+    config: Optional[RuntimeConfig] = None
+) -> List[OCRBackend]:
+    """이미지를 실제로 처리하는 백엔드를 모델별 단계로 나눈 CascadeBackend로 교체 (모델이 2개 이상일 때)"""
+    config = config or RuntimeConfig.from_settings()
+    if models is None:
+        models = parse_model_list(config.cascade_models)
+    if len(models) < 2:
+        return backends
+    policy = policy or CascadePolicy(min_confidence=config.min_confidence)
+    result = []
+    for backend in backends:
+        if CAP_IMAGE in backend.capabilities and CAP_LOOKUP not in backend.capabilities:
+            if not registry.accepts(backend.name, "model_name"):
+                print(f"경고: '{backend.name}' 백엔드는 모델 지정을 지원하지 않아 단계 처리를 사용하지 않습니다.")
+                result.append(backend)
+                continue
+            tiers = [create_backend(backend.name, config, model_name=model) for model in models]
+            result.append(CascadeBackend(tiers, policy, catalog))
+        else:
+            result.append(backend)
+    return result
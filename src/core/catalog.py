@@ -0,0 +1,202 @@
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..models.order_item import OrderItem, normalize_product_code
+
+# OCR에서 자주 혼동되는 문자를 같은 문자로 접음 (후보 검색용 키)
+_CONFUSION_FOLD = str.maketrans({
+    'O': '0', 'Q': '0', 'D': '0',
+    'I': '1', 'L': '1',
+    'Z': '2',
+    'S': '5',
+    'G': '6',
+    'B': '8',
+})
+# 혼동 문자 치환 / 대시 누락·추가에 대한 가중치 (일반 편집은 1.0)
+CONFUSION_COST = 0.5
+DASH_COST = 0.5
+
+# 카탈로그 CSV에서 품번 열로 인식할 헤더 이름
+_CODE_COLUMN_NAMES = ("품번", "product_code", "sku", "code", "part_number", "part no")
+
+
+@dataclass(frozen=True)
+class CatalogMatch:
+    """카탈로그 매칭 결과"""
+    code: str                    # OCR로 읽은 품번
+    matched_code: Optional[str]  # 가장 가까운 카탈로그 품번 (없으면 None)
+    distance: float              # 가중 편집 거리 (0이면 정확히 일치)
+
+    @property
+    def exact(self) -> bool:
+        return self.matched_code is not None and self.distance == 0
+
+
+def _fold(code: str) -> str:
+    """대시를 제거하고 혼동 문자를 접은 후보 검색 키"""
+    return code.replace('-', '').translate(_CONFUSION_FOLD)
+
+
+def _deletes(key: str, max_distance: int) -> Set[str]:
+    """key에서 최대 max_distance개 문자를 지운 문자열 집합 (symmetric delete)"""
+    result = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def weighted_distance(a: str, b: str, limit: float = float('inf')) -> float:
+    """혼동 문자 / 대시 차이를 낮게 치는 편집 거리 (limit를 넘으면 그 즉시 중단)"""
+    if a == b:
+        return 0.0
+    folded_b = b.translate(_CONFUSION_FOLD)
+    insert_costs = [DASH_COST if char == '-' else 1.0 for char in b]
+
+    previous = [0.0]
+    for cost in insert_costs:
+        previous.append(previous[-1] + cost)
+
+    width = len(b)
+    for char_a, fold_a in zip(a, a.translate(_CONFUSION_FOLD)):
+        delete_cost = DASH_COST if char_a == '-' else 1.0
+        left = previous[0] + delete_cost
+        current = [left]
+        row_min = left
+        for j in range(width):
+            char_b = b[j]
+            if char_a == char_b:
+                value = previous[j]
+            elif fold_a == folded_b[j]:
+                value = previous[j] + CONFUSION_COST
+            else:
+                value = previous[j] + 1.0
+            deletion = previous[j + 1] + delete_cost
+            if deletion < value:
+                value = deletion
+            insertion = left + insert_costs[j]
+            if insertion < value:
+                value = insertion
+            current.append(value)
+            left = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return row_min
+        previous = current
+    return previous[-1]
+
+
+class ProductCatalog:
+    """품번 카탈로그 (OCR 품번을 가장 가까운 유효 품번으로 보정)"""
+
+    def __init__(self, codes: Iterable[str], max_distance: int = 1, max_score: float = 2.0):
+        self.max_distance = max_distance
+        self.max_score = max_score
+        self.codes: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._folded: Dict[str, List[int]] = {}
+        self._deletes: Dict[str, List[int]] = {}
+
+        for code in codes:
+            normalized = normalize_product_code(code)
+            if not normalized or normalized in self._exact:
+                continue
+            code_id = len(self.codes)
+            self.codes.append(normalized)
+            self._exact[normalized] = code_id
+            folded = _fold(normalized)
+            self._folded.setdefault(folded, []).append(code_id)
+            for key in _deletes(folded, max_distance):
+                self._deletes.setdefault(key, []).append(code_id)
+
+        self.match = lru_cache(maxsize=65536)(self._match)
+
+    @classmethod
+    def from_csv(cls, csv_path: str, column: Optional[str] = None, **kwargs) -> "ProductCatalog":
+        """CSV 파일에서 카탈로그 불러오기 (품번 열 자동 인식, 없으면 첫 번째 열)"""
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return cls([], **kwargs)
+
+            lowered = [name.strip().lower() for name in header]
+            if column is not None:
+                index = lowered.index(column.strip().lower())
+                rows = reader
+            else:
+                index = next((lowered.index(name) for name in _CODE_COLUMN_NAMES if name in lowered), None)
+                if index is None:
+                    # 헤더가 없는 파일로 보고 첫 줄도 품번으로 사용
+                    index = 0
+                    rows = [header]
+                    rows.extend(reader)
+                else:
+                    rows = reader
+            return cls((row[index] for row in rows if len(row) > index), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return normalize_product_code(code) in self._exact
+
+    def _match(self, code: str) -> CatalogMatch:
+        normalized = normalize_product_code(code)
+        if normalized in self._exact:
+            return CatalogMatch(code, normalized, 0.0)
+
+        folded = _fold(normalized)
+        best_code, best_distance = self._best_of(normalized, self._folded.get(folded, ()), float('inf'))
+
+        # 접은 키가 같은 후보는 혼동 문자 / 대시 차이만 있으므로, 거리가 1 이하면
+        # 일반 편집(비용 1 이상)이 필요한 다른 후보보다 항상 가깝거나 같음
+        if best_distance > 1.0:
+            candidates: Set[int] = set()
+            for key in _deletes(folded, self.max_distance):
+                candidates.update(self._deletes.get(key, ()))
+            candidate, distance = self._best_of(normalized, candidates, min(best_distance, self.max_score))
+            if candidate is not None and (distance < best_distance
+                                          or (distance == best_distance and candidate < best_code)):
+                best_code, best_distance = candidate, distance
+
+        if best_code is None or best_distance > self.max_score:
+            return CatalogMatch(code, None, best_distance)
+        return CatalogMatch(code, best_code, best_distance)
+
+    def _best_of(self, normalized: str, code_ids: Iterable[int], limit: float):
+        """후보들 중 가장 가까운 품번과 거리 (limit보다 먼 후보는 무시)"""
+        best_code = None
+        best_distance = float('inf')
+        for code_id in code_ids:
+            candidate = self.codes[code_id]
+            # 길이 차이만으로도 limit를 넘는 후보는 건너뜀 (대시 차이는 0.5)
+            if abs(len(candidate) - len(normalized)) * DASH_COST > min(limit, best_distance):
+                continue
+            distance = weighted_distance(normalized, candidate, min(limit, best_distance))
+            if distance < best_distance or (distance == best_distance and candidate < best_code):
+                best_code, best_distance = candidate, distance
+        return best_code, best_distance
+
+    def annotate(self, items: Iterable[OrderItem]) -> Dict[str, int]:
+        """항목들에 매칭 결과를 기록하고 요약 통계 반환"""
+        stats = {"exact": 0, "corrected": 0, "unmatched": 0}
+        for item in items:
+            result = self.match(item.product_code)
+            item.matched_code = result.matched_code
+            item.match_distance = result.distance if result.matched_code is not None else None
+            if result.matched_code is None:
+                stats["unmatched"] += 1
+            elif result.exact:
+                stats["exact"] += 1
+            else:
+                stats["corrected"] += 1
+        return stats
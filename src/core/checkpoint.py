@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from ..models.document import DocumentPage, ProcessedDocument
+from ..utils.file_utils import get_app_data_dir
+from ..utils.serialization import dumps, loads
+
+# 이 기간(일)보다 오래된 체크포인트는 삭제
+CHECKPOINT_MAX_AGE_DAYS = 30
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentCheckpoint:
+    """파일 하나의 처리 기록 (페이지가 끝날 때마다 한 줄씩 디스크에 기록)"""
+
+    def __init__(self, path: str, fingerprint: str = ""):
+        self.path = path
+        self.fingerprint = fingerprint  # 처리 설정 (다른 설정으로 만든 기록은 사용하지 않음)
+        self.pages: Dict[int, DocumentPage] = {}
+        self.document: Optional[ProcessedDocument] = None  # 완료된 문서 (미완료면 None)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # 기록 중 종료되어 잘린 마지막 줄은 잘라 내야 다음 기록이 이어 붙지 않음
+        valid_length = data.rfind(b"\n") + 1
+        if valid_length < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_length)
+        for line in data[:valid_length].splitlines():
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue
+            if "fingerprint" in entry:
+                if entry["fingerprint"] != self.fingerprint:
+                    self.discard()
+                    return
+            elif "document" in entry:
+                self.document = ProcessedDocument.from_dict(entry["document"])
+            else:
+                page = DocumentPage.from_dict(entry["page"])
+                self.pages[page.page_number] = page
+
+    def _append(self, entry: dict) -> None:
+        with self._lock:
+            header = b"" if os.path.exists(self.path) else dumps({"fingerprint": self.fingerprint}) + b"\n"
+            with open(self.path, 'ab') as f:
+                f.write(header + dumps(entry) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_page(self, page: DocumentPage) -> None:
+        """처리가 끝난 페이지 기록 (다시 시작하면 이 페이지는 건너뜀)"""
+        self._append({"page": page.to_dict()})
+        with self._lock:
+            self.pages[page.page_number] = page
+
+    def complete(self, document: ProcessedDocument) -> None:
+        """문서 완료 기록 (페이지 기록을 문서 한 줄로 교체)"""
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, 'wb') as f:
+                f.write(dumps({"fingerprint": self.fingerprint}) + b"\n")
+                f.write(dumps({"document": document.to_dict()}) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.document = document
+
+    def discard(self) -> None:
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.pages = {}
+            self.document = None
+
+
+class CheckpointJournal:
+    """파일 내용(sha256)별 처리 기록 (중단된 작업을 다시 시작하면 끝난 페이지 / 파일은 건너뜀)"""
+
+    def __init__(self, journal_dir: Optional[str] = None):
+        self.journal_dir = journal_dir or os.path.join(get_app_data_dir(), "checkpoints")
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        self.prune()
+
+    def file_key(self, file_path: str) -> str:
+        """파일 내용 해시 (경로 / 크기 / 수정 시각이 같으면 다시 계산하지 않음)"""
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            key = self._hashes.get(cache_key)
+        if key is None:
+            key = file_sha256(file_path)
+            with self._lock:
+                self._hashes[cache_key] = key
+        return key
+
+    def _path(self, file_path: str) -> str:
+        return os.path.join(self.journal_dir, self.file_key(file_path) + ".jsonl")
+
+    def open(self, file_path: str, fingerprint: str = "") -> DocumentCheckpoint:
+        return DocumentCheckpoint(self._path(file_path), fingerprint)
+
+    def completed_document(self, file_path: str, fingerprint: str = "") -> Optional[ProcessedDocument]:
+        """같은 설정으로 이전 실행에서 완료된 문서 (없으면 None)"""
+        if not os.path.exists(self._path(file_path)):
+            return None
+        return self.open(file_path, fingerprint).document
+
+    def prune(self, max_age_days: int = CHECKPOINT_MAX_AGE_DAYS) -> None:
+        cutoff = time.time() - max_age_days * 86400
+        for name in os.listdir(self.journal_dir):
+            path = os.path.join(self.journal_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
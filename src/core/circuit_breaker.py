@@ -0,0 +1,263 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..config.runtime import RuntimeConfig
+from ..utils.cancellation import OperationCancelled
+from .backends import CAP_IMAGE, CAP_LOOKUP, CircuitOpenError, OCRBackend, create_backend
+from .ocr_service import OCRResult
+from .triage import PageInput
+
+# 차단기 상태
+STATE_CLOSED = "closed"        # 정상
+STATE_OPEN = "open"            # 차단 (요청하지 않고 즉시 실패 / 대체 경로)
+STATE_HALF_OPEN = "half_open"  # 복구 확인 중 (시험 요청만 허용)
+
+STATE_LABELS = {
+    STATE_CLOSED: "정상",
+    STATE_OPEN: "차단",
+    STATE_HALF_OPEN: "복구 확인 중",
+}
+
+# 차단 시 대체 경로
+FALLBACK_FAIL = "fail"    # 즉시 실패
+FALLBACK_DEFER = "defer"  # 빈 결과로 표시해 두고 나중에 다시 처리
+
+
+@dataclass
+class BreakerStats:
+    """차단기 통계"""
+    successes: int = 0
+    failures: int = 0
+    slow_calls: int = 0
+    rejected: int = 0   # 차단 상태에서 요청하지 않은 횟수
+    fallbacks: int = 0  # 대체 경로로 처리한 횟수
+    opened: int = 0     # 차단된 횟수
+
+
+class CircuitBreaker:
+    """연속 실패 / 지연 시간 급증 시 요청을 차단하고, 일정 시간 후 시험 요청으로 복구"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_threshold: Optional[float] = None,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold  # 이보다 느린 응답은 실패로 셈 (None이면 사용 안 함)
+        self.half_open_max_calls = half_open_max_calls
+        self.stats = BreakerStats()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        latency_threshold: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None
+    ) -> None:
+        """기준값 변경 (상태 / 통계는 유지, latency_threshold=None이면 지연 기준 사용 안 함)"""
+        with self._lock:
+            if failure_threshold is not None:
+                self.failure_threshold = failure_threshold
+            if reset_timeout is not None:
+                self.reset_timeout = reset_timeout
+            if half_open_max_calls is not None:
+                self.half_open_max_calls = half_open_max_calls
+            self.latency_threshold = latency_threshold
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _open(self) -> None:
+        if self._state != STATE_OPEN:
+            self.stats.opened += 1
+            print(f"[Circuit] {self.name}: 연속 실패로 요청 차단 ({self.reset_timeout:g}초 후 복구 확인)")
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 (복구 확인 중에는 시험 요청 수만큼만 허용)"""
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.stats.rejected += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            if self.latency_threshold is not None and latency > self.latency_threshold:
+                self.stats.slow_calls += 1
+                self._record_failure_locked()
+                return
+            self.stats.successes += 1
+            self._consecutive_failures = 0
+            if self._state != STATE_CLOSED:
+                print(f"[Circuit] {self.name}: 복구됨")
+            self._state = STATE_CLOSED
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.stats.fallbacks += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats.failures += 1
+            self._record_failure_locked()
+
+    def _record_failure_locked(self) -> None:
+        self._consecutive_failures += 1
+        # 복구 확인 중 실패하면 바로 다시 차단
+        if self._state == STATE_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (f"{self.name}: {STATE_LABELS[self.state]} "
+                f"(성공 {stats.successes}, 실패 {stats.failures}, 지연 {stats.slow_calls}, "
+                f"차단 {stats.opened}회, 즉시 거부 {stats.rejected}, 대체 처리 {stats.fallbacks})")
+
+
+# 백엔드 이름별 차단기 (여러 문서 / 처리기 사이에서 공유)
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **options) -> CircuitBreaker:
+    """백엔드 이름의 공유 차단기 (처음 요청할 때 생성, 이미 있으면 기준값을 이번 설정으로 변경)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **options)
+            _breakers[name] = breaker
+        else:
+            breaker.configure(**options)
+        return breaker
+
+
+def breaker_states() -> Dict[str, str]:
+    """생성된 차단기들의 현재 상태"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state for breaker in breakers}
+
+
+class CircuitBreakerBackend(OCRBackend):
+    """차단기로 보호되는 백엔드 래퍼 (차단 중에는 즉시 실패하거나 대체 백엔드 / 보류로 처리)"""
+
+    def __init__(
+        self,
+        inner: OCRBackend,
+        breaker: CircuitBreaker,
+        fallback: Optional[OCRBackend] = None,
+        defer: bool = False
+    ):
+        self.inner = inner
+        self.breaker = breaker
+        self.fallback = fallback
+        self.defer = defer
+        self.name = inner.name
+        self.capabilities = inner.capabilities
+        self.max_concurrency = inner.max_concurrency
+        self.expected_latency = inner.expected_latency
+        super().__init__()
+
+    @property
+    def service(self):
+        return getattr(self.inner, "service", None)
+
+    def can_process(self, page: PageInput) -> bool:
+        return self.inner.can_process(page)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        return self.inner.estimate_cost(page)
+
+    def _degraded(self, page: PageInput, error: Optional[Exception]) -> OCRResult:
+        """차단 / 실패 시 대체 경로"""
+        if self.fallback is not None and self.fallback.can_process(page):
+            result = self.fallback.run(page)
+            if result is not None:
+                self.breaker.record_fallback()
+                result.timing["degraded"] = self.breaker.state
+                return result
+        if self.defer:
+            self.breaker.record_fallback()
+            return OCRResult([], 0.0, backend=self.name, status="deferred",
+                             timing={"degraded": self.breaker.state})
+        if error is not None:
+            raise error
+        raise CircuitOpenError(f"{self.name} 백엔드 요청이 차단되었습니다 (연속 실패).")
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        if not self.breaker.allow_request():
+            return self._degraded(page, None)
+
+        start = time.perf_counter()
+        try:
+            result = self.inner.run(page)
+        except OperationCancelled:
+            # 사용자가 취소해 중단된 요청은 백엔드 실패가 아님
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            return self._degraded(page, e)
+        self.breaker.record_success(time.perf_counter() - start)
+        return result
+
+
+def create_fallback(spec: str, inner: OCRBackend, config: Optional[RuntimeConfig] = None) -> Optional[OCRBackend]:
+    """대체 경로 설정값으로 대체 백엔드 생성 ("model:이름"이면 같은 백엔드의 다른 모델)"""
+    if not spec or spec in (FALLBACK_FAIL, FALLBACK_DEFER):
+        return None
+    if spec.startswith("model:"):
+        return create_backend(inner.name, config, model_name=spec[len("model:"):])
+    return create_backend(spec, config)
+
+
+def apply_circuit_breakers(
+    backends: List[OCRBackend],
+    fallback: Optional[str] = None,
+    config: Optional[RuntimeConfig] = None
+) -> List[OCRBackend]:
+    """이미지를 실제로 처리하는 백엔드에 차단기 적용 (캐시 / 재사용 백엔드 제외)"""
+    config = config or RuntimeConfig.from_settings()
+    if fallback is None:
+        fallback = config.breaker_fallback
+    latency_threshold = config.breaker_latency_threshold or None
+    result = []
+    for backend in backends:
+        if CAP_IMAGE in backend.capabilities and CAP_LOOKUP not in backend.capabilities:
+            breaker = get_breaker(
+                backend.name,
+                failure_threshold=config.breaker_failure_threshold,
+                reset_timeout=config.breaker_reset_timeout,
+                latency_threshold=latency_threshold
+            )
+            result.append(CircuitBreakerBackend(
+                backend, breaker, create_fallback(fallback, backend, config), defer=fallback == FALLBACK_DEFER
+            ))
+        else:
+            result.append(backend)
+    return result
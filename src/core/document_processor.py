@@ -1,36 +1,355 @@
+import hashlib
 import os
+import time
 import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
 from typing import List, Callable, Optional
-from ..models.document import ProcessedDocument, DocumentPage
+from ..models.document import PAGE_CANCELLED, PAGE_FAILED, ProcessedDocument, DocumentPage
 from ..models.order_item import OrderItem
+from ..utils.cancellation import CancellationToken, OperationCancelled
 from ..utils.pdf_converter import PDFConverter
 from ..utils.file_utils import is_pdf_file
-from .ocr_service import OCRService
+from .ocr_service import OCRResult
+from .backends import CAP_LOOKUP, BackendScheduler, OCRBackend, create_backends
+from .budget import SpendGovernor, apply_budget, create_governor
+from .cascade import CascadeBackend, apply_cascade
+from .circuit_breaker import apply_circuit_breakers
+from .hedging import apply_hedging, hedging_policy_from_settings
+from .catalog import ProductCatalog
+from .checkpoint import CheckpointJournal, DocumentCheckpoint
+from .estimator import LatencyHistory
+from .triage import PageInput, PageRouter, create_default_router
+from ..config.runtime import RuntimeConfig
+
+# 페이지 처리를 기다리는 동안 취소 여부를 확인하는 간격 (초)
+CANCEL_POLL_SECONDS = 0.1
 
 
 class DocumentProcessor:
     """문서 처리 메인 클래스"""
     
-    def __init__(self):
-        self.ocr_service = OCRService()
-        self.pdf_converter = PDFConverter()
+    def __init__(
+        self,
+        catalog: Optional[ProductCatalog] = None,
+        backends: Optional[List[OCRBackend]] = None,
+        config: Optional[RuntimeConfig] = None,
+        latency_history: Optional[LatencyHistory] = None,
+        governor: Optional[SpendGovernor] = None,
+        checkpoints: Optional[CheckpointJournal] = None
+    ):
+        # 작업 동안 바뀌지 않는 설정 스냅샷 (없으면 현재 앱 설정)
+        self.config = config or RuntimeConfig.from_settings()
+        # 지출 한도 관리 (한도가 설정되지 않았으면 None)
+        self.governor = governor if governor is not None else create_governor(self.config)
+        # 페이지마다 비용 / 지연 시간이 낮은 백엔드부터 시도 (기본: 캐시 → 비전 API)
+        self.catalog = catalog if catalog is not None else self._load_catalog()
+        if backends is None:
+            backends = apply_cascade(create_backends(config=self.config), config=self.config)
+            backends = apply_hedging(backends, hedging_policy_from_settings(self.config))
+            backends = apply_circuit_breakers(backends, config=self.config)
+            backends = apply_budget(backends, self.governor, self.config)
+        self.scheduler = BackendScheduler(backends)
+        for backend in self.scheduler.backends:
+            # 모델 단계 처리는 카탈로그에 없는 품번도 상위 모델로 다시 처리
+            while backend is not None and not isinstance(backend, CascadeBackend):
+                backend = getattr(backend, "inner", None)
+            if backend is not None and backend.catalog is None:
+                backend.catalog = self.catalog
+        print(f"[OCR] 백엔드: {', '.join(backend.name for backend in self.scheduler.backends)} "
+              f"(동시 처리 {self.scheduler.max_parallel_pages}페이지)")
+        # API 페이지 처리 시간 기록 (사전 예상 시간 계산용)
+        self.latency_history = latency_history if latency_history is not None else LatencyHistory()
+        self.pdf_converter = PDFConverter(self.config.dpi, self.config.render_workers,
+                                          self.config.render_chunk_pages)
+        # 페이지별 처리 기록 (중단 후 다시 처리하면 끝난 페이지 / 파일은 건너뜀)
+        self.checkpoints = checkpoints if checkpoints is not None else CheckpointJournal()
+        # 페이지 분류 후 텍스트 파싱 / OCR / 건너뜀으로 보냄 (router.register로 경로 추가)
+        self.router: PageRouter = create_default_router(self._ocr_page)
+    
+    def _load_catalog(self) -> Optional[ProductCatalog]:
+        """설정된 품번 카탈로그 불러오기"""
+        catalog_path = self.config.catalog_path
+        if not catalog_path:
+            return None
+        try:
+            catalog = ProductCatalog.from_csv(catalog_path)
+            print(f"[Catalog] {len(catalog)}개 품번 로드: {catalog_path}")
+            return catalog
+        except Exception as e:
+            print(f"경고: 품번 카탈로그를 불러올 수 없습니다: {e}")
+            return None
+    
+    @property
+    def checkpoint_fingerprint(self) -> str:
+        """결과에 영향을 주는 설정 (바뀌면 이전 처리 기록을 사용하지 않음)"""
+        return "|".join([
+            self.config.model_name, str(self.config.dpi), self.config.cascade_models,
+            str(self.config.min_confidence), self.config.catalog_path,
+            ",".join(backend.name for backend in self.scheduler.backends)
+        ])
+    
+    def document_key(self, file_path: str) -> str:
+        """원본 파일 내용과 처리 설정으로 만든 문서 키 (다시 처리 / 결과 재사용에도 같은 값)"""
+        fingerprint = hashlib.sha256(self.checkpoint_fingerprint.encode('utf-8')).hexdigest()[:12]
+        return f"{self.checkpoints.file_key(file_path)}:{fingerprint}"
+    
+    def completed_document(self, file_path: str) -> Optional[ProcessedDocument]:
+        """이전 실행에서 같은 설정으로 처리를 마친 문서 (없거나 다시 처리하도록 설정했으면 None)"""
+        if not (self.config.resume and self.config.reuse_completed):
+            return None
+        document = self.checkpoints.completed_document(file_path, self.checkpoint_fingerprint)
+        if document is not None:
+            document.source_key = self.document_key(file_path)
+        return document
     
     def process_document(
         self, 
         file_path: str, 
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        page_callback: Optional[Callable[[DocumentPage], None]] = None
     ) -> ProcessedDocument:
-        """문서 처리 메인 메서드"""
+        """문서 처리 메인 메서드 (취소되면 그때까지 처리한 페이지만 담아 반환, page_callback은 페이지가 끝날 때마다 호출)"""
         
-        if is_pdf_file(file_path):
-            return self._process_pdf(file_path, progress_callback)
-        else:
-            return self._process_image(file_path, progress_callback)
+        try:
+            checkpoint = self.checkpoints.open(file_path, self.checkpoint_fingerprint)
+            # 완료된 문서 기록은 그대로 사용하고, 다시 처리하도록 설정했으면 버리고 처음부터 처리
+            if not self.config.resume or (checkpoint.document is not None and not self.config.reuse_completed):
+                checkpoint.discard()
+            if checkpoint.document is not None:
+                print(f"이전 실행에서 처리를 마친 문서입니다: {file_path}")
+                if progress_callback:
+                    progress_callback(checkpoint.document.total_pages, checkpoint.document.total_pages)
+                checkpoint.document.source_key = self.document_key(file_path)
+                return checkpoint.document
+            if is_pdf_file(file_path):
+                document = self._process_pdf(file_path, progress_callback, checkpoint, cancel_token, page_callback)
+            else:
+                document = self._process_image(file_path, progress_callback, checkpoint, cancel_token, page_callback)
+            document.source_key = self.document_key(file_path)
+            self._complete_checkpoint(checkpoint, document)
+            return document
+        finally:
+            self._save_latency_history()
+    
+    def retry_failed_pages(
+        self,
+        document: ProcessedDocument,
+        file_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> ProcessedDocument:
+        """실패 / 보류 / 취소된 페이지만 다시 처리해 문서에 합침 (원본 파일 필요)"""
+        page_numbers = [page.page_number for page in document.pages_to_retry]
+        if not page_numbers:
+            return document
+        print(f"페이지 다시 처리 중: {', '.join(map(str, page_numbers))} ({file_path})")
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.basename(file_path)
+            if is_pdf_file(file_path):
+                image_paths = self.pdf_converter.render_pages(file_path, page_numbers, temp_dir)
+                page_texts = self.pdf_converter.extract_page_texts(file_path)
+                page_inputs = [
+                    PageInput(number, image_paths[number],
+                              page_texts[number - 1] if number <= len(page_texts) else None, filename)
+                    for number in page_numbers
+                ]
+            else:
+                page_inputs = [PageInput(1, file_path, filename=filename)]
+            checkpoint = self.checkpoints.open(file_path, self.checkpoint_fingerprint)
+            journaled = set(checkpoint.pages)
+            pages = self._process_pages(page_inputs, progress_callback, checkpoint, cancel_token)
+            retried = {page.page_number: page for page in pages}
+            
+            for page in document.pages:
+                if page.page_number not in retried:
+                    continue
+                cost = retried[page.page_number].raw_content.get("cost", 0.0)
+                if page.page_number in journaled and page.raw_content.get("cost_estimated"):
+                    # 취소 때 기다리지 않은 요청이 그 뒤에 끝나 기록된 페이지: 예상 비용을 실제 비용으로 교체
+                    cost -= page.raw_content.get("cost", 0.0)
+                document.processing_cost += cost
+            document.set_pages([retried.get(page.page_number, page) for page in document.pages])
+            self._complete_checkpoint(checkpoint, document)
+            return document
+        finally:
+            self._save_latency_history()
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+    
+    def _complete_checkpoint(self, checkpoint: DocumentCheckpoint, document: ProcessedDocument) -> None:
+        """모든 페이지가 정상 처리된 문서만 완료로 기록"""
+        if document.pages_to_retry:
+            return
+        try:
+            checkpoint.complete(document)
+        except OSError as e:
+            print(f"경고: 처리 기록 저장 실패: {e}")
+    
+    def close(self) -> None:
+        """실행이 끝난 뒤 백엔드 자원 (헤지 요청 스레드 등) 정리"""
+        for backend in self.scheduler.backends:
+            backend.close()
+    
+    def _save_latency_history(self) -> None:
+        try:
+            self.latency_history.save()
+        except OSError as e:
+            print(f"경고: 지연 시간 기록 저장 실패: {e}")
+    
+    def _ocr_page(self, page: PageInput) -> OCRResult:
+        """비전 OCR 경로 (백엔드 스케줄러)"""
+        return self.scheduler.process(page)
+    
+    def _process_page(self, page_input: PageInput) -> DocumentPage:
+        """페이지 하나를 분류하고 해당 경로로 처리"""
+        start = time.perf_counter()
+        result, triage = self.router.process(page_input)
+        if result.cost > 0 and result.backend:
+            self.latency_history.record(result.backend, time.perf_counter() - start)
+        raw_content = self._build_raw_content(result)
+        raw_content["triage"] = triage
+        raw_content["cost"] = result.cost
+        if result.backend:
+            raw_content["backend"] = result.backend
+        if result.timing:
+            raw_content["timing"] = result.timing
+        if result.model:
+            raw_content["model"] = result.model
+        if result.cascade:
+            raw_content["cascade"] = result.cascade
+        if result.status != "ok":
+            raw_content["status"] = result.status
+        return DocumentPage(
+            page_number=page_input.page_number,
+            items=result.items,
+            raw_content=raw_content
+        )
+    
+    def _process_and_record(self, page_input: PageInput, checkpoint: Optional[DocumentCheckpoint]) -> DocumentPage:
+        """페이지를 처리하고 처리 기록에 추가 (실패 / 보류된 페이지는 다시 처리하도록 기록하지 않음)"""
+        try:
+            page = self._process_page(page_input)
+        except OperationCancelled:
+            # 취소로 중단된 요청은 실패로 남기지 않음 (호출한 쪽이 취소된 페이지로 기록)
+            return self._cancelled_page(page_input.page_number)
+        except Exception as e:
+            # 한 페이지가 실패해도 나머지 페이지 결과는 유지 (retry_failed_pages로 다시 처리)
+            print(f"경고: 페이지 {page_input.page_number} 처리 실패: {e}")
+            page = DocumentPage(
+                page_number=page_input.page_number,
+                items=[],
+                raw_content={"status": PAGE_FAILED, "error": str(e), "error_type": type(e).__name__, "cost": 0.0}
+            )
+        cancel_token = page_input.cancel_token
+        if cancel_token is not None and cancel_token.cancelled:
+            # 취소된 문서가 반환된 뒤에 끝난 요청은 처리 기록에 남기지 않음
+            return page
+        if checkpoint is not None and page.raw_content.get("status", "ok") == "ok":
+            try:
+                checkpoint.record_page(page)
+            except OSError as e:
+                print(f"경고: 처리 기록 저장 실패: {e}")
+        return page
+    
+    def _in_flight_cost(self, page_input: PageInput) -> float:
+        """취소 시점에 처리 중이던 페이지의 예상 비용 (중단한 요청도 이미 보낸 만큼 청구될 수 있음)"""
+        candidates = self.scheduler.candidates(page_input)
+        return next((backend.estimate_cost(page_input) for backend in candidates
+                     if CAP_LOOKUP not in backend.capabilities), 0.0)
+    
+    @staticmethod
+    def _cancelled_page(page_number: int, cost: float = 0.0) -> DocumentPage:
+        raw_content = {"status": PAGE_CANCELLED, "cost": cost}
+        if cost:
+            raw_content["cost_estimated"] = True
+        return DocumentPage(page_number=page_number, items=[], raw_content=raw_content)
+    
+    def _process_pages(
+        self,
+        page_inputs: List[PageInput],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint: Optional[DocumentCheckpoint] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        page_callback: Optional[Callable[[DocumentPage], None]] = None
+    ) -> List[DocumentPage]:
+        """페이지들을 백엔드 동시 처리 한도 안에서 병렬로 처리 (결과는 페이지 순서)"""
+        total = len(page_inputs)
+        done_pages = dict(checkpoint.pages) if checkpoint is not None else {}
+        pending = [page_input for page_input in page_inputs if page_input.page_number not in done_pages]
+        if cancel_token is not None:
+            # 백엔드가 취소 시 처리 중인 요청을 중단할 수 있도록 토큰 전달
+            pending = [replace(page_input, cancel_token=cancel_token) for page_input in pending]
+        if done_pages:
+            print(f"이전 실행에서 처리한 {total - len(pending)}개 페이지는 건너뜁니다.")
+            if page_callback:
+                for page_number in sorted(done_pages):
+                    page_callback(done_pages[page_number])
+        workers = min(self.scheduler.max_parallel_pages, len(pending))
+        # 취소할 수 있는 작업은 한 페이지씩 처리하더라도 작업자 스레드에서 처리하며 취소 여부 확인
+        if workers <= 1 and cancel_token is None:
+            for page_input in pending:
+                print(f"페이지 {page_input.page_number}/{total} 처리 중...")
+                if progress_callback:
+                    progress_callback(page_input.page_number, total)
+                done_pages[page_input.page_number] = self._process_and_record(page_input, checkpoint)
+                if page_callback:
+                    page_callback(done_pages[page_input.page_number])
+            return [done_pages[page_input.page_number] for page_input in page_inputs]
+
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        cancelled = False
+        try:
+            futures = {executor.submit(self._process_and_record, page_input, checkpoint): page_input
+                       for page_input in pending}
+            remaining = set(futures)
+            done = total - len(pending)
+            while remaining:
+                finished, remaining = wait(remaining, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page = done_pages[futures[future].page_number] = future.result()
+                    done += 1
+                    if page_callback:
+                        page_callback(page)
+                    print(f"페이지 {done}/{total} 처리 완료")
+                    if progress_callback:
+                        progress_callback(done, total)
+                if remaining and cancel_token is not None and cancel_token.cancelled:
+                    # 대기 중인 페이지는 취소하고, 처리 중인 요청은 중단되므로 기다리지 않음
+                    cancelled = True
+                    for future in remaining:
+                        page_input = futures[future]
+                        cost = 0.0 if future.cancel() else self._in_flight_cost(page_input)
+                        done_pages[page_input.page_number] = self._cancelled_page(page_input.page_number, cost)
+                    print(f"처리를 취소했습니다: {done}/{total} 페이지 완료, {len(remaining)}개 페이지 미처리")
+                    break
+            return [done_pages[page_input.page_number] for page_input in page_inputs]
+        finally:
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
+    
+    def _build_raw_content(self, result: OCRResult) -> dict:
+        """OCR 결과로부터 페이지 raw_content 생성"""
+        raw_content = {
+            "processed_items": len(result.items),
+            "parse_stats": result.parse_stats.to_dict()
+        }
+        if result.invalid_rows:
+            raw_content["invalid_rows"] = result.invalid_rows
+        if self.catalog is not None:
+            raw_content["catalog"] = self.catalog.annotate(result.items)
+        return raw_content
     
     def _process_pdf(
         self, 
         pdf_path: str, 
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint: Optional[DocumentCheckpoint] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        page_callback: Optional[Callable[[DocumentPage], None]] = None
     ) -> ProcessedDocument:
         """PDF 파일 처리"""
         print(f"PDF 파일 처리 중: {pdf_path}")
@@ -39,35 +358,47 @@ class DocumentProcessor:
         total_cost = 0.0
         
         try:
-            # PDF를 이미지로 변환
-            image_paths, num_pages = self.pdf_converter.convert_to_images(pdf_path, temp_dir)
-            print(f"PDF를 {num_pages}개 페이지로 변환 완료")
-            
-            pages = []
+            # 렌더링 전에 페이지 수를 알려 진행 표시를 바로 시작
+            if progress_callback:
+                try:
+                    page_count = self.pdf_converter.probe(pdf_path).page_count
+                except Exception as e:
+                    print(f"경고: PDF 정보 확인 실패: {e}")
+                    page_count = 0
+                if page_count:
+                    progress_callback(0, page_count)
             
-            # 각 페이지 처리
-            for i, img_path in enumerate(image_paths):
-                page_num = i + 1
-                print(f"페이지 {page_num}/{num_pages} 처리 중...")
-                
-                if progress_callback:
-                    progress_callback(page_num, num_pages)
-                
-                # OCR 처리
-                items, page_cost = self.ocr_service.process_image(img_path)
-                total_cost += page_cost
-                
-                # 페이지 데이터 생성
-                page = DocumentPage(
-                    page_number=page_num,
-                    items=items,
-                    raw_content={"processed_items": len(items)}
+            try:
+                # PDF를 이미지로 변환
+                image_paths, num_pages = self.pdf_converter.convert_to_images(pdf_path, temp_dir, cancel_token)
+                print(f"PDF를 {num_pages}개 페이지로 변환 완료")
+                page_texts = self.pdf_converter.extract_page_texts(pdf_path)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+            except OperationCancelled:
+                # OCR 전에 취소되면 이전 실행에서 처리한 페이지만 반환
+                num_pages = self.pdf_converter.probe(pdf_path).page_count
+                print("처리를 취소했습니다 (렌더링 중)")
+                pages = [
+                    checkpoint.pages.get(number) if checkpoint is not None and number in checkpoint.pages
+                    else self._cancelled_page(number)
+                    for number in range(1, num_pages + 1)
+                ]
+                return ProcessedDocument(
+                    filename=os.path.basename(pdf_path),
+                    document_type="PDF",
+                    total_pages=num_pages,
+                    pages=pages,
+                    processing_cost=sum(page.raw_content.get("cost", 0.0) for page in pages)
                 )
-                pages.append(page)
-                
-                # 임시 이미지 파일 삭제
-                if os.path.exists(img_path):
-                    os.remove(img_path)
+            filename = os.path.basename(pdf_path)
+            
+            page_inputs = [
+                PageInput(i + 1, img_path, page_texts[i] if i < len(page_texts) else None, filename)
+                for i, img_path in enumerate(image_paths)
+            ]
+            pages = self._process_pages(page_inputs, progress_callback, checkpoint, cancel_token, page_callback)
+            total_cost = sum(page.raw_content["cost"] for page in pages)
             
             # 문서 결과 생성
             document = ProcessedDocument(
@@ -81,8 +412,10 @@ class DocumentProcessor:
             return document
             
         finally:
-            # 임시 디렉토리 정리
+            # 임시 이미지 파일 및 디렉토리 정리
             try:
+                for name in os.listdir(temp_dir):
+                    os.remove(os.path.join(temp_dir, name))
                 if os.path.exists(temp_dir):
                     os.rmdir(temp_dir)
             except OSError:
@@ -91,7 +424,10 @@ class DocumentProcessor:
     def _process_image(
         self, 
         image_path: str, 
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint: Optional[DocumentCheckpoint] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        page_callback: Optional[Callable[[DocumentPage], None]] = None
     ) -> ProcessedDocument:
         """이미지 파일 처리"""
         print(f"이미지 파일 처리 중: {image_path}")
@@ -99,15 +435,11 @@ class DocumentProcessor:
         if progress_callback:
             progress_callback(1, 1)
         
-        # OCR 처리
-        items, cost = self.ocr_service.process_image(image_path)
-        
-        # 페이지 데이터 생성
-        page = DocumentPage(
-            page_number=1,
-            items=items,
-            raw_content={"processed_items": len(items)}
-        )
+        # 페이지 분류 후 처리
+        page_input = PageInput(1, image_path, filename=os.path.basename(image_path))
+        page = self._process_pages([page_input], checkpoint=checkpoint, cancel_token=cancel_token,
+                                   page_callback=page_callback)[0]
+        cost = page.raw_content["cost"]
         
         # 문서 결과 생성
         document = ProcessedDocument(
@@ -0,0 +1,223 @@
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..config.runtime import RuntimeConfig
+from ..utils.file_utils import get_app_data_dir
+from ..utils.pdf_converter import DocumentProbe, probe_document
+from ..utils.serialization import dumps, loads
+from .backends import ESTIMATED_COMPLETION_TOKENS, OpenAIBackend
+from .cascade import parse_model_list
+
+# 프롬프트 텍스트 토큰 수 (이미지 제외)
+PROMPT_TEXT_TOKENS = 150
+
+# 모델별 이미지 토큰 계산 방식: ("tile", 기본 토큰, 512px 타일당 토큰) 또는 ("patch", 배율)
+IMAGE_TOKEN_MODELS = {
+    "gpt-4o": ("tile", 85, 170),
+    "gpt-4.1": ("tile", 85, 170),
+    "gpt-4o-mini": ("tile", 2833, 5667),
+    "gpt-4.1-mini": ("patch", 1.62),
+    "gpt-4.1-nano": ("patch", 2.46),
+}
+
+# 렌더링 시간 추정 (백만 픽셀당 초, PyMuPDF 단일 코어 기준)
+RENDER_SECONDS_PER_MEGAPIXEL = 0.02
+
+# 지연 시간 기록에 남길 최근 관측 수
+_HISTORY_WINDOW = 200
+
+
+def image_tokens(width: int, height: int, model_name: str) -> int:
+    """비전 API가 이미지 하나에 청구하는 입력 토큰 수 (high detail 기준 근사)"""
+    rule = IMAGE_TOKEN_MODELS.get(model_name, IMAGE_TOKEN_MODELS["gpt-4o"])
+    if width <= 0 or height <= 0:
+        return 0
+    if rule[0] == "patch":
+        # 32px 패치 수 (최대 1536개)에 모델 배율 적용
+        patches = min(1536, math.ceil(width / 32) * math.ceil(height / 32))
+        return int(math.ceil(patches * rule[1]))
+
+    _, base_tokens, tile_tokens = rule
+    # 2048px 안으로 줄인 뒤 짧은 변을 768px로 맞춤
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return base_tokens + tile_tokens * tiles
+
+
+class LatencyHistory:
+    """백엔드별 페이지 처리 시간 기록 (실행 간 유지, 사전 예상 시간 계산용)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_app_data_dir(), "latency_history.json")
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    self._samples = loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"경고: 지연 시간 기록을 읽을 수 없습니다: {e}")
+
+    def record(self, backend: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(backend, [])
+            samples.append(round(seconds, 3))
+            del samples[:-_HISTORY_WINDOW]
+
+    def median(self, backend: str) -> Optional[float]:
+        """관측된 페이지 처리 시간의 중앙값 (기록이 없으면 None)"""
+        with self._lock:
+            samples = sorted(self._samples.get(backend, []))
+        if not samples:
+            return None
+        return samples[len(samples) // 2]
+
+    def save(self) -> None:
+        with self._lock:
+            data = dumps(self._samples)
+        # 여러 문서를 동시에 처리할 때 저장이 겹쳐도 파일이 섞이지 않도록 임시 파일로 교체
+        temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+
+@dataclass
+class FileEstimate:
+    """파일 하나의 사전 예상치"""
+    path: str
+    pages: int = 0
+    text_pages: int = 0             # 텍스트 레이어로 로컬 처리될 것으로 예상되는 페이지
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0               # 예상 비용 (텍스트 레이어 페이지 제외)
+    max_cost: float = 0.0           # 최대 비용 (모든 페이지를 API로 처리해 모델 단계를 끝까지 올리고 헤지 예산까지 사용한 경우)
+    seconds: float = 0.0            # 예상 소요 시간
+    error: Optional[str] = None
+
+    @property
+    def ocr_pages(self) -> int:
+        return self.pages - self.text_pages
+
+
+@dataclass
+class BatchEstimate:
+    """여러 파일의 사전 예상치"""
+    files: List[FileEstimate] = field(default_factory=list)
+    model: str = ""
+    latency: float = 0.0            # 사용한 페이지당 지연 시간 (초)
+    latency_observed: bool = False  # 지연 시간이 실제 관측값인지
+
+    @property
+    def pages(self) -> int:
+        return sum(estimate.pages for estimate in self.files)
+
+    @property
+    def ocr_pages(self) -> int:
+        return sum(estimate.ocr_pages for estimate in self.files)
+
+    @property
+    def cost(self) -> float:
+        return sum(estimate.cost for estimate in self.files)
+
+    @property
+    def max_cost(self) -> float:
+        return sum(estimate.max_cost for estimate in self.files)
+
+    @property
+    def seconds(self) -> float:
+        # 파일은 하나씩, 페이지는 파일 안에서 병렬 처리
+        return sum(estimate.seconds for estimate in self.files)
+
+
+class CostEstimator:
+    """API 호출 없이 문서 구조만으로 비용 / 소요 시간 예상"""
+
+    def __init__(
+        self,
+        config: Optional[RuntimeConfig] = None,
+        history: Optional[LatencyHistory] = None,
+        model_name: Optional[str] = None,
+        cascade_models: Optional[List[str]] = None
+    ):
+        self.config = config or RuntimeConfig.from_settings()
+        self.history = history
+        if cascade_models is None:
+            cascade_models = parse_model_list(self.config.cascade_models)
+        # 모델 단계 처리를 쓰면 예상 비용은 첫 단계, 최대 비용은 모든 단계 호출 기준
+        self.tier_models = cascade_models if len(cascade_models) >= 2 else []
+        self.model_name = model_name or (self.tier_models[0] if self.tier_models else self.config.model_name)
+        if not self.tier_models:
+            self.tier_models = [self.model_name]
+
+    def page_latency(self) -> Tuple[float, bool]:
+        """페이지당 API 지연 시간 (관측값이 있으면 관측값)"""
+        observed = self.history.median(OpenAIBackend.name) if self.history is not None else None
+        if observed is not None:
+            return observed, True
+        return OpenAIBackend.expected_latency, False
+
+    def estimate_probe(self, probe: DocumentProbe) -> FileEstimate:
+        """문서 사전 정보로 예상치 계산"""
+        estimate = FileEstimate(probe.path, pages=probe.page_count, text_pages=probe.text_pages)
+        all_pages_cost = 0.0
+        for page in probe.pages:
+            width, height = page.render_size(probe.dpi)
+            prompt_tokens = PROMPT_TEXT_TOKENS + image_tokens(width, height, self.model_name)
+            page_cost = self.config.calculate_cost(prompt_tokens, ESTIMATED_COMPLETION_TOKENS, self.model_name)
+            # 검증에 실패한 페이지는 상위 단계까지 다시 처리되고 비용이 모두 합산됨
+            all_pages_cost += sum(self._page_cost(width, height, model) for model in self.tier_models)
+            if page.has_text:
+                continue
+            estimate.prompt_tokens += prompt_tokens
+            estimate.completion_tokens += ESTIMATED_COMPLETION_TOKENS
+            estimate.cost += page_cost
+        estimate.max_cost = all_pages_cost * (1 + self.config.hedge_budget)
+
+        latency, _ = self.page_latency()
+        concurrency = max(1, self.config.max_concurrency)
+        api_seconds = math.ceil(estimate.ocr_pages / concurrency) * latency
+        if self.config.requests_per_minute:
+            api_seconds = max(api_seconds, estimate.ocr_pages * 60 / self.config.requests_per_minute)
+        estimate.seconds = api_seconds + probe.render_megapixels * RENDER_SECONDS_PER_MEGAPIXEL
+        return estimate
+
+    def _page_cost(self, width: int, height: int, model_name: str) -> float:
+        prompt_tokens = PROMPT_TEXT_TOKENS + image_tokens(width, height, model_name)
+        return self.config.calculate_cost(prompt_tokens, ESTIMATED_COMPLETION_TOKENS, model_name)
+
+    def estimate_file(self, path: str) -> FileEstimate:
+        try:
+            return self.estimate_probe(probe_document(path, self.config.dpi))
+        except Exception as e:
+            return FileEstimate(path, error=str(e))
+
+    def estimate(self, paths: List[str]) -> BatchEstimate:
+        latency, observed = self.page_latency()
+        return BatchEstimate(
+            files=[self.estimate_file(path) for path in paths],
+            model=self.model_name,
+            latency=latency,
+            latency_observed=observed
+        )
+
+
+def format_duration(seconds: float) -> str:
+    """초를 "1시간 2분 3초" 형식으로"""
+    seconds = int(math.ceil(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    parts = []
+    if hours:
+        parts.append(f"{hours}시간")
+    if minutes:
+        parts.append(f"{minutes}분")
+    if seconds or not parts:
+        parts.append(f"{seconds}초")
+    return " ".join(parts)
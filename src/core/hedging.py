@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..config.runtime import RuntimeConfig
+from .backends import CAP_IMAGE, CAP_LOOKUP, OCRBackend
+from .cascade import CascadeBackend
+from .ocr_service import OCRResult
+from .triage import PageInput
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """헤지 요청 정책"""
+    percentile: float = 0.95    # 최근 지연 시간의 이 백분위를 넘으면 중복 요청
+    budget_ratio: float = 0.05  # 헤지로 인한 추가 비용 상한 (기본 요청 예상 비용 대비)
+    min_samples: int = 20       # 이보다 관측값이 적으면 헤지하지 않음
+    min_delay: float = 0.5      # 헤지 전 최소 대기 시간 (초)
+    window: int = 200           # 백분위 계산에 쓰는 최근 관측 수
+
+
+@dataclass
+class HedgeStats:
+    """헤지 요청 통계"""
+    requests: int = 0            # 기본 요청 수
+    hedges: int = 0              # 헤지 요청 수
+    wins: int = 0                # 헤지 요청이 먼저 끝난 횟수
+    budget_skips: int = 0        # 예산 부족으로 헤지하지 않은 횟수
+    extra_cost: float = 0.0      # 헤지로 인한 실제 추가 비용 (늦게 끝난 요청 비용)
+
+    def to_dict(self) -> dict:
+        """딕셔너리로 변환"""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "wins": self.wins,
+            "budget_skips": self.budget_skips,
+            "extra_cost": round(self.extra_cost, 6)
+        }
+
+
+class LatencyTracker:
+    """최근 요청 지연 시간 기록 (백분위 계산)"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class HedgedBackend(OCRBackend):
+    """느린 요청에 중복 요청을 보내 먼저 온 결과를 사용하는 백엔드 래퍼"""
+
+    def __init__(self, inner: OCRBackend, policy: Optional[HedgingPolicy] = None):
+        self.inner = inner
+        self.policy = policy or HedgingPolicy()
+        self.name = inner.name
+        self.capabilities = inner.capabilities
+        self.max_concurrency = inner.max_concurrency
+        self.expected_latency = inner.expected_latency
+        super().__init__()
+        self.tracker = LatencyTracker(self.policy.window)
+        self.stats = HedgeStats()
+        self._stats_lock = threading.Lock()
+        self._base_cost = 0.0   # 기본 요청 예상 비용 합
+        self._hedge_cost = 0.0  # 헤지 요청 예상 비용 합
+        # 처음 요청할 때 만들고 close()에서 정리 (close 뒤에 다시 요청하면 새로 만듦)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def service(self):
+        return getattr(self.inner, "service", None)
+
+    def can_process(self, page: PageInput) -> bool:
+        return self.inner.can_process(page)
+
+    def estimate_cost(self, page: PageInput) -> float:
+        return self.inner.estimate_cost(page)
+
+    def _submit(self, page: PageInput) -> Future:
+        with self._executor_lock:
+            if self._executor is None:
+                # 기본 요청 + 헤지 요청을 함께 실행할 수 있는 크기
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency * 2,
+                                                    thread_name_prefix=f"hedge-{self.name}")
+            return self._executor.submit(self._timed_call, page)
+
+    def close(self) -> None:
+        """헤지 스레드 정리 (늦게 끝나는 요청은 기다리지 않음)"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        super().close()
+
+    def _timed_call(self, page: PageInput) -> OCRResult:
+        start = time.perf_counter()
+        result = self.inner.run(page)
+        self.tracker.record(time.perf_counter() - start)
+        return result
+
+    def _hedge_delay(self) -> Optional[float]:
+        """헤지까지 기다릴 시간 (관측값이 부족하면 None)"""
+        if len(self.tracker) < self.policy.min_samples:
+            return None
+        threshold = self.tracker.percentile(self.policy.percentile)
+        return max(self.policy.min_delay, threshold or 0.0)
+
+    def _reserve_hedge(self, estimated_cost: float) -> bool:
+        """예산과 빈 동시 처리 슬롯이 있으면 헤지 비용 예약"""
+        with self._stats_lock:
+            if self.inner.in_flight >= self.inner.max_concurrency:
+                return False
+            if self._hedge_cost + estimated_cost > self._base_cost * self.policy.budget_ratio:
+                self.stats.budget_skips += 1
+                return False
+            self._hedge_cost += estimated_cost
+            self.stats.hedges += 1
+            return True
+
+    def _record_loser(self, future: Future) -> None:
+        """늦게 끝난 요청의 비용을 추가 비용으로 기록"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result is not None:
+            with self._stats_lock:
+                self.stats.extra_cost += result.cost
+
+    def process_page(self, page: PageInput) -> Optional[OCRResult]:
+        estimated_cost = self.inner.estimate_cost(page)
+        with self._stats_lock:
+            self.stats.requests += 1
+            self._base_cost += estimated_cost
+
+        start = time.perf_counter()
+        primary = self._submit(page)
+        pending = {primary}
+        hedge = None
+
+        delay = self._hedge_delay()
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and self._reserve_hedge(estimated_cost):
+                hedge = self._submit(page)
+                pending.add(hedge)
+
+        # 먼저 성공한 결과 사용 (하나가 실패하면 나머지를 기다림)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is None:
+                error = next(iter(done)).exception()
+                continue
+
+            for future in pending:
+                future.add_done_callback(self._record_loser)
+            for future in done - {winner}:
+                self._record_loser(future)
+
+            result = winner.result()
+            if result is None:
+                return None
+            hedge_won = winner is hedge
+            if hedge_won:
+                with self._stats_lock:
+                    self.stats.wins += 1
+            result.timing.update({
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+                "hedged": hedge is not None,
+                "hedge_won": hedge_won,
+            })
+            if hedge is not None:
+                # 늦게 끝나는 요청도 비용이 청구되므로 예상 비용을 페이지 비용에 포함
+                result.timing["hedge_cost_estimate"] = round(estimated_cost, 6)
+                result.cost += estimated_cost
+            return result
+        raise error
+
+
+def hedging_policy_from_settings(config: Optional[RuntimeConfig] = None) -> Optional[HedgingPolicy]:
+    """설정의 헤지 백분위 / 예산으로 정책 생성 (백분위가 0이면 None)"""
+    config = config or RuntimeConfig.from_settings()
+    if config.hedge_percentile <= 0:
+        return None
+    return HedgingPolicy(percentile=config.hedge_percentile, budget_ratio=config.hedge_budget)
+
+
+def apply_hedging(backends: List[OCRBackend], policy: Optional[HedgingPolicy]) -> List[OCRBackend]:
+    """이미지를 실제로 처리하는 백엔드에 헤지 래퍼 적용 (캐시 / 재사용 백엔드 제외)"""
+    if policy is None:
+        return backends
+    result = []
+    for backend in backends:
+        if isinstance(backend, CascadeBackend):
+            # 모델 단계별로 지연 시간 분포가 다르므로 단계마다 따로 적용
+            backend.tiers = apply_hedging(backend.tiers, policy)
+            result.append(backend)
+        elif CAP_IMAGE in backend.capabilities and CAP_LOOKUP not in backend.capabilities:
+            result.append(HedgedBackend(backend, policy))
+        else:
+            result.append(backend)
+    return result
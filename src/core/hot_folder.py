@@ -0,0 +1,362 @@
+import ctypes
+import ctypes.util
+import datetime
+import os
+import select
+import shutil
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.document import ProcessedDocument
+from ..utils.cancellation import CancellationToken
+from ..utils.file_utils import ensure_directory_exists, is_image_file, is_pdf_file, save_json_result
+from ..utils.serialization import dumps
+from .document_processor import DocumentProcessor
+
+# inotify는 Linux 전용 (ctypes로 libc 호출, 없으면 폴링으로 감시)
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    INOTIFY_AVAILABLE = False
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len (뒤에 파일명 len바이트)
+
+# 크기 / 수정 시각이 이 시간(초) 동안 바뀌지 않아야 다 써진 파일로 봄
+DEFAULT_SETTLE_SECONDS = 2.0
+# 폴링 간격 / 감시 루프에서 한 번에 기다리는 시간 (초)
+POLL_INTERVAL = 1.0
+# 처리 결과가 없어도 상태 파일을 갱신하는 간격 (초)
+STATUS_INTERVAL = 5.0
+
+# 스캐너 / 복사 프로그램이 쓰는 중인 임시 파일
+_TEMP_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".filepart")
+
+
+def is_ingestible(path: str) -> bool:
+    """감시 폴더에서 처리할 파일인지 확인 (숨김 / 임시 파일 제외)"""
+    name = os.path.basename(path)
+    if name.startswith((".", "~")) or name.lower().endswith(_TEMP_SUFFIXES):
+        return False
+    return is_pdf_file(name) or is_image_file(name)
+
+
+def _list_files(directory: str) -> List[str]:
+    paths = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and is_ingestible(entry.name):
+                paths.append(entry.path)
+    return sorted(paths)
+
+
+class PollingWatcher:
+    """폴더 목록을 주기적으로 확인해 파일 감지 (inotify를 쓸 수 없는 환경 / 네트워크 드라이브용)"""
+    method = "polling"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._first = True
+
+    def poll(self, timeout: float) -> List[str]:
+        """처리 대상 파일 목록 (처음에는 바로, 이후에는 timeout만큼 기다린 뒤 확인)"""
+        if self._first:
+            self._first = False
+        elif timeout > 0:
+            time.sleep(timeout)
+        return _list_files(self.directory)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """inotify로 쓰기가 끝났거나 옮겨져 들어온 파일 감지"""
+    method = "inotify"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 실패: {os.strerror(error)}")
+        if _libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch 실패: {os.strerror(error)}")
+        self._first = True
+
+    def poll(self, timeout: float) -> List[str]:
+        """이벤트가 생긴 파일 목록 (처음에는 감시 시작 전에 들어온 파일 전체)"""
+        if self._first:
+            self._first = False
+            return _list_files(self.directory)
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start:start + length].rstrip(b"\0")
+            offset = start + length
+            if mask & _IN_Q_OVERFLOW:
+                # 이벤트가 넘쳐 일부를 놓쳤으면 폴더 전체를 다시 확인
+                return _list_files(self.directory)
+            if name:
+                path = os.path.join(self.directory, os.fsdecode(name))
+                if is_ingestible(path):
+                    paths.append(path)
+        return paths
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(directory: str, use_inotify: bool = True):
+    """inotify 감시 생성 (사용할 수 없으면 폴링)"""
+    if use_inotify and INOTIFY_AVAILABLE:
+        try:
+            return InotifyWatcher(directory)
+        except OSError as e:
+            print(f"경고: inotify를 사용할 수 없어 폴링으로 감시합니다: {e}")
+    return PollingWatcher(directory)
+
+
+class StableFileTracker:
+    """쓰는 중인 파일을 걸러 내기 위해 크기 / 수정 시각이 일정 시간 바뀌지 않은 파일만 넘겨줌"""
+
+    def __init__(self, settle_seconds: float = DEFAULT_SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        self._files: Dict[str, Tuple[int, int, float]] = {}  # 경로 → (크기, 수정 시각, 마지막 변경 확인 시각)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def add(self, path: str) -> None:
+        if path in self._files:
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._files[path] = (stat.st_size, stat.st_mtime_ns, time.monotonic())
+
+    def ready(self) -> List[str]:
+        """다 써진 파일 목록 (목록에서 제외됨)"""
+        now = time.monotonic()
+        ready = []
+        for path, (size, mtime, since) in list(self._files.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._files[path]  # 처리 전에 지워지거나 옮겨짐
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._files[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif stat.st_size > 0 and now - since >= self.settle_seconds:
+                del self._files[path]
+                ready.append(path)
+        return ready
+
+
+class HotFolder:
+    """감시 폴더에 들어온 주문서를 자동 처리 (원본은 done / failed 폴더로 옮기고 결과를 함께 저장)"""
+
+    def __init__(
+        self,
+        directory: str,
+        processor: DocumentProcessor,
+        workers: int = 2,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        done_dir: Optional[str] = None,
+        failed_dir: Optional[str] = None,
+        status_path: Optional[str] = None,
+        use_inotify: bool = True
+    ):
+        self.directory = os.path.abspath(directory)
+        self.processor = processor
+        self.workers = max(1, workers)
+        self.done_dir = done_dir or os.path.join(self.directory, "done")
+        self.failed_dir = failed_dir or os.path.join(self.directory, "failed")
+        self.status_path = status_path or os.path.join(self.directory, "status.json")
+        ensure_directory_exists(self.done_dir)
+        ensure_directory_exists(self.failed_dir)
+        self.watcher = create_watcher(self.directory, use_inotify)
+        self.tracker = StableFileTracker(settle_seconds)
+        self.stop_token = CancellationToken()  # 종료 시 처리 중인 문서는 완료된 페이지까지 기록하고 멈춤
+        self.processed = 0
+        self.failed = 0
+        self.pages = 0
+        self.cost = 0.0
+        self.last_file: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._claimed: Set[str] = set()  # 처리 대기 / 처리 중 (옮기지 못한 파일도 다시 처리하지 않도록 유지)
+        self._waiting = 0
+        self._active = 0
+        self._started = time.monotonic()
+        self._started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._last_status = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hot-folder")
+
+    def stop(self) -> None:
+        self.stop_token.cancel()
+
+    def run(self) -> None:
+        """종료 요청(stop)까지 폴더 감시"""
+        print(f"폴더 감시 시작: {self.directory} ({self.watcher.method}, 동시 처리 {self.workers}개)")
+        print(f"완료: {self.done_dir}, 실패: {self.failed_dir}, 상태: {self.status_path}")
+        try:
+            while not self.stop_token.cancelled:
+                self.step()
+        finally:
+            self.close()
+
+    def step(self, timeout: float = POLL_INTERVAL) -> None:
+        """새 파일 확인 → 다 써진 파일 처리 시작 → 상태 파일 갱신"""
+        for path in self.watcher.poll(timeout):
+            with self._lock:
+                claimed = path in self._claimed
+            if not claimed:
+                self.tracker.add(path)
+        for path in self.tracker.ready():
+            with self._lock:
+                self._claimed.add(path)
+                self._waiting += 1
+            self._executor.submit(self._run, path)
+        if time.monotonic() - self._last_status >= STATUS_INTERVAL:
+            self.write_status()
+
+    def close(self) -> None:
+        self.stop_token.cancel()
+        self._executor.shutdown(wait=True)
+        self.watcher.close()
+        self.write_status()
+        print(f"폴더 감시 종료: 완료 {self.processed}개, 실패 {self.failed}개")
+
+    def _run(self, path: str) -> None:
+        with self._lock:
+            self._waiting -= 1
+            self._active += 1
+        try:
+            if not self.stop_token.cancelled:
+                self._process(path)
+        except Exception as e:
+            print(f"오류: {os.path.basename(path)} 처리 결과를 저장하지 못했습니다: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not os.path.exists(path) or self.stop_token.cancelled:
+                    self._claimed.discard(path)
+            self.write_status()
+
+    def _process(self, path: str) -> None:
+        name = os.path.basename(path)
+        print(f"감시 폴더 처리 시작: {name}")
+        document: Optional[ProcessedDocument] = None
+        error = None
+        try:
+            document = self.processor.process_document(path, cancel_token=self.stop_token)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if document is not None and document.cancelled:
+            # 종료 중 취소된 문서는 그대로 두고 다음 시작 때 이어서 처리 (완료된 페이지는 체크포인트에 기록됨)
+            print(f"종료 요청으로 처리를 멈췄습니다: {name} (다음 시작 때 이어서 처리)")
+            return
+
+        failed = document is None or bool(document.pages_to_retry)
+        target = self._move(path, self.failed_dir if failed else self.done_dir)
+        if document is not None:
+            output_file = save_json_result(document.to_dict(), target, os.path.dirname(target))
+        else:
+            output_file = f"{target}.error.txt"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(error + "\n")
+
+        with self._lock:
+            self.last_file = name
+            if failed:
+                self.failed += 1
+                self.last_error = error or f"{name}: 실패 / 보류된 페이지 {len(document.pages_to_retry)}개"
+            else:
+                self.processed += 1
+            if document is not None:
+                self.pages += document.total_pages
+                self.cost += document.processing_cost
+        if failed:
+            print(f"처리 실패: {name} → {target} ({error or '실패 / 보류된 페이지 있음'})")
+            if document is not None:
+                print(f"다시 처리: python main.py --retry \"{output_file}\"")
+        else:
+            print(f"처리 완료: {name} → {target} (항목 {document.total_items}개)")
+
+        # 예산 한도에 걸렸으면 다음 파일도 같은 한도에 걸리므로 감시를 멈춤
+        governor = self.processor.governor
+        if governor is not None and governor.halted:
+            print("예산 한도에 도달해 폴더 감시를 멈춥니다. 남은 파일은 폴더에 그대로 둡니다.")
+            self.stop()
+
+    @staticmethod
+    def _move(path: str, target_dir: str) -> str:
+        """원본을 대상 폴더로 이동 (같은 이름이 있으면 시각을 붙임)"""
+        target = os.path.join(target_dir, os.path.basename(path))
+        if os.path.exists(target):
+            stem, ext = os.path.splitext(os.path.basename(path))
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            target = os.path.join(target_dir, f"{stem}_{timestamp}{ext}")
+        shutil.move(path, target)
+        return target
+
+    def status(self) -> dict:
+        """처리량 / 대기열 상태"""
+        with self._lock:
+            elapsed_minutes = max(time.monotonic() - self._started, 1e-6) / 60
+            settling = len(self.tracker)
+            return {
+                "directory": self.directory,
+                "watcher": self.watcher.method,
+                "started_at": self._started_at,
+                "updated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "running": not self.stop_token.cancelled,
+                "queue_depth": settling + self._waiting + self._active,
+                "settling": settling,
+                "waiting": self._waiting,
+                "processing": self._active,
+                "processed": self.processed,
+                "failed": self.failed,
+                "pages": self.pages,
+                "files_per_minute": round((self.processed + self.failed) / elapsed_minutes, 2),
+                "pages_per_minute": round(self.pages / elapsed_minutes, 2),
+                "cost": round(self.cost, 6),
+                "last_file": self.last_file,
+                "last_error": self.last_error,
+            }
+
+    def write_status(self) -> None:
+        """상태 파일 갱신 (읽는 쪽이 쓰는 중인 파일을 보지 않도록 교체)"""
+        data = dumps(self.status(), pretty=True)
+        temp_path = f"{self.status_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self.status_path)
+        except OSError as e:
+            print(f"경고: 상태 파일 저장 실패: {e}")
+        self._last_status = time.monotonic()
@@ -0,0 +1,421 @@
+import datetime
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from ..models.document import DocumentPage, ProcessedDocument
+from ..utils.cancellation import CancellationToken
+from ..utils.file_utils import is_image_file, is_pdf_file
+from ..utils.serialization import dumps
+from .document_processor import DocumentProcessor
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"            # 모든 페이지 정상 처리
+JOB_PARTIAL = "partial"      # 실패 / 보류된 페이지 있음
+JOB_FAILED = "failed"        # 문서 처리 오류
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_DONE, JOB_PARTIAL, JOB_FAILED, JOB_CANCELLED)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 업로드 파일 최대 크기 (바이트)
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# 끝난 작업을 메모리에 보관하는 개수 (넘으면 오래된 작업부터 삭제)
+MAX_FINISHED_JOBS = 200
+# 페이지 스트리밍 중 새 페이지를 기다리는 간격 (초)
+STREAM_POLL_SECONDS = 1.0
+
+
+class QueueFullError(RuntimeError):
+    """대기 중인 작업이 한도에 도달함"""
+
+
+class Job:
+    """업로드된 파일 하나의 처리 작업"""
+
+    def __init__(self, job_id: str, filename: str, path: str):
+        self.id = job_id
+        self.filename = filename
+        self.path = path
+        self.status = JOB_QUEUED
+        self.created_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.progress: Tuple[int, int] = (0, 0)
+        self.pages: List[dict] = []  # 끝난 순서대로 페이지 결과
+        self.document: Optional[ProcessedDocument] = None
+        self.error: Optional[str] = None
+        self.cancel_token = CancellationToken()
+        self._page_numbers = set()
+        self._changed = threading.Condition()
+
+    @property
+    def finished_status(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def add_page(self, page: DocumentPage) -> None:
+        with self._changed:
+            if page.page_number not in self._page_numbers:
+                self._page_numbers.add(page.page_number)
+                self.pages.append(page.to_dict())
+            self._changed.notify_all()
+
+    def set_progress(self, done: int, total: int) -> None:
+        with self._changed:
+            self.progress = (done, total)
+
+    def start(self) -> None:
+        with self._changed:
+            self.status = JOB_RUNNING
+            self.started = time.monotonic()
+
+    def finish(self, status: str, document: Optional[ProcessedDocument] = None, error: Optional[str] = None) -> None:
+        with self._changed:
+            if document is not None:
+                # 이전 실행에서 끝난 페이지 / 취소된 페이지처럼 스트리밍하지 않은 페이지도 결과에 포함
+                for page in document.pages:
+                    if page.page_number not in self._page_numbers:
+                        self._page_numbers.add(page.page_number)
+                        self.pages.append(page.to_dict())
+            self.status = status
+            self.document = document
+            self.error = error
+            self.finished = time.monotonic()
+            self._changed.notify_all()
+
+    def wait_for_pages(self, start: int, timeout: float) -> Tuple[List[dict], bool]:
+        """start번째 이후 페이지 결과 (새 페이지가 없으면 timeout까지 대기)와 작업 종료 여부"""
+        with self._changed:
+            if len(self.pages) <= start and not self.finished_status:
+                self._changed.wait(timeout)
+            return self.pages[start:], self.finished_status
+
+    def to_dict(self) -> dict:
+        """작업 상태 요약"""
+        with self._changed:
+            done, total = self.progress
+            summary = {
+                "id": self.id,
+                "filename": self.filename,
+                "status": self.status,
+                "created_at": self.created_at,
+                "pages_done": max(done, len(self.pages)),
+                "total_pages": total,
+                "error": self.error,
+            }
+            if self.started is not None:
+                summary["seconds"] = round((self.finished or time.monotonic()) - self.started, 3)
+            if self.document is not None:
+                summary["total_pages"] = self.document.total_pages
+                summary["total_items"] = self.document.total_items
+                summary["cost"] = self.document.processing_cost
+                summary["pages_to_retry"] = [page.page_number for page in self.document.pages_to_retry]
+            return summary
+
+
+class JobService:
+    """작업 대기열 (문서 처리기 하나를 계속 사용하며 정해진 수의 작업자로 처리)"""
+
+    def __init__(
+        self,
+        processor: DocumentProcessor,
+        workers: int = 2,
+        max_queue: int = 16,
+        upload_dir: Optional[str] = None
+    ):
+        self.processor = processor
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.upload_dir = upload_dir or tempfile.mkdtemp(prefix="dklok_jobs_")
+        self._owns_upload_dir = upload_dir is None
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.pages = 0
+        self.cost = 0.0
+        self._waiting = 0
+        self._active = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+
+    def submit(self, filename: str, data: bytes) -> Job:
+        """업로드된 파일을 저장하고 대기열에 추가 (대기열이 가득 차면 QueueFullError)"""
+        filename = os.path.basename(filename.replace("\\", "/")).strip()
+        if not filename or not (is_pdf_file(filename) or is_image_file(filename)):
+            raise ValueError("PDF 또는 이미지 파일명(filename)이 필요합니다.")
+        if not data:
+            raise ValueError("업로드된 파일 내용이 없습니다.")
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise QueueFullError(f"대기 중인 작업이 {self.max_queue}개로 가득 찼습니다.")
+            self._waiting += 1
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(self.upload_dir, job_id)
+        try:
+            os.makedirs(job_dir)
+            path = os.path.join(job_dir, filename)
+            with open(path, 'wb') as f:
+                f.write(data)
+        except OSError:
+            with self._lock:
+                self._waiting -= 1
+            raise
+        job = Job(job_id, filename, path)
+        with self._lock:
+            self.jobs[job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """작업 취소 (대기 중이면 시작하지 않고, 처리 중이면 완료된 페이지까지 남기고 멈춤)"""
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel_token.cancel()
+        return job
+
+    def _run(self, job: Job) -> None:
+        with self._lock:
+            self._waiting -= 1
+            self._active += 1
+        try:
+            if job.cancel_token.cancelled:
+                job.finish(JOB_CANCELLED)
+                return
+            job.start()
+            try:
+                document = self.processor.process_document(job.path, job.set_progress, job.cancel_token, job.add_page)
+            except Exception as e:
+                print(f"작업 {job.id} 처리 오류: {e}")
+                job.finish(JOB_FAILED, error=f"{type(e).__name__}: {e}")
+                return
+            if document.cancelled:
+                status = JOB_CANCELLED
+            elif document.pages_to_retry:
+                status = JOB_PARTIAL
+            else:
+                status = JOB_DONE
+            with self._lock:
+                self.pages += document.total_pages
+                self.cost += document.processing_cost
+            job.finish(status, document)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _prune(self) -> None:
+        """끝난 작업이 많으면 오래된 것부터 업로드 파일과 함께 삭제 (_lock 안에서 호출)"""
+        finished = [job for job in self.jobs.values() if job.finished_status]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+            shutil.rmtree(os.path.dirname(job.path), ignore_errors=True)
+
+    def health(self) -> dict:
+        """상태 / 처리량 지표"""
+        jobs = self.list_jobs()
+        with self._lock:
+            waiting, active, pages, cost = self._waiting, self._active, self.pages, self.cost
+        counts: Dict[str, int] = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        uptime = time.monotonic() - self._started
+        health = {
+            "status": "ok",
+            "uptime_seconds": round(uptime, 1),
+            "workers": self.workers,
+            "queue_depth": waiting,
+            "processing": active,
+            "max_queue": self.max_queue,
+            "jobs": counts,
+            "pages": pages,
+            "pages_per_minute": round(pages / max(uptime, 1e-6) * 60, 2),
+            "cost": round(cost, 6),
+            "mock_mode": self.processor.config.mock_mode,
+            "backends": [backend.name for backend in self.processor.scheduler.backends],
+        }
+        governor = self.processor.governor
+        if governor is not None:
+            health["budget"] = governor.summary()
+            if governor.halted:
+                health["status"] = "budget_exceeded"
+        return health
+
+    def close(self) -> None:
+        """처리 중인 작업을 취소하고 종료"""
+        for job in self.list_jobs():
+            job.cancel_token.cancel()
+        self._executor.shutdown(wait=True)
+        if self._owns_upload_dir:
+            shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """작업 API
+
+    POST   /jobs?filename=NAME    본문(파일 내용)을 업로드해 작업 추가 → 202
+    GET    /jobs                  작업 목록
+    GET    /jobs/ID               작업 상태
+    GET    /jobs/ID/result        처리 결과 (결과 JSON 파일과 같은 형식)
+    GET    /jobs/ID/pages         페이지 결과 스트리밍 (NDJSON, 끝나면 마지막 줄에 작업 상태)
+    DELETE /jobs/ID               작업 취소
+    GET    /health                상태 / 처리량 지표
+    """
+    server_version = "DklokOCR/1.0"
+    _JOB_PATH = re.compile(r"^/jobs/([0-9a-f]+)(/result|/pages)?/?$")
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        print(f"[HTTP] {self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, data, headers: Optional[Dict[str, str]] = None) -> None:
+        body = dumps(data)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {"error": message}, headers)
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"작업을 찾을 수 없습니다: {job_id}")
+        return job
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path in ("/health", "/metrics"):
+            self._send_json(HTTPStatus.OK, self.service.health())
+            return
+        if path.rstrip("/") == "/jobs":
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.service.list_jobs()]})
+            return
+        match = self._JOB_PATH.match(path)
+        if match is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"알 수 없는 경로: {path}")
+            return
+        job = self._job(match.group(1))
+        if job is None:
+            return
+        if match.group(2) == "/result":
+            if not job.finished_status:
+                self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), {"Retry-After": "1"})
+            elif job.document is None:
+                self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, job.to_dict())
+            else:
+                self._send_json(HTTPStatus.OK, job.document.to_dict())
+        elif match.group(2) == "/pages":
+            self._stream_pages(job)
+        else:
+            self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def _stream_pages(self, job: Job) -> None:
+        """페이지가 끝날 때마다 한 줄씩 전송 (연결을 닫아 스트림 끝을 알림)"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                pages, finished = job.wait_for_pages(sent, STREAM_POLL_SECONDS)
+                for page in pages:
+                    self.wfile.write(dumps({"event": "page", "page": page}) + b"\n")
+                sent += len(pages)
+                self.wfile.flush()
+                if finished and not pages:
+                    self.wfile.write(dumps({"event": "end", "job": job.to_dict()}) + b"\n")
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 연결을 끊음 (작업은 계속 처리)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"알 수 없는 경로: {url.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length 헤더가 필요합니다.")
+            return
+        if length < 0:
+            # 음수면 rfile.read(-1)이 연결이 끊길 때까지 기다리므로 읽기 전에 거부
+            self._send_error(HTTPStatus.BAD_REQUEST, "Content-Length 값이 잘못되었습니다.")
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                             f"파일이 너무 큽니다 (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB).")
+            return
+        data = self.rfile.read(length)
+        filename = parse_qs(url.query).get("filename", [unquote(self.headers.get("X-Filename", ""))])[0]
+        try:
+            job = self.service.submit(filename, data)
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except QueueFullError as e:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e), {"Retry-After": "5"})
+            return
+        except OSError as e:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"업로드 파일 저장 실패: {e}")
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def do_DELETE(self):
+        match = self._JOB_PATH.match(urlparse(self.path).path)
+        if match is None or match.group(2):
+            self._send_error(HTTPStatus.NOT_FOUND, f"알 수 없는 경로: {self.path}")
+            return
+        job = self.service.cancel(match.group(1))
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"작업을 찾을 수 없습니다: {match.group(1)}")
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+
+class JobServer(ThreadingHTTPServer):
+    """요청마다 스레드로 처리하는 작업 API 서버"""
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: JobService):
+        self.service = service
+        super().__init__(address, JobRequestHandler)
+
+
+def create_job_server(
+    processor: DocumentProcessor,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 2,
+    max_queue: int = 16
+) -> JobServer:
+    """작업 API 서버 생성 (port=0이면 빈 포트 사용)"""
+    return JobServer((host, port), JobService(processor, workers, max_queue))
@@ -1,9 +1,97 @@
+import base64
+import hashlib
 import json
+import mimetypes
 import random
+import re
+import socket
+import threading
 import time
-from typing import List, Tuple
-from ..models.order_item import OrderItem
-from ..config.settings import app_settings
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from ..models.order_item import OrderItem, ParseStats, PageParseResult
+from ..config.runtime import RuntimeConfig
+from ..utils.cancellation import CancellationToken, OperationCancelled
+
+
+@dataclass
+class OCRResult:
+    """페이지 하나의 OCR 결과"""
+    items: List[OrderItem]
+    cost: float
+    parse_stats: ParseStats = field(default_factory=ParseStats)
+    invalid_rows: List[Dict[str, Any]] = field(default_factory=list)
+    backend: Optional[str] = None  # 결과를 만든 백엔드 이름
+    timing: Dict[str, Any] = field(default_factory=dict)  # 지연 시간 / 헤지 기록
+    model: Optional[str] = None        # 사용한 모델
+    confidence: Optional[float] = None  # 모델이 응답한 신뢰도 (행별 최솟값)
+    cascade: List[Dict[str, Any]] = field(default_factory=list)  # 모델 단계별 시도 기록
+    status: str = "ok"                 # "ok" 또는 "deferred" (나중에 다시 처리할 페이지)
+
+    def to_dict(self) -> dict:
+        """딕셔너리로 변환 (캐시 저장용)"""
+        return {
+            "items": [item.to_dict() for item in self.items],
+            "cost": self.cost,
+            "parse_stats": self.parse_stats.to_dict(),
+            "invalid_rows": self.invalid_rows,
+            "backend": self.backend,
+            "model": self.model,
+            "confidence": self.confidence,
+            "status": self.status
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OCRResult":
+        """딕셔너리에서 생성"""
+        return cls(
+            items=[OrderItem.from_dict(item) for item in data.get("items", [])],
+            cost=data.get("cost", 0.0),
+            parse_stats=ParseStats(**data.get("parse_stats", {})),
+            invalid_rows=data.get("invalid_rows", []),
+            backend=data.get("backend"),
+            model=data.get("model"),
+            confidence=data.get("confidence"),
+            status=data.get("status", "ok")
+        )
+
+    @classmethod
+    def from_parse_result(
+        cls,
+        parsed: PageParseResult,
+        cost: float,
+        model: Optional[str] = None,
+        confidence: Optional[float] = None
+    ) -> "OCRResult":
+        """파싱 결과와 비용으로 생성"""
+        return cls(
+            items=parsed.items,
+            cost=cost,
+            parse_stats=parsed.stats,
+            invalid_rows=parsed.invalid_rows,
+            model=model,
+            confidence=confidence
+        )
+
+
+def page_confidence(rows: Any) -> Optional[float]:
+    """응답 행들의 "신뢰도" 값 중 최솟값 (없으면 None)"""
+    if isinstance(rows, dict):
+        rows = [rows]
+    if not isinstance(rows, list):
+        return None
+    values = [
+        float(row["신뢰도"]) for row in rows
+        if isinstance(row, dict) and isinstance(row.get("신뢰도"), (int, float))
+        and not isinstance(row.get("신뢰도"), bool)
+    ]
+    return min(values) if values else None
 
 
 class MockOCRService:
@@ -20,60 +108,254 @@ class MockOCRService:
             {"품번": "PART-002", "수량": 5},
         ],
         [
-            {"품번": "ABC-123", "수량": 30},
+            {"품번": "ABC-123", "수량": 30, "신뢰도": 0.55},
             {"품번": "XYZ-456", "수량": 12},
             {"품번": "DEF-789", "수량": 8},
             {"품번": "GHI-012", "수량": 25},
+        ],
+        [
+            {"품번": "DMCA-6N-SA", "수량": "1,200"},
+            {"품번": "DMCA-10N-SA", "수량": "12 EA"},
+            {"품번": "DMCA-16N-SA", "수량": "미정"},
         ]
     ]
     
     def process_image(self, image_path: str) -> Tuple[List[OrderItem], float]:
         """이미지에서 OCR 처리 (모킹)"""
-        # 개발용 지연 시뮬레이션
-        time.sleep(random.uniform(0.5, 1.5))
+        result = self.process_image_detailed(image_path)
+        return result.items, result.cost
+    
+    def __init__(self, model_name: Optional[str] = None):
+        self.model_name = model_name
+    
+    def process_image_detailed(self, image_path: str, cancel_token: Optional[CancellationToken] = None) -> OCRResult:
+        """이미지에서 OCR 처리 후 파싱 통계까지 반환 (모킹)"""
+        # 개발용 지연 시뮬레이션 (취소되면 바로 중단)
+        delay = random.uniform(0.5, 1.5)
+        if cancel_token is None:
+            time.sleep(delay)
+        elif cancel_token.wait(delay):
+            raise OperationCancelled("작업이 취소되었습니다.")
         
-        # 랜덤한 응답 선택
+        # 랜덤한 응답 선택 후 한 번에 파싱
         mock_data = random.choice(self.MOCK_RESPONSES)
-        
-        # OrderItem 리스트로 변환
-        items = [OrderItem.from_dict(item_data) for item_data in mock_data]
+        parsed = OrderItem.parse_page(mock_data)
         
         # 모킹 비용 (실제 API 비용과 유사하게)
         mock_cost = random.uniform(0.001, 0.01)
         
-        print(f"[MOCK] 이미지 처리 완료: {len(items)}개 항목 추출, 비용: ${mock_cost:.4f}")
+        print(f"[MOCK] 이미지 처리 완료: {len(parsed.items)}개 항목 추출, 비용: ${mock_cost:.4f}")
         
-        return items, mock_cost
+        return OCRResult.from_parse_result(parsed, mock_cost, self.model_name, page_confidence(mock_data))
+
+
+# 주문서 이미지에서 품번/수량을 추출하도록 요청하는 프롬프트
+OCR_PROMPT = (
+    "이 이미지는 주문서입니다. 표에 있는 모든 주문 항목의 품번과 수량을 추출해 "
+    "JSON 배열로만 답하세요. 형식: [{\"품번\": \"DMCA-8N-SA\", \"수량\": 7, \"신뢰도\": 0.95}]. "
+    "신뢰도는 해당 행을 정확히 읽었다고 확신하는 정도(0~1)입니다. 항목이 없으면 []로 답하세요."
+)
+# 프롬프트가 바뀌면 이전 OCR 캐시 결과를 사용하지 않도록 캐시 키에 포함
+OCR_PROMPT_VERSION = hashlib.sha256(OCR_PROMPT.encode('utf-8')).hexdigest()[:12]
+
+# 응답을 감싼 ```json 코드 블록
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+class _AbortHandle:
+    """요청 하나의 HTTP 연결 (취소되면 소켓을 닫아 응답 대기를 바로 끝냄)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connection: Optional[HTTPConnection] = None
+        self.aborted = False
+
+    def attach(self, connection: HTTPConnection) -> None:
+        with self._lock:
+            self.connection = connection
+            aborted = self.aborted
+        if aborted:
+            raise OperationCancelled("작업이 취소되었습니다.")
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            connection = self.connection
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# 스레드별로 진행 중인 취소 가능한 요청
+_abort_handles: Dict[int, _AbortHandle] = {}
+_abort_lock = threading.Lock()
+
+
+def _current_abort_handle() -> Optional[_AbortHandle]:
+    with _abort_lock:
+        return _abort_handles.get(threading.get_ident())
+
+
+class _AbortableConnectionMixin:
+    """요청을 보내기 전 / 연결 직후 현재 스레드의 취소 핸들에 연결을 등록"""
+
+    def connect(self):
+        super().connect()
+        handle = _current_abort_handle()
+        if handle is not None:
+            handle.attach(self)
+
+    def request(self, *args, **kwargs):
+        handle = _current_abort_handle()
+        if handle is not None:
+            handle.attach(self)
+        return super().request(*args, **kwargs)
+
+
+class _AbortableHTTPConnection(_AbortableConnectionMixin, HTTPConnection):
+    pass
+
+
+class _AbortableHTTPSConnection(_AbortableConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _AbortableHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _AbortableHTTPConnection
+
+
+class _AbortableHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _AbortableHTTPSConnection
+
+
+class AbortableHTTPAdapter(HTTPAdapter):
+    """abort_on_cancel 안에서 보낸 요청을 취소 시 중단할 수 있는 HTTP 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _AbortableHTTPConnectionPool,
+            "https": _AbortableHTTPSConnectionPool,
+        }
+
+
+@contextmanager
+def abort_on_cancel(cancel_token: Optional[CancellationToken]) -> Iterator[None]:
+    """취소되면 이 스레드에서 AbortableHTTPAdapter로 보내는 요청을 중단하고 OperationCancelled 발생"""
+    if cancel_token is None:
+        yield
+        return
+    handle = _AbortHandle()
+    ident = threading.get_ident()
+    with _abort_lock:
+        _abort_handles[ident] = handle
+    remove = cancel_token.add_callback(handle.abort)
+    try:
+        cancel_token.raise_if_cancelled()
+        yield
+    except OperationCancelled:
+        raise
+    except Exception as e:
+        # 소켓을 닫아 생긴 연결 오류는 취소로 보고
+        if cancel_token.cancelled:
+            raise OperationCancelled("작업이 취소되었습니다.") from e
+        raise
+    finally:
+        remove()
+        with _abort_lock:
+            _abort_handles.pop(ident, None)
 
 
 class RealOCRService:
     """실제 OpenAI API를 사용하는 OCR 서비스"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        timeout: float = 120.0,
+        config: Optional[RuntimeConfig] = None
+    ):
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.config = config or RuntimeConfig.from_settings()
+        self.model_name = model_name
+        self.timeout = timeout
+        self.session = requests.Session()
+        # 작업을 취소하면 응답을 기다리는 요청의 연결을 끊음
+        adapter = AbortableHTTPAdapter()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def process_image(self, image_path: str) -> Tuple[List[OrderItem], float]:
         """이미지에서 OCR 처리 (실제 API)"""
-        if not app_settings.api_key:
+        result = self.process_image_detailed(image_path)
+        return result.items, result.cost
+    
+    def process_image_detailed(self, image_path: str, cancel_token: Optional[CancellationToken] = None) -> OCRResult:
+        """이미지에서 OCR 처리 후 파싱 통계까지 반환 (실제 API, 취소되면 요청을 중단)"""
+        if not self.config.api_key:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
         
-        # 실제 API 호출 로직은 기존 코드 참조
-        # 여기서는 간단한 구현만 제공
-        raise NotImplementedError("실제 API 연동은 추후 구현")
+        with open(image_path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        mime_type = mimetypes.guess_type(image_path)[0] or 'image/jpeg'
+        
+        payload = {
+            "model": self.model_name or self.config.model_name,
+            "temperature": 0,
+            "messages": [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": OCR_PROMPT},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{encoded}"}},
+                ],
+            }],
+        }
+        with abort_on_cancel(cancel_token):
+            response = self.session.post(
+                self.api_url,
+                headers={"Authorization": f"Bearer {self.config.api_key}"},
+                json=payload,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+        
+        content = _CODE_FENCE.sub('', (data["choices"][0]["message"]["content"] or "[]").strip())
+        usage = data.get("usage", {})
+        model = payload["model"]
+        cost = self.config.calculate_cost(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), model)
+        try:
+            rows = json.loads(content)
+        except ValueError:
+            rows = content  # parse_page가 invalid_json으로 기록
+        parsed = OrderItem.parse_page(rows)
+        
+        print(f"[API] 이미지 처리 완료 ({model}): {len(parsed.items)}개 항목 추출, 비용: ${cost:.4f}")
+        
+        return OCRResult.from_parse_result(parsed, cost, model, page_confidence(rows))
 
 
 class OCRService:
-    """OCR 서비스 팩토리"""
+    """OCR 서비스 팩토리 (설정에 맞는 비전 백엔드를 레지스트리에서 생성)"""
     
-    def __init__(self):
+    def __init__(self, config: Optional[RuntimeConfig] = None):
+        from .backends import create_backend, default_vision_backend
         # 모킹 모드이거나 API 키가 없으면 모킹 서비스 사용
-        if app_settings.mock_mode or not app_settings.api_key:
-            self.service = MockOCRService()
+        self.config = config or RuntimeConfig.from_settings()
+        self.backend = create_backend(default_vision_backend(self.config), self.config)
+        self.service = self.backend.service
+        if isinstance(self.service, MockOCRService):
             print("[OCR Service] 모킹 모드로 실행 중")
         else:
-            self.service = RealOCRService()
             print("[OCR Service] 실제 API 모드로 실행 중")
     
     def process_image(self, image_path: str) -> Tuple[List[OrderItem], float]:
         """이미지 OCR 처리"""
-        return self.service.process_image(image_path)
\ No newline at end of file
+        return self.service.process_image(image_path)
+    
+    def process_image_detailed(self, image_path: str) -> OCRResult:
+        """이미지 OCR 처리 (파싱 통계 포함)"""
+        return self.service.process_image_detailed(image_path)
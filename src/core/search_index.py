@@ -0,0 +1,218 @@
+import datetime
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from ..models.document import ProcessedDocument
+from ..models.order_item import normalize_product_code
+from ..utils.file_utils import get_app_data_dir
+from ..utils.archive_reader import ArchiveReader
+
+DEFAULT_INDEX_FILENAME = "history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    date TEXT,
+    doc_key TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    product_code TEXT NOT NULL,
+    code_norm TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    quantity INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_code_norm ON entries(code_norm);
+CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(date);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    code_norm, content='entries', content_rowid='id', tokenize='trigram'
+);
+"""
+
+
+@dataclass
+class SearchHit:
+    """검색 결과 한 건"""
+    product_code: str
+    quantity: int
+    filename: str
+    page: int
+    date: Optional[str]
+
+
+def get_default_index_path() -> str:
+    """기본 검색 색인 파일 경로"""
+    return os.path.join(get_app_data_dir(), DEFAULT_INDEX_FILENAME)
+
+
+class SearchIndex:
+    """OCR 결과 이력 검색 색인 (SQLite, 품번 trigram 전문 검색)"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_default_index_path()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.fts_available = self._create_fts_table()
+
+    def _create_fts_table(self) -> bool:
+        """FTS5 trigram 테이블 생성 (지원하지 않는 SQLite면 LIKE 검색 사용)"""
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add_document(
+        self,
+        document: ProcessedDocument,
+        date: Optional[str] = None,
+        doc_key: Optional[str] = None
+    ) -> int:
+        """문서 하나를 색인에 추가하고 추가된 항목 수 반환 (doc_key가 이미 있으면 이전 항목을 교체)"""
+        with self._lock, self._conn:
+            if doc_key:
+                self._delete_document(doc_key)
+            return self._insert_document(document, date, doc_key or None)
+
+    def add_documents(self, documents: Iterable[ProcessedDocument]) -> int:
+        """여러 문서를 하나의 트랜잭션으로 색인에 추가"""
+        with self._lock, self._conn:
+            return sum(self._insert_document(document, None, None) for document in documents)
+
+    def _delete_document(self, doc_key: str) -> None:
+        row = self._conn.execute("SELECT id FROM documents WHERE doc_key = ?", (doc_key,)).fetchone()
+        if row is None:
+            return
+        if self.fts_available:
+            # 외부 내용 FTS 테이블은 지울 행의 값을 'delete' 명령으로 넘겨야 함
+            self._conn.execute(
+                "INSERT INTO entries_fts (entries_fts, rowid, code_norm) "
+                "SELECT 'delete', id, code_norm FROM entries WHERE document_id = ?",
+                (row[0],)
+            )
+        self._conn.execute("DELETE FROM entries WHERE document_id = ?", (row[0],))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+
+    def _insert_document(self, document: ProcessedDocument, date: Optional[str], doc_key: Optional[str]) -> int:
+        if doc_key is not None:
+            row = self._conn.execute("SELECT 1 FROM documents WHERE doc_key = ?", (doc_key,)).fetchone()
+            if row:
+                return 0
+
+        date = date or datetime.date.today().isoformat()
+        cursor = self._conn.execute(
+            "INSERT INTO documents (filename, date, doc_key) VALUES (?, ?, ?)",
+            (document.filename, date, doc_key)
+        )
+        document_id = cursor.lastrowid
+
+        rows = [
+            (document_id, item.product_code, normalize_product_code(item.product_code),
+             page.page_number, item.quantity)
+            for page in document.pages
+            for item in page.items
+        ]
+        if not rows:
+            return 0
+
+        first_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM entries").fetchone()[0]
+        self._conn.executemany(
+            "INSERT INTO entries (document_id, product_code, code_norm, page, quantity) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        if self.fts_available:
+            self._conn.execute(
+                "INSERT INTO entries_fts (rowid, code_norm) SELECT id, code_norm FROM entries WHERE id >= ?",
+                (first_id,)
+            )
+        return len(rows)
+
+    def add_archive(self, archive_path: str) -> int:
+        """보관된 결과 파일(JSON / JSON Lines)을 색인에 추가 (이미 추가된 문서는 건너뜀)"""
+        archive_path = os.path.abspath(archive_path)
+        reader = ArchiveReader(archive_path)
+        count = 0
+        with self._lock, self._conn:
+            for entry in reader.iter_index():
+                doc_key = f"{archive_path}:{entry.offset}"
+                if self._conn.execute("SELECT 1 FROM documents WHERE doc_key = ?", (doc_key,)).fetchone():
+                    continue
+                document = next(reader.iter_documents_at([entry.offset]))
+                if document.source_key:
+                    # 처리할 때 이미 색인된 문서는 다시 추가하지 않음
+                    if self._conn.execute("SELECT 1 FROM documents WHERE doc_key = ?",
+                                          (document.source_key,)).fetchone():
+                        continue
+                    doc_key = document.source_key
+                count += self._insert_document(document, entry.date, doc_key)
+        return count
+
+    def search(
+        self,
+        query: str,
+        prefix: bool = False,
+        limit: int = 200,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None
+    ) -> List[SearchHit]:
+        """품번 검색 (기본: 부분 일치, prefix=True: 앞부분 일치), 최근 색인된 순"""
+        code = normalize_product_code(query)
+        if not code:
+            return []
+
+        conditions = []
+        params: list = []
+        if prefix:
+            # 인덱스를 사용하는 범위 조건으로 앞부분 일치 검색
+            conditions.append("e.code_norm >= ? AND e.code_norm < ?")
+            params.extend([code, code + "\uffff"])
+            source = "entries e"
+            order = "e.id"
+        elif self.fts_available and len(code) >= 3:
+            source = "entries_fts f JOIN entries e ON e.id = f.rowid"
+            order = "f.rowid"
+            conditions.append("entries_fts MATCH ?")
+            params.append('"' + code.replace('"', '""') + '"')
+        else:
+            source = "entries e"
+            order = "e.id"
+            conditions.append("instr(e.code_norm, ?) > 0")
+            params.append(code)
+
+        if date_from:
+            conditions.append("d.date >= ?")
+            params.append(date_from.isoformat())
+        if date_to:
+            conditions.append("d.date <= ?")
+            params.append(date_to.isoformat())
+
+        sql = (
+            f"SELECT e.product_code, e.quantity, d.filename, e.page, d.date "
+            f"FROM {source} JOIN documents d ON d.id = e.document_id "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order} DESC LIMIT ?"
+        )
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    @property
+    def entry_count(self) -> int:
+        """색인된 전체 항목 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,270 @@
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.order_item import OrderItem, normalize_quantity
+from ..utils.cancellation import CancellationToken
+from .ocr_service import OCRResult
+
+# 이미지 분석을 위한 선택적 라이브러리
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# 페이지 유형
+PAGE_TEXT = "text"            # 텍스트 레이어가 있는 페이지 (로컬 파싱)
+PAGE_SCANNED = "scanned"      # 표가 있는 스캔 페이지 (비전 OCR)
+PAGE_BLANK = "blank"          # 빈 페이지 (건너뜀)
+PAGE_NON_TABLE = "non_table"  # 표 선이 없는 스캔 페이지 (표지, 안내문 등)
+
+# 텍스트 레이어 줄에서 품번으로 볼 토큰 (영문/숫자를 모두 포함)
+_CODE_TOKEN = re.compile(r'^(?=[^\s]*[A-Za-z])(?=[^\s]*\d)[A-Za-z0-9][A-Za-z0-9\-_/.]{2,}$')
+
+
+@dataclass
+class PageInput:
+    """분류 / 처리할 페이지 하나"""
+    page_number: int
+    image_path: Optional[str] = None  # 렌더링된 페이지 이미지
+    text: Optional[str] = None        # PDF 텍스트 레이어 (없으면 None)
+    filename: Optional[str] = None    # 원본 파일명
+    cancel_token: Optional[CancellationToken] = field(default=None, compare=False, repr=False)  # 처리 중 요청 중단용
+
+
+@dataclass
+class TriageDecision:
+    """페이지 분류 결과"""
+    page_type: str
+    features: Dict[str, Any] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+def _row_counts(pixels: bytes, width: int, height: int) -> List[int]:
+    """0/1 픽셀 바이트에서 행별 1의 개수"""
+    return [pixels.count(1, y * width, (y + 1) * width) for y in range(height)]
+
+
+class PageClassifier:
+    """텍스트 레이어 / 잉크 밀도 / 표 선으로 페이지를 빠르게 분류"""
+
+    def __init__(
+        self,
+        min_text_chars: int = 20,
+        blank_ink_ratio: float = 0.002,
+        line_fill_ratio: float = 0.5,
+        min_table_lines: int = 3,
+        sample_width: int = 400
+    ):
+        self.min_text_chars = min_text_chars
+        self.blank_ink_ratio = blank_ink_ratio
+        self.line_fill_ratio = line_fill_ratio
+        self.min_table_lines = min_table_lines
+        self.sample_width = sample_width
+
+    def classify(self, page: PageInput) -> TriageDecision:
+        start = time.perf_counter()
+        decision = self._classify(page)
+        decision.elapsed_ms = (time.perf_counter() - start) * 1000
+        return decision
+
+    def _classify(self, page: PageInput) -> TriageDecision:
+        text_chars = len(page.text.strip()) if page.text else 0
+        if text_chars >= self.min_text_chars:
+            return TriageDecision(PAGE_TEXT, {"text_chars": text_chars})
+
+        features = self.image_features(page.image_path)
+        features["text_chars"] = text_chars
+        if "ink_ratio" not in features:
+            # 이미지를 분석할 수 없으면 OCR로 보냄
+            return TriageDecision(PAGE_SCANNED, features)
+        if features["ink_ratio"] < self.blank_ink_ratio:
+            return TriageDecision(PAGE_BLANK, features)
+        if features["h_lines"] + features["v_lines"] >= self.min_table_lines:
+            return TriageDecision(PAGE_SCANNED, features)
+        return TriageDecision(PAGE_NON_TABLE, features)
+
+    def looks_like_order_page(self, page: PageInput) -> bool:
+        """표가 있는 스캔 페이지나 품번 줄이 있는 텍스트처럼 주문 항목이 있을 만한 페이지인지"""
+        if page.text and any(_CODE_TOKEN.match(token) for token in page.text.split()):
+            return True
+        return self.classify(page).page_type == PAGE_SCANNED
+
+    def image_features(self, image_path: Optional[str]) -> Dict[str, Any]:
+        """축소한 흑백 이미지에서 잉크 밀도와 가로/세로 선 개수 계산"""
+        if not PIL_AVAILABLE or not image_path:
+            return {}
+        try:
+            with Image.open(image_path) as image:
+                image.draft('L', (self.sample_width, self.sample_width))
+                image = image.convert('L')
+                if image.width > self.sample_width:
+                    height = max(1, image.height * self.sample_width // image.width)
+                    image = image.resize((self.sample_width, height))
+                width, height = image.size
+                ink = image.point(lambda value: 1 if value < 128 else 0)
+                # 행/열별 잉크 픽셀 수 (열은 전치한 이미지의 행으로 계산)
+                row_counts = _row_counts(ink.tobytes(), width, height)
+                col_counts = _row_counts(ink.transpose(Image.TRANSPOSE).tobytes(), height, width)
+        except Exception as e:
+            return {"error": str(e)}
+
+        return {
+            "ink_ratio": round(sum(row_counts) / (width * height), 5),
+            "h_lines": self._count_lines(row_counts, width),
+            "v_lines": self._count_lines(col_counts, height),
+        }
+
+    def _count_lines(self, counts: List[int], length: int) -> int:
+        """잉크가 line_fill_ratio 이상 채워진 연속 구간 수 (두꺼운 선은 하나로 셈)"""
+        threshold = length * self.line_fill_ratio
+        lines = 0
+        in_line = False
+        for count in counts:
+            if count >= threshold:
+                if not in_line:
+                    lines += 1
+                in_line = True
+            else:
+                in_line = False
+        return lines
+
+
+# 수량 열 머리글 (텍스트 레이어에서 수량 열 위치를 찾을 때 사용)
+_QUANTITY_HEADERS = {"수량", "qty", "qty.", "q'ty", "quantity", "数量"}
+
+
+def _quantity_candidates(tokens: List[str], code_index: int) -> List[str]:
+    """품번 뒤의 수량 후보 토큰들 ("12 EA"처럼 단위가 떨어져 있으면 두 토큰을 하나로)"""
+    candidates = []
+    index = code_index + 1
+    while index < len(tokens):
+        if normalize_quantity(tokens[index]) is not None:
+            if index + 1 < len(tokens) and normalize_quantity(tokens[index + 1]) is None:
+                with_unit = f"{tokens[index]} {tokens[index + 1]}"
+                if normalize_quantity(with_unit) is not None:
+                    candidates.append(with_unit)
+                    index += 2
+                    continue
+            candidates.append(tokens[index])
+        index += 1
+    return candidates
+
+
+def _columns_after_quantity(tokens: List[str]) -> Optional[int]:
+    """머리글 줄이면 수량 열 뒤의 열 수 (단가 / 금액 등), 머리글이 아니면 None"""
+    for index, token in enumerate(tokens):
+        if token.lower() in _QUANTITY_HEADERS:
+            return len(tokens) - index - 1
+    return None
+
+
+def parse_text_layer(text: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """텍스트 레이어 줄에서 '품번 ... 수량' 형태의 행 추출, (행 목록, 수량을 확정하지 못한 줄 목록) 반환
+
+    머리글에 수량 열이 있으면 그 뒤의 열 수만큼 오른쪽 숫자(단가 / 금액)를 건너뛰고,
+    머리글이 없는데 품번 뒤에 숫자가 여러 개면(규격 / 품명의 숫자 등) 수량을 알 수 없는 줄로 기록
+    """
+    rows = []
+    invalid_rows = []
+    trailing_columns = None
+    for line_number, line in enumerate(text.splitlines(), 1):
+        tokens = line.split()
+        code_index = next((i for i, token in enumerate(tokens) if _CODE_TOKEN.match(token)), None)
+        if code_index is None:
+            header_columns = _columns_after_quantity(tokens)
+            if header_columns is not None:
+                trailing_columns = header_columns
+            continue
+        candidates = _quantity_candidates(tokens, code_index)
+        if not candidates:
+            quantity, reason = None, "no_quantity"
+        elif trailing_columns is not None:
+            ok = len(candidates) > trailing_columns
+            quantity, reason = (candidates[-trailing_columns - 1], None) if ok else (None, "ambiguous_quantity")
+        elif len(candidates) == 1:
+            quantity, reason = candidates[0], None
+        else:
+            quantity, reason = None, "ambiguous_quantity"
+        if quantity is None:
+            invalid_rows.append({"row": line_number, "data": {"line": line.strip()}, "reason": reason})
+        else:
+            rows.append({"품번": tokens[code_index], "수량": quantity})
+    return rows, invalid_rows
+
+
+def parse_text_layer_result(text: str) -> Optional[OCRResult]:
+    """텍스트 레이어를 로컬에서 파싱 (항목이 없거나 수량을 확정하지 못한 품번 줄이 있으면 None → OCR로 처리)"""
+    rows, invalid_rows = parse_text_layer(text)
+    if not rows:
+        return None
+    if invalid_rows:
+        # 일부 줄만 파싱된 결과로 확정하면 빠진 행을 알 수 없으므로 페이지 전체를 OCR로 넘김
+        print(f"경고: 텍스트 레이어에서 수량을 확정하지 못한 품번 줄 {len(invalid_rows)}개 → OCR로 처리합니다")
+        return None
+    return OCRResult.from_parse_result(OrderItem.parse_page(rows), 0.0)
+
+
+# 페이지 처리 함수: 결과를 반환하거나, 처리할 수 없으면 None (기본 경로로 넘김)
+PageHandler = Callable[[PageInput], Optional[OCRResult]]
+
+
+def text_layer_handler(page: PageInput) -> Optional[OCRResult]:
+    """텍스트 레이어를 로컬에서 파싱 (항목이 없거나 읽지 못한 줄이 있으면 OCR로 넘김)"""
+    return parse_text_layer_result(page.text or "")
+
+
+def skip_handler(page: PageInput) -> Optional[OCRResult]:
+    """페이지를 처리하지 않음"""
+    return OCRResult(items=[], cost=0.0)
+
+
+class PageRouter:
+    """페이지 유형별 처리 경로 (새 페이지 유형은 register로 추가)"""
+
+    def __init__(self, default_handler: PageHandler, classifier: Optional[PageClassifier] = None):
+        self.classifier = classifier or PageClassifier()
+        self.default_handler = default_handler
+        self._routes: Dict[str, Tuple[str, PageHandler]] = {}
+
+    def register(self, page_type: str, name: str, handler: PageHandler) -> None:
+        """페이지 유형에 처리 경로 등록 (기존 경로는 대체)"""
+        self._routes[page_type] = (name, handler)
+
+    def process(self, page: PageInput) -> Tuple[OCRResult, Dict[str, Any]]:
+        """페이지를 분류하고 해당 경로로 처리, (결과, 분류 기록) 반환"""
+        decision = self.classifier.classify(page)
+        name, handler = self._routes.get(decision.page_type, ("ocr", self.default_handler))
+
+        start = time.perf_counter()
+        result = handler(page)
+        fallback = result is None
+        if fallback:
+            name = "ocr"
+            result = self.default_handler(page)
+        route_ms = (time.perf_counter() - start) * 1000
+
+        triage = {
+            "page_type": decision.page_type,
+            "route": name,
+            "classify_ms": round(decision.elapsed_ms, 2),
+            "route_ms": round(route_ms, 2),
+            "features": decision.features,
+        }
+        if fallback:
+            triage["fallback"] = True
+        return result, triage
+
+
+def create_default_router(ocr_handler: PageHandler, classifier: Optional[PageClassifier] = None) -> PageRouter:
+    """기본 경로: 텍스트 → 로컬 파싱, 스캔/표 없음 → OCR, 빈 페이지 → 건너뜀"""
+    router = PageRouter(ocr_handler, classifier)
+    router.register(PAGE_TEXT, "text_layer", text_layer_handler)
+    router.register(PAGE_SCANNED, "ocr", ocr_handler)
+    # 표 선이 없는 주문서(목록형)도 있으므로 기본은 OCR, 필요하면 skip_handler로 교체
+    router.register(PAGE_NON_TABLE, "ocr", ocr_handler)
+    router.register(PAGE_BLANK, "skip", skip_handler)
+    return router
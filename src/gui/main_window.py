@@ -1,18 +1,25 @@
 import os
 import json
+import time
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QLabel, QVBoxLayout, 
                              QHBoxLayout, QFileDialog, QTextEdit, QWidget, 
                              QProgressBar, QMessageBox, QTableWidgetItem, 
                              QHeaderView, QTabWidget, QGroupBox, QAction, 
-                             QMenu, QToolBar)
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont
+                             QMenu, QToolBar, QLineEdit, QCheckBox, QShortcut)
+from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtGui import QFont, QColor, QKeySequence
 
 from .widgets import CopyableTableWidget, SettingsDialog, ProcessingWorker
 from .styles import MAIN_STYLE_SHEET
 from ..models.document import ProcessedDocument
 from ..config.settings import app_settings
 from ..utils.file_utils import save_json_result
+from ..utils.exporters import export_documents
+from ..core.search_index import SearchIndex
+from ..core.aggregation import aggregate_documents
+from ..core.estimator import CostEstimator, LatencyHistory, format_duration
+from ..config.runtime import RuntimeConfig
+from ..core.circuit_breaker import STATE_CLOSED, STATE_LABELS, breaker_states
 
 
 class MainWindow(QMainWindow):
@@ -23,6 +30,9 @@ class MainWindow(QMainWindow):
         self.selected_file = None
         self.worker = None
         self.current_document = None
+        self.current_file = None  # current_document의 원본 파일 (실패 페이지 재처리용)
+        self.history_index = None
+        self.session_documents = []  # 이번 세션에서 처리한 문서 (통합 보기용)
         
         self.init_ui()
 
@@ -37,10 +47,27 @@ class MainWindow(QMainWindow):
 
         # 상태바 설정
         self.statusBar().showMessage('준비')
+        self.breaker_label = QLabel('OCR: 정상')
+        self.statusBar().addPermanentWidget(self.breaker_label)
+        self.breaker_timer = QTimer(self)
+        self.breaker_timer.timeout.connect(self.update_breaker_status)
+        self.breaker_timer.start(1000)
 
         # 중앙 위젯 설정
         self._setup_central_widget()
 
+    def update_breaker_status(self):
+        """OCR 백엔드 차단기 상태를 상태바에 표시"""
+        states = breaker_states()
+        degraded = {name: state for name, state in states.items() if state != STATE_CLOSED}
+        if degraded:
+            text = ', '.join(f"{name} {STATE_LABELS[state]}" for name, state in degraded.items())
+            self.breaker_label.setText(f"OCR: {text}")
+            self.breaker_label.setStyleSheet("color: #c0392b;")
+        else:
+            self.breaker_label.setText("OCR: 정상")
+            self.breaker_label.setStyleSheet("")
+
     def _setup_toolbar(self):
         """툴바 설정"""
         toolbar = QToolBar("메인 툴바")
@@ -123,9 +150,22 @@ class MainWindow(QMainWindow):
         self.process_button.setFixedHeight(40)
         self.process_button.setEnabled(False)
         self.process_button.clicked.connect(self.start_processing)
+        self.retry_button = QPushButton('실패 페이지 다시 처리')
+        self.retry_button.setFixedHeight(40)
+        self.retry_button.setEnabled(False)
+        self.retry_button.setToolTip('오류가 났거나 보류 / 취소된 페이지만 다시 처리해 현재 결과에 합칩니다')
+        self.retry_button.clicked.connect(self.retry_failed_pages)
+        self.cancel_button = QPushButton('취소 (Esc)')
+        self.cancel_button.setFixedHeight(40)
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_processing)
         button_layout.addStretch()
         button_layout.addWidget(self.process_button)
+        button_layout.addWidget(self.retry_button)
+        button_layout.addWidget(self.cancel_button)
         button_layout.addStretch()
+        cancel_shortcut = QShortcut(QKeySequence(Qt.Key_Escape), self)
+        cancel_shortcut.activated.connect(self.cancel_processing)
         status_layout.addLayout(button_layout)
 
         status_group.setLayout(status_layout)
@@ -179,9 +219,15 @@ class MainWindow(QMainWindow):
         self.copy_data_btn.setToolTip('헤더 없이 데이터만 엑셀 호환 형식으로 복사')
         self.copy_data_btn.clicked.connect(lambda: self.table_widget.copyTableForExcel(False))
         
+        # 파일 내보내기 버튼
+        self.export_btn = QPushButton('💾 내보내기')
+        self.export_btn.setToolTip('추출 결과를 CSV/XLSX/Parquet 파일로 저장')
+        self.export_btn.clicked.connect(self.export_results)
+
         table_controls_layout.addWidget(self.copy_excel_btn)
         table_controls_layout.addWidget(self.copy_data_btn)
         table_controls_layout.addStretch()
+        table_controls_layout.addWidget(self.export_btn)
         
         # 테이블 컨테이너 위젯 생성
         table_container = QWidget()
@@ -198,10 +244,130 @@ class MainWindow(QMainWindow):
         self.result_text.setFont(QFont('Courier New', 10))
         self.tab_widget.addTab(self.result_text, "JSON 보기")
 
+        # 이력 검색 탭
+        self.tab_widget.addTab(self._create_search_tab(), "기록 검색")
+
+        # 통합 보기 탭
+        self.tab_widget.addTab(self._create_consolidated_tab(), "통합 보기")
+
         result_layout.addWidget(self.tab_widget)
         result_group.setLayout(result_layout)
         main_layout.addWidget(result_group, 1)
 
+    def _create_search_tab(self) -> QWidget:
+        """과거 OCR 결과 품번 검색 탭 생성"""
+        search_tab = QWidget()
+        search_layout = QVBoxLayout(search_tab)
+        search_layout.setContentsMargins(0, 0, 0, 0)
+
+        search_controls_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('품번 검색 (예: DMCA-8N-SA)')
+        self.search_input.returnPressed.connect(self.search_history)
+        self.search_prefix_checkbox = QCheckBox('앞부분 일치')
+        search_button = QPushButton('검색')
+        search_button.clicked.connect(self.search_history)
+
+        search_controls_layout.addWidget(self.search_input, 1)
+        search_controls_layout.addWidget(self.search_prefix_checkbox)
+        search_controls_layout.addWidget(search_button)
+        search_layout.addLayout(search_controls_layout)
+
+        self.search_table = CopyableTableWidget()
+        self.search_table.setMainWindow(self)
+        self.search_table.setColumnCount(5)
+        self.search_table.setHorizontalHeaderLabels(['품번', '수량', '파일명', '페이지', '날짜'])
+        self.search_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.search_table.setAlternatingRowColors(True)
+        search_layout.addWidget(self.search_table)
+
+        return search_tab
+
+    def _create_consolidated_tab(self) -> QWidget:
+        """이번 세션에서 처리한 문서들의 품번별 통합 탭 생성"""
+        consolidated_tab = QWidget()
+        consolidated_layout = QVBoxLayout(consolidated_tab)
+        consolidated_layout.setContentsMargins(0, 0, 0, 0)
+
+        consolidated_controls_layout = QHBoxLayout()
+        self.consolidated_label = QLabel('처리한 문서가 없습니다')
+        reset_button = QPushButton('초기화')
+        reset_button.clicked.connect(self.reset_consolidated_view)
+
+        consolidated_controls_layout.addWidget(self.consolidated_label, 1)
+        consolidated_controls_layout.addWidget(reset_button)
+        consolidated_layout.addLayout(consolidated_controls_layout)
+
+        self.consolidated_table = CopyableTableWidget()
+        self.consolidated_table.setMainWindow(self)
+        self.consolidated_table.setColumnCount(4)
+        self.consolidated_table.setHorizontalHeaderLabels(['품번', '합계 수량', '건수', '출처'])
+        self.consolidated_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.consolidated_table.setAlternatingRowColors(True)
+        consolidated_layout.addWidget(self.consolidated_table)
+
+        return consolidated_tab
+
+    def refresh_consolidated_view(self):
+        """세션 문서들을 품번별로 통합해 표시"""
+        items = aggregate_documents(self.session_documents)
+
+        self.consolidated_table.setRowCount(0)
+        for item in items:
+            row = self.consolidated_table.rowCount()
+            self.consolidated_table.insertRow(row)
+            for col, value in enumerate(item.to_row()):
+                cell = QTableWidgetItem(str(value))
+                if col in (1, 2):
+                    cell.setTextAlignment(Qt.AlignCenter)
+                self.consolidated_table.setItem(row, col, cell)
+
+        if self.session_documents:
+            self.consolidated_label.setText(
+                f'문서 {len(self.session_documents)}개, 품번 {len(items)}종, '
+                f'합계 수량 {sum(item.total_quantity for item in items)}개'
+            )
+        else:
+            self.consolidated_label.setText('처리한 문서가 없습니다')
+
+    def reset_consolidated_view(self):
+        """통합 보기 초기화"""
+        self.session_documents = []
+        self.refresh_consolidated_view()
+
+    def _get_history_index(self):
+        """검색 색인 (처음 사용할 때 열기)"""
+        if self.history_index is None:
+            self.history_index = SearchIndex()
+        return self.history_index
+
+    def search_history(self):
+        """검색 색인에서 품번 검색"""
+        query = self.search_input.text().strip()
+        if not query:
+            return
+
+        try:
+            start = time.perf_counter()
+            hits = self._get_history_index().search(query, prefix=self.search_prefix_checkbox.isChecked())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"검색 중 오류가 발생했습니다:\n{e}")
+            return
+
+        self.search_table.setRowCount(0)
+        for hit in hits:
+            row = self.search_table.rowCount()
+            self.search_table.insertRow(row)
+            values = [hit.product_code, hit.quantity, hit.filename, hit.page, hit.date or ""]
+            for col, value in enumerate(values):
+                cell = QTableWidgetItem(str(value))
+                if col in (1, 3):
+                    cell.setTextAlignment(Qt.AlignCenter)
+                self.search_table.setItem(row, col, cell)
+
+        self.statusBar().showMessage(f"'{query}' 검색 결과 {len(hits)}건 ({elapsed_ms:.1f}ms)", 5000)
+
     def select_file(self):
         """파일 선택 다이얼로그 열기"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -216,6 +382,19 @@ class MainWindow(QMainWindow):
             self.process_button.setEnabled(True)
             self.process_action.setEnabled(True)
             self.statusBar().showMessage(f'파일 선택됨: {file_name}')
+            self.show_estimate(file_path)
+
+    def show_estimate(self, file_path: str):
+        """선택한 파일의 예상 비용 / 소요 시간 표시 (API 호출 없음)"""
+        config = RuntimeConfig.from_settings()
+        estimate = CostEstimator(config, LatencyHistory()).estimate_file(file_path)
+        if estimate.error:
+            self.cost_label.setText('예상 API 비용: 확인할 수 없음')
+            return
+        self.cost_label.setText(
+            f'예상 API 비용: {config.format_cost(estimate.cost)} · '
+            f'{estimate.pages}페이지 · 약 {format_duration(estimate.seconds)}'
+        )
 
     def start_processing(self):
         """OCR 처리 시작"""
@@ -238,7 +417,27 @@ class MainWindow(QMainWindow):
         self._set_processing_state(True)
 
         # 워커 스레드에서 처리 시작
-        self.worker = ProcessingWorker(self.selected_file)
+        self.current_file = self.selected_file
+        self._start_worker(ProcessingWorker(self.selected_file))
+
+    def retry_failed_pages(self):
+        """현재 결과의 실패 / 보류된 페이지만 다시 처리"""
+        if self.current_document is None or not self.current_document.pages_to_retry:
+            return
+        self._set_processing_state(True)
+        self._start_worker(ProcessingWorker(self.current_file, retry_document=self.current_document))
+
+    def cancel_processing(self):
+        """처리 취소 (완료된 페이지까지의 결과는 유지)"""
+        if self.worker is None or not self.worker.isRunning():
+            return
+        self.worker.cancel()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("취소 중...")
+        self.statusBar().showMessage("취소 중...")
+
+    def _start_worker(self, worker: ProcessingWorker):
+        self.worker = worker
         self.worker.progress_updated.connect(self.update_progress)
         self.worker.result_ready.connect(self.handle_result)
         self.worker.error_occurred.connect(self.handle_error)
@@ -248,6 +447,11 @@ class MainWindow(QMainWindow):
         """처리 중 상태 UI 업데이트"""
         self.process_button.setEnabled(not processing)
         self.process_action.setEnabled(not processing)
+        self.retry_button.setEnabled(
+            not processing and self.current_document is not None and bool(self.current_document.pages_to_retry)
+        )
+        self.cancel_button.setVisible(processing)
+        self.cancel_button.setEnabled(processing)
         self.file_button.setEnabled(not processing)
         self.progress_bar.setVisible(processing)
         
@@ -276,7 +480,18 @@ class MainWindow(QMainWindow):
         self.cost_label.setText(f'추정 API 비용: {app_settings.format_cost(document.processing_cost)}')
 
         # JSON 파일로 저장
-        output_file = save_json_result(document.to_dict(), self.selected_file)
+        output_file = save_json_result(document.to_dict(), self.current_file)
+
+        # 검색 이력 색인에 추가
+        try:
+            self._get_history_index().add_document(document, doc_key=document.source_key)
+        except Exception as e:
+            print(f"경고: 검색 색인 추가 실패: {e}")
+
+        # 통합 보기에 추가 (다시 처리한 문서는 이미 들어 있음)
+        if not any(session_document is document for session_document in self.session_documents):
+            self.session_documents.append(document)
+        self.refresh_consolidated_view()
 
         # JSON 표시
         formatted_json = json.dumps(document.to_dict(), ensure_ascii=False, indent=2)
@@ -288,8 +503,32 @@ class MainWindow(QMainWindow):
         # UI 상태 업데이트
         self._set_processing_state(False)
         
+        if document.cancelled:
+            done_count = len(document.pages) - len(document.pages_to_retry)
+            status_msg = (f"취소됨: {done_count}/{len(document.pages)}페이지 처리, "
+                          f"{document.total_items}개 항목. 결과가 {output_file}에 저장되었습니다.")
+            self.status_label.setText(status_msg)
+            self.statusBar().showMessage(status_msg)
+            QMessageBox.information(
+                self,
+                "처리 취소",
+                f"처리를 취소했습니다.\n"
+                f"- 처리한 페이지: {done_count}/{len(document.pages)}\n"
+                f"- 추출 항목: {document.total_items}개\n"
+                f"- 결과 파일: {output_file}\n"
+                f"- 추정 API 비용: {app_settings.format_cost(document.processing_cost)}\n\n"
+                f"남은 페이지는 '실패 페이지 다시 처리'로 이어서 처리할 수 있습니다."
+            )
+            return
+        
         item_count = document.total_items
+        invalid_count = document.invalid_row_count
+        retry_pages = document.pages_to_retry
         status_msg = f"완료! {item_count}개 항목 추출됨. 결과가 {output_file}에 저장되었습니다."
+        if invalid_count:
+            status_msg += f" (검증 실패 {invalid_count}행)"
+        if retry_pages:
+            status_msg += f" (실패 / 보류 {len(retry_pages)}페이지)"
         self.status_label.setText(status_msg)
         self.statusBar().showMessage(status_msg)
 
@@ -309,6 +548,8 @@ class MainWindow(QMainWindow):
                 "처리 완료",
                 f"OCR 처리가 완료되었습니다.\n"
                 f"- 추출 항목: {item_count}개\n"
+                f"- 검증 실패 행: {invalid_count}개\n"
+                f"- 실패 / 보류된 페이지: {', '.join(str(page.page_number) for page in retry_pages) or '없음'}\n"
                 f"- 결과 파일: {output_file}\n"
                 f"- 추정 API 비용: {app_settings.format_cost(document.processing_cost)}"
             )
@@ -317,7 +558,14 @@ class MainWindow(QMainWindow):
         """테이블에 데이터 채우기"""
         self.table_widget.setRowCount(0)
         
-        for item in document.all_items:
+        # 카탈로그 매칭 결과가 있으면 카탈로그 품번 / 거리 열 표시
+        items = document.all_items
+        show_catalog = any("catalog" in page.raw_content for page in document.pages)
+        headers = ['품번', '수량', '카탈로그 품번', '매칭 거리'] if show_catalog else ['품번', '수량']
+        self.table_widget.setColumnCount(len(headers))
+        self.table_widget.setHorizontalHeaderLabels(headers)
+        
+        for item in items:
             row = self.table_widget.rowCount()
             self.table_widget.insertRow(row)
             
@@ -327,6 +575,16 @@ class MainWindow(QMainWindow):
             
             self.table_widget.setItem(row, 0, name_item)
             self.table_widget.setItem(row, 1, qty_item)
+            
+            if show_catalog:
+                matched_item = QTableWidgetItem(item.matched_code or "미등록")
+                distance_text = "" if item.match_distance is None else f"{item.match_distance:g}"
+                distance_item = QTableWidgetItem(distance_text)
+                distance_item.setTextAlignment(Qt.AlignCenter)
+                if item.matched_code is None or item.match_distance:
+                    matched_item.setBackground(QColor("#fff2cc"))
+                self.table_widget.setItem(row, 2, matched_item)
+                self.table_widget.setItem(row, 3, distance_item)
 
     def handle_error(self, error_msg):
         """오류 처리"""
@@ -355,11 +613,10 @@ class MainWindow(QMainWindow):
         for item in self.table_widget.selectedItems():
             selected_columns.add(item.column())
 
-        column_names = ['품번', '수량']
-
         for col in sorted(selected_columns):
-            if col < len(column_names):
-                col_name = column_names[col]
+            header_item = self.table_widget.horizontalHeaderItem(col)
+            if header_item is not None:
+                col_name = header_item.text()
                 action = QAction(f"'{col_name}' 열 복사", self)
                 action.triggered.connect(lambda checked, col=col: self.copy_column(col))
                 copy_column_actions.append(action)
@@ -412,6 +669,28 @@ class MainWindow(QMainWindow):
         """테이블의 특정 열 전체를 복사"""
         self.table_widget.copyColumn(column)
 
+    def export_results(self):
+        """현재 결과를 파일로 내보내기"""
+        if self.current_document is None:
+            QMessageBox.warning(self, "경고", "내보낼 결과가 없습니다. 먼저 OCR 처리를 진행해주세요.")
+            return
+
+        doc_name = os.path.splitext(self.current_document.filename)[0]
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "결과 내보내기", f"{doc_name}.xlsx",
+            "Excel 파일 (*.xlsx);;CSV 파일 (*.csv);;Parquet 파일 (*.parquet)"
+        )
+        if not output_path:
+            return
+
+        try:
+            row_count = export_documents([self.current_document], output_path)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"내보내기 중 오류가 발생했습니다:\n{e}")
+            return
+
+        self.statusBar().showMessage(f"{row_count}개 항목을 {output_path}로 내보냈습니다", 3000)
+
     def show_settings(self):
         """설정 대화상자 표시"""
         dialog = SettingsDialog(self)
@@ -1,11 +1,15 @@
 from PyQt5.QtWidgets import (QTableWidget, QWidget, QHBoxLayout, QLabel, 
                              QToolButton, QDialog, QVBoxLayout, QFormLayout,
-                             QLineEdit, QCheckBox, QDialogButtonBox, QGroupBox)
+                             QLineEdit, QCheckBox, QDialogButtonBox, QGroupBox,
+                             QPushButton, QFileDialog)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QKeySequence
 import pyperclip
+from typing import Optional
 
 from ..core.document_processor import DocumentProcessor
+from ..models.document import ProcessedDocument
+from ..utils.cancellation import CancellationToken
 from ..config.settings import app_settings
 
 
@@ -116,8 +120,8 @@ class CopyableTableWidget(QTableWidget):
         pyperclip.copy(text.strip())
 
         # 열 이름 가져오기
-        column_names = ['품번', '수량']  # 기본 열 이름 목록
-        column_name = column_names[column] if column < len(column_names) else f"열 {column+1}"
+        header_item = self.horizontalHeaderItem(column)
+        column_name = header_item.text() if header_item is not None else f"열 {column+1}"
 
         # 복사 확인 메시지
         if self.main_window and hasattr(self.main_window, 'statusBar'):
@@ -273,6 +277,16 @@ class SettingsDialog(QDialog):
         api_layout.addRow("OpenAI API 키:", key_layout)
         api_layout.addRow("사용할 모델:", self.model_input)
 
+        # 품번 카탈로그 CSV
+        self.catalog_input = QLineEdit()
+        self.catalog_input.setPlaceholderText("비워두면 카탈로그 매칭 사용 안 함")
+        catalog_button = QPushButton("찾아보기")
+        catalog_button.clicked.connect(self.select_catalog)
+        catalog_layout = QHBoxLayout()
+        catalog_layout.addWidget(self.catalog_input)
+        catalog_layout.addWidget(catalog_button)
+        api_layout.addRow("품번 카탈로그:", catalog_layout)
+
         # 개발용 설정
         self.mock_mode_checkbox = QCheckBox("개발 모드 (API 호출 없이 모킹)")
         api_layout.addRow("개발 설정:", self.mock_mode_checkbox)
@@ -297,17 +311,25 @@ class SettingsDialog(QDialog):
         else:
             self.api_key_input.setEchoMode(QLineEdit.Password)
 
+    def select_catalog(self):
+        """품번 카탈로그 CSV 파일 선택"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "품번 카탈로그 선택", "", "CSV 파일 (*.csv)")
+        if file_path:
+            self.catalog_input.setText(file_path)
+
     def load_settings(self):
         """저장된 설정 불러오기"""
         self.api_key_input.setText(app_settings.api_key or "")
         self.model_input.setText(app_settings.model_name)
         self.mock_mode_checkbox.setChecked(app_settings.mock_mode)
+        self.catalog_input.setText(app_settings.catalog_path)
 
     def save_settings(self):
         """설정 저장"""
         app_settings.api_key = self.api_key_input.text()
         app_settings.model_name = self.model_input.text()
         app_settings.mock_mode = self.mock_mode_checkbox.isChecked()
+        app_settings.catalog_path = self.catalog_input.text().strip()
         app_settings.save_settings()
 
 
@@ -317,17 +339,29 @@ class ProcessingWorker(QThread):
     result_ready = pyqtSignal(object)  # ProcessedDocument 객체
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, retry_document: Optional[ProcessedDocument] = None):
         super().__init__()
         self.file_path = file_path
+        self.retry_document = retry_document  # 주어지면 이 문서의 실패 / 보류된 페이지만 다시 처리
         self.processor = DocumentProcessor()
+        self.cancel_token = CancellationToken()
+
+    def cancel(self):
+        """처리 취소 (진행 중인 페이지를 기다리지 않고 완료된 페이지까지의 결과를 반환)"""
+        self.cancel_token.cancel()
 
     def run(self):
         try:
-            result = self.processor.process_document(self.file_path, self.progress_callback)
+            if self.retry_document is not None:
+                result = self.processor.retry_failed_pages(self.retry_document, self.file_path,
+                                                           self.progress_callback, self.cancel_token)
+            else:
+                result = self.processor.process_document(self.file_path, self.progress_callback, self.cancel_token)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(f"오류 발생: {str(e)}")
+        finally:
+            self.processor.close()
 
     def progress_callback(self, current, total):
         self.progress_updated.emit(current, total)
\ No newline at end of file
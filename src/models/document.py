@@ -1,6 +1,14 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import List, Dict, Any, Tuple
 from .order_item import OrderItem
+from .item_store import ItemStore
+
+# 페이지 처리 상태 (raw_content["status"], 없으면 정상)
+PAGE_FAILED = "failed"      # 처리 중 오류
+PAGE_DEFERRED = "deferred"  # OCR 차단으로 보류
+PAGE_CANCELLED = "cancelled"  # 사용자가 작업을 취소해 처리하지 않음
+RETRY_STATUSES = (PAGE_FAILED, PAGE_DEFERRED, PAGE_CANCELLED)
 
 
 @dataclass
@@ -17,6 +25,23 @@ class DocumentPage:
             "content": [item.to_dict() for item in self.items],
             "raw_content": self.raw_content
         }
+    
+    @classmethod
+    def from_dict(cls, page_data: dict) -> "DocumentPage":
+        """딕셔너리에서 생성"""
+        items = []
+        content = page_data.get("content", [])
+        
+        if isinstance(content, list):
+            for item_data in content:
+                if isinstance(item_data, dict) and "품번" in item_data:
+                    items.append(OrderItem.from_dict(item_data))
+        
+        return cls(
+            page_number=page_data.get("page", 1),
+            items=items,
+            raw_content=page_data.get("raw_content", {})
+        )
 
 
 @dataclass
@@ -27,53 +52,91 @@ class ProcessedDocument:
     total_pages: int
     pages: List[DocumentPage]
     processing_cost: float = 0.0
+    source_key: str = ""  # 원본 파일 내용 + 처리 설정 키 (검색 색인에서 같은 문서를 한 번만 색인)
     
-    @property
+    # 아래 집계 값들은 처음 접근할 때 계산되어 캐시됩니다.
+    # 페이지는 set_pages() / replace_page()로 바꿔야 캐시가 함께 초기화됩니다.
+    
+    @cached_property
+    def item_store(self) -> ItemStore:
+        """모든 페이지 항목의 열 지향 저장소"""
+        store = ItemStore()
+        store.add_document(self)
+        return store
+    
+    @cached_property
     def total_items(self) -> int:
         """전체 아이템 수"""
-        return sum(len(page.items) for page in self.pages)
+        return len(self.item_store)
+    
+    @cached_property
+    def total_quantity(self) -> int:
+        """전체 수량 합계"""
+        return self.item_store.total_quantity
+    
+    @cached_property
+    def _items(self) -> Tuple[OrderItem, ...]:
+        return tuple(item for page in self.pages for item in page.items)
     
     @property
     def all_items(self) -> List[OrderItem]:
-        """모든 페이지의 아이템들을 하나의 리스트로"""
-        items = []
-        for page in self.pages:
-            items.extend(page.items)
-        return items
+        """모든 페이지의 아이템들을 하나의 리스트로 (호출할 때마다 새 리스트)"""
+        return list(self._items)
+    
+    def set_pages(self, pages: List[DocumentPage]) -> None:
+        """페이지 전체를 교체하고 캐시된 집계 값 초기화"""
+        self.pages = list(pages)
+        self._invalidate_cache()
+    
+    def replace_page(self, page: DocumentPage) -> None:
+        """같은 번호의 페이지를 교체하고 캐시된 집계 값 초기화"""
+        self.set_pages([page if old.page_number == page.page_number else old for old in self.pages])
+    
+    def _invalidate_cache(self) -> None:
+        for name in ("item_store", "total_items", "total_quantity", "_items"):
+            self.__dict__.pop(name, None)
+    
+    @property
+    def cancelled(self) -> bool:
+        """작업 취소로 처리하지 않은 페이지가 있는지"""
+        return any(page.raw_content.get("status") == PAGE_CANCELLED for page in self.pages)
+    
+    @property
+    def pages_to_retry(self) -> List[DocumentPage]:
+        """실패 / 보류 / 취소되어 다시 처리할 페이지"""
+        return [page for page in self.pages if page.raw_content.get("status") in RETRY_STATUSES]
+    
+    @property
+    def invalid_row_count(self) -> int:
+        """검증에 실패해 항목에서 제외된 행 수"""
+        return sum(
+            page.raw_content.get("parse_stats", {}).get("invalid_rows", 0)
+            for page in self.pages
+        )
     
     def to_dict(self) -> dict:
         """딕셔너리로 변환"""
-        return {
+        data = {
             "document_type": self.document_type,
             "total_pages": self.total_pages,
             "filename": self.filename,
             "pages": [page.to_dict() for page in self.pages],
             "processing_cost": self.processing_cost
         }
+        if self.source_key:
+            data["source_key"] = self.source_key
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> "ProcessedDocument":
         """딕셔너리에서 생성"""
-        pages = []
-        for page_data in data.get("pages", []):
-            items = []
-            content = page_data.get("content", [])
-            
-            if isinstance(content, list):
-                for item_data in content:
-                    if isinstance(item_data, dict) and "품번" in item_data:
-                        items.append(OrderItem.from_dict(item_data))
-            
-            pages.append(DocumentPage(
-                page_number=page_data.get("page", 1),
-                items=items,
-                raw_content=page_data.get("raw_content", {})
-            ))
+        pages = [DocumentPage.from_dict(page_data) for page_data in data.get("pages", [])]
         
         return cls(
             filename=data.get("filename", ""),
             document_type=data.get("document_type", "Image"),
             total_pages=data.get("total_pages", 1),
             pages=pages,
-            processing_cost=data.get("processing_cost", 0.0)
+            processing_cost=data.get("processing_cost", 0.0),
+            source_key=data.get("source_key", "")
         )
\ No newline at end of file
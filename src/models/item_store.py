@@ -0,0 +1,84 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .order_item import OrderItem
+
+
+class ItemStore:
+    """주문 항목 열 지향(columnar) 저장소
+
+    품번은 문자열 테이블에 한 번만 저장(intern)하고, 항목마다
+    품번 번호 / 수량 / 페이지 번호만 배열로 보관합니다.
+    """
+
+    def __init__(self):
+        self.codes: List[str] = []                    # 품번 문자열 테이블
+        self._code_ids: Dict[str, int] = {}           # 품번 -> 테이블 인덱스
+        self.pages: List[Tuple[str, int]] = []        # (파일명, 페이지 번호)
+        self.code_index = array('I')                  # 항목별 품번 인덱스
+        self.quantities = array('q')                  # 항목별 수량
+        self.page_index = array('I')                  # 항목별 페이지 인덱스
+
+    def intern_code(self, product_code: str) -> int:
+        """품번을 테이블에 등록하고 인덱스 반환"""
+        code_id = self._code_ids.get(product_code)
+        if code_id is None:
+            code_id = len(self.codes)
+            self._code_ids[product_code] = code_id
+            self.codes.append(product_code)
+        return code_id
+
+    def add_page(
+        self,
+        filename: str,
+        page_number: int,
+        items: Iterable[OrderItem],
+        prefer_matched: bool = False
+    ) -> None:
+        """페이지 하나의 항목들을 추가 (prefer_matched=True면 카탈로그 매칭 품번 사용)"""
+        page_id = len(self.pages)
+        self.pages.append((filename, page_number))
+
+        intern_code = self.intern_code
+        for item in items:
+            code = (item.matched_code or item.product_code) if prefer_matched else item.product_code
+            self.code_index.append(intern_code(code))
+            self.quantities.append(int(item.quantity))
+            self.page_index.append(page_id)
+
+    def add_document(self, document, prefer_matched: bool = False) -> None:
+        """문서(ProcessedDocument)의 모든 페이지 항목을 추가"""
+        for page in document.pages:
+            self.add_page(document.filename, page.page_number, page.items, prefer_matched)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable) -> "ItemStore":
+        """여러 문서로부터 저장소 생성 (문서는 추가 후 보관하지 않음)"""
+        store = cls()
+        for document in documents:
+            store.add_document(document)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def item(self, index: int) -> OrderItem:
+        """index 번째 항목을 OrderItem으로 반환"""
+        return OrderItem(self.codes[self.code_index[index]], self.quantities[index])
+
+    def __iter__(self) -> Iterator[OrderItem]:
+        codes = self.codes
+        for code_id, quantity in zip(self.code_index, self.quantities):
+            yield OrderItem(codes[code_id], quantity)
+
+    def iter_rows(self) -> Iterator[Tuple[str, int, str, int]]:
+        """(파일명, 페이지, 품번, 수량) 행 순회"""
+        codes = self.codes
+        pages = self.pages
+        for code_id, quantity, page_id in zip(self.code_index, self.quantities, self.page_index):
+            filename, page_number = pages[page_id]
+            yield filename, page_number, codes[code_id], quantity
+
+    @property
+    def total_quantity(self) -> int:
+        """전체 수량 합계"""
+        return sum(self.quantities)
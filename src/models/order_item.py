@@ -1,31 +1,157 @@
-from dataclasses import dataclass
-from typing import Union
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
 
 
-@dataclass
+# 수량 문자열 패턴: "1200", "1,200", "12 EA", "12개", "3 SET" 등
+_QUANTITY_PATTERN = re.compile(
+    r'^(\d{1,3}(?:,\d{3})+|\d+)(?:\.0+)?\s*(?:EA|PCS|PC|SET|개|세트)?\.?$',
+    re.IGNORECASE
+)
+
+
+def _normalize_text(value: str) -> str:
+    """전각 문자 등을 일반 문자로 정규화하고 앞뒤 공백 제거"""
+    if not value.isascii():
+        value = unicodedata.normalize('NFKC', value)
+    return value.strip()
+
+
+# 여러 종류의 대시/공백 문자
+_DASHES = re.compile(r'[\s\-‐‑‒–—―−_]+')
+
+
+def normalize_product_code(product_code: str) -> str:
+    """비교/검색용 품번 정규화 (전각 문자, 대소문자, 대시 종류 통일)"""
+    code = _normalize_text(product_code).upper()
+    return _DASHES.sub('-', code).strip('-')
+
+
+def normalize_quantity(value: Any) -> Optional[int]:
+    """수량 값을 정수로 정규화 (해석할 수 없으면 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 0 else None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() and value >= 0 else None
+    if isinstance(value, str):
+        match = _QUANTITY_PATTERN.match(_normalize_text(value))
+        if match:
+            return int(match.group(1).replace(',', ''))
+    return None
+
+
+@dataclass(slots=True)
 class OrderItem:
     """주문 항목 데이터 모델"""
     product_code: str  # 품번
     quantity: int      # 수량
-    
+    matched_code: Optional[str] = None     # 카탈로그에서 찾은 품번
+    match_distance: Optional[float] = None  # 카탈로그 품번과의 거리 (0이면 일치)
+
     def __post_init__(self):
         if isinstance(self.quantity, str):
-            try:
-                self.quantity = int(self.quantity)
-            except ValueError:
-                self.quantity = 0
-    
+            quantity = normalize_quantity(self.quantity)
+            self.quantity = quantity if quantity is not None else 0
+
     def to_dict(self) -> dict:
         """딕셔너리로 변환"""
-        return {
+        result = {
             "품번": self.product_code,
             "수량": self.quantity
         }
-    
+        if self.matched_code is not None:
+            result["카탈로그_품번"] = self.matched_code
+            result["매칭_거리"] = self.match_distance
+        return result
+
     @classmethod
     def from_dict(cls, data: dict) -> "OrderItem":
         """딕셔너리에서 생성"""
         return cls(
             product_code=data.get("품번", ""),
-            quantity=data.get("수량", 0)
-        )
\ No newline at end of file
+            quantity=data.get("수량", 0),
+            matched_code=data.get("카탈로그_품번"),
+            match_distance=data.get("매칭_거리")
+        )
+
+    @classmethod
+    def parse_page(cls, data: Union[str, List[Any]]) -> "PageParseResult":
+        """페이지 하나의 OCR 응답(JSON 배열)을 한 번에 파싱하고 검증"""
+        result = PageParseResult()
+        stats = result.stats
+
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                stats.total_rows = 1
+                stats.invalid_rows = 1
+                result.invalid_rows.append({"row": 0, "data": data, "reason": "invalid_json"})
+                return result
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, (list, tuple)):
+            # null / 숫자 / 문자열처럼 배열이 아닌 응답
+            stats.total_rows = 1
+            stats.invalid_rows = 1
+            result.invalid_rows.append({"row": 0, "data": data, "reason": "not_an_array"})
+            return result
+
+        items = result.items
+        invalid_rows = result.invalid_rows
+        for index, row in enumerate(data):
+            if not isinstance(row, dict):
+                invalid_rows.append({"row": index, "data": row, "reason": "not_an_object"})
+                continue
+
+            product_code = row.get("품번")
+            if not isinstance(product_code, str) or not product_code.strip():
+                invalid_rows.append({"row": index, "data": row, "reason": "missing_product_code"})
+                continue
+
+            raw_quantity = row.get("수량")
+            if type(raw_quantity) is int and raw_quantity >= 0:
+                quantity = raw_quantity
+            else:
+                quantity = normalize_quantity(raw_quantity)
+                if quantity is None:
+                    invalid_rows.append({"row": index, "data": row, "reason": "invalid_quantity"})
+                    continue
+                stats.normalized_rows += 1
+
+            items.append(cls(_normalize_text(product_code), quantity))
+
+        stats.total_rows = len(data)
+        stats.valid_rows = len(items)
+        stats.invalid_rows = len(invalid_rows)
+        return result
+
+
+@dataclass
+class ParseStats:
+    """페이지 파싱 통계"""
+    total_rows: int = 0
+    valid_rows: int = 0
+    invalid_rows: int = 0
+    normalized_rows: int = 0  # 수량 정규화가 필요했던 행 수
+
+    def to_dict(self) -> dict:
+        """딕셔너리로 변환"""
+        return {
+            "total_rows": self.total_rows,
+            "valid_rows": self.valid_rows,
+            "invalid_rows": self.invalid_rows,
+            "normalized_rows": self.normalized_rows
+        }
+
+
+@dataclass
+class PageParseResult:
+    """페이지 파싱 결과 (유효 항목, 검증 실패 행, 통계)"""
+    items: List[OrderItem] = field(default_factory=list)
+    invalid_rows: List[Dict[str, Any]] = field(default_factory=list)
+    stats: ParseStats = field(default_factory=ParseStats)
@@ -0,0 +1,467 @@
+import datetime
+import hashlib
+import os
+import re
+from dataclasses import dataclass, asdict
+from typing import BinaryIO, Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..models.document import DocumentPage, ProcessedDocument
+from .file_utils import ensure_directory_exists, get_app_data_dir
+from .serialization import dumps, loads
+
+# 구조 문자 / 문자열 본문 / 스칼라 값 끝 탐색용 패턴
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_STRING_BODY = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+_WHITESPACE = b' \t\r\n'
+
+# 보관 파일 이름에서 날짜 추출: {doc}_ocr_YYYYMMDD_HHMMSS.json / ocr_results_YYYYMMDD.jsonl
+_FILENAME_DATE = re.compile(r'(?:_ocr_|ocr_results_)(\d{8})')
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+# 색인 파일을 두는 앱 데이터 하위 디렉토리
+INDEX_DIR_NAME = "archive_index"
+# 색인 메타 줄 길이 (덧붙여 갱신할 때 제자리에서 덮어쓰도록 고정)
+_META_LINE_SIZE = 512
+# 덧붙이기만 한 보관 파일인지 확인할 때 비교하는 이전 끝부분 길이
+_TAIL_SIZE = 64
+
+
+class _JsonStreamTokenizer:
+    """파일을 조금씩 읽으며 JSON 값 단위로 잘라내는 토크나이저
+
+    전체 파일이 아니라 현재 읽고 있는 값 하나와 읽기 버퍼만 메모리에 유지합니다.
+    """
+
+    def __init__(self, f: BinaryIO, offset: int = 0, chunk_size: int = 65536):
+        f.seek(offset)
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = b''
+        self._pos = 0
+        self._base = offset  # _buf[0]의 파일 내 위치
+
+    @property
+    def offset(self) -> int:
+        """다음에 읽을 위치 (파일 기준)"""
+        return self._base + self._pos
+
+    def _compact(self) -> None:
+        """이미 읽은 부분을 버퍼에서 제거"""
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._base += self._pos
+            self._pos = 0
+
+    def _fill(self) -> bool:
+        """버퍼 뒤에 다음 청크를 이어 붙임 (EOF면 False)"""
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> Optional[int]:
+        """공백을 건너뛴 다음 바이트 (EOF면 None)"""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            self._compact()
+            if not self._fill():
+                return None
+
+    def next_byte(self) -> Optional[int]:
+        """공백을 건너뛴 다음 바이트를 읽고 위치를 넘김"""
+        byte = self.peek()
+        if byte is not None:
+            self._pos += 1
+        return byte
+
+    def expect(self, char: bytes) -> None:
+        """다음 바이트가 char인지 확인하고 넘김"""
+        byte = self.next_byte()
+        if byte != char[0]:
+            found = "EOF" if byte is None else repr(chr(byte))
+            raise ValueError(f"JSON 형식 오류: 위치 {self.offset}에서 {char.decode()!r} 대신 {found}")
+
+    def _scan_string(self, index: int) -> int:
+        while True:
+            match = _STRING_BODY.match(self._buf, index)
+            if match:
+                return match.end()
+            if not self._fill():
+                raise ValueError(f"JSON 형식 오류: 위치 {self._base + index}의 문자열이 끝나지 않았습니다")
+
+    def _scan_container(self, index: int) -> int:
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self._buf, index)
+            if match is None:
+                index = len(self._buf)
+                if not self._fill():
+                    raise ValueError("JSON 형식 오류: 객체/배열이 끝나지 않았습니다")
+                continue
+            char = self._buf[match.start()]
+            if char == 0x22:  # "
+                index = self._scan_string(match.end())
+                continue
+            depth += 1 if char in b'[{' else -1
+            index = match.end()
+            if depth == 0:
+                return index
+
+    def _scan_scalar(self, index: int) -> int:
+        while True:
+            match = _SCALAR_END.search(self._buf, index)
+            if match:
+                return match.start()
+            index = len(self._buf)
+            if not self._fill():
+                return index
+
+    def read_raw_value(self) -> bytes:
+        """다음 JSON 값 하나의 원본 바이트를 읽음"""
+        first = self.peek()
+        if first is None:
+            raise ValueError("JSON 형식 오류: 값이 필요한 위치에서 파일이 끝났습니다")
+        self._compact()
+        if first == 0x22:
+            end = self._scan_string(1)
+        elif first in b'[{':
+            end = self._scan_container(0)
+        else:
+            end = self._scan_scalar(0)
+        raw = self._buf[:end]
+        self._pos = end
+        return raw
+
+    def read_value(self) -> Any:
+        """다음 JSON 값 하나를 파싱하여 반환"""
+        return loads(self.read_raw_value())
+
+
+def _iter_document(tokenizer: _JsonStreamTokenizer, header: Dict[str, Any],
+                   decode_pages: bool = True) -> Iterator[Optional[DocumentPage]]:
+    """문서 객체 하나를 읽으며 페이지를 하나씩 반환
+
+    pages 이외의 필드는 header에 채워집니다. decode_pages=False면 페이지를
+    파싱하지 않고 None을 반환합니다 (색인 작성용).
+    """
+    tokenizer.expect(b'{')
+    if tokenizer.peek() == ord('}'):
+        tokenizer.next_byte()
+        return
+
+    while True:
+        key = tokenizer.read_value()
+        tokenizer.expect(b':')
+        if key == "pages" and tokenizer.peek() == ord('['):
+            tokenizer.next_byte()
+            if tokenizer.peek() == ord(']'):
+                tokenizer.next_byte()
+            else:
+                while True:
+                    raw = tokenizer.read_raw_value()
+                    yield DocumentPage.from_dict(loads(raw)) if decode_pages else None
+                    if tokenizer.next_byte() == ord(']'):
+                        break
+        else:
+            header[key] = tokenizer.read_value()
+
+        separator = tokenizer.next_byte()
+        if separator == ord('}'):
+            return
+        if separator != ord(','):
+            raise ValueError(f"JSON 형식 오류: 위치 {tokenizer.offset} 부근의 문서 객체")
+
+
+def _iter_document_offsets(tokenizer: _JsonStreamTokenizer) -> Iterator[int]:
+    """보관 파일의 각 문서 시작 위치를 순회
+
+    JSON Lines(문서가 줄마다 하나), 문서 배열, 단일 문서 JSON을 모두 지원합니다.
+    호출자는 위치를 받은 뒤 해당 문서를 끝까지 읽어야 합니다.
+    """
+    first = tokenizer.peek()
+    if first is None:
+        return
+    if first == ord('['):
+        tokenizer.next_byte()
+        if tokenizer.peek() == ord(']'):
+            return
+        while True:
+            tokenizer.peek()
+            yield tokenizer.offset
+            if tokenizer.next_byte() != ord(','):
+                return
+    else:
+        while tokenizer.peek() is not None:
+            yield tokenizer.offset
+
+
+def _index_meta_line(meta: Dict[str, Any]) -> bytes:
+    return dumps(meta).ljust(_META_LINE_SIZE - 1) + b"\n"
+
+
+@dataclass
+class ArchiveEntry:
+    """보관 파일 색인 항목 (문서 하나)"""
+    offset: int
+    filename: str
+    saved_at: Optional[str]
+    date: Optional[str]  # YYYY-MM-DD
+    total_pages: int
+    page_count: int
+
+
+class ArchivedPage(NamedTuple):
+    """보관 파일에서 읽은 페이지와 소속 문서 정보"""
+    filename: str
+    date: Optional[str]
+    page: DocumentPage
+
+
+class ArchiveReader:
+    """대용량 결과 보관 파일(JSON / JSON Lines) 점진적 로더
+
+    문서 위치 색인은 보관 파일 옆이 아니라 앱 데이터 디렉토리에 보관 파일 경로별로 저장하고,
+    보관 파일의 크기 / 수정 시각이 기록과 다르면 다시 만들거나 덧붙은 부분만 색인합니다.
+    """
+
+    def __init__(self, archive_path: str, chunk_size: int = 65536, index_dir: Optional[str] = None):
+        self.archive_path = archive_path
+        self.index_dir = index_dir or os.path.join(get_app_data_dir(), INDEX_DIR_NAME)
+        path_key = hashlib.sha256(os.path.abspath(archive_path).encode('utf-8')).hexdigest()[:16]
+        self.index_path = os.path.join(self.index_dir, f"{os.path.basename(archive_path)}.{path_key}{INDEX_SUFFIX}")
+        self.chunk_size = chunk_size
+
+    def _default_date(self) -> Optional[str]:
+        """문서에 saved_at이 없을 때 사용할 날짜 (보관 파일 이름 또는 수정 시각)"""
+        match = _FILENAME_DATE.search(os.path.basename(self.archive_path))
+        if match:
+            value = match.group(1)
+            return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+        mtime = os.path.getmtime(self.archive_path)
+        return datetime.date.fromtimestamp(mtime).isoformat()
+
+    def _scan_entries(self, start_offset: int = 0, end_offset: Optional[int] = None) -> Iterator[ArchiveEntry]:
+        """페이지를 파싱하지 않고 문서 단위 색인 항목 생성 (end_offset 이후에 시작하는 문서는 제외)"""
+        default_date = self._default_date()
+        with open(self.archive_path, 'rb') as f:
+            tokenizer = _JsonStreamTokenizer(f, start_offset, self.chunk_size)
+            for offset in _iter_document_offsets(tokenizer):
+                if end_offset is not None and offset >= end_offset:
+                    return
+                header: Dict[str, Any] = {}
+                page_count = sum(1 for _ in _iter_document(tokenizer, header, decode_pages=False))
+                saved_at = header.get("saved_at")
+                yield ArchiveEntry(
+                    offset=offset,
+                    filename=header.get("filename", ""),
+                    saved_at=saved_at,
+                    date=saved_at[:10] if saved_at else default_date,
+                    total_pages=header.get("total_pages", page_count),
+                    page_count=page_count
+                )
+
+    def _source_state(self) -> Tuple[int, int]:
+        """보관 파일의 (크기, 수정 시각 ns)"""
+        stat = os.stat(self.archive_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _source_tail(self, size: int) -> str:
+        """보관 파일 앞부분 size 바이트의 마지막 부분 (덧붙이기만 했는지 확인용)"""
+        with open(self.archive_path, 'rb') as f:
+            f.seek(max(0, size - _TAIL_SIZE))
+            return f.read(min(size, _TAIL_SIZE)).hex()
+
+    def build_index(self) -> int:
+        """색인 파일을 처음부터 다시 생성하고 문서 수 반환"""
+        return self._write_index(None)
+
+    def update_index(self) -> int:
+        """색인을 최신 상태로 갱신하고 새로 색인된 문서 수 반환
+
+        JSON Lines 보관 파일은 이전 색인 시점의 끝부분이 그대로면 덧붙은 부분만 읽고,
+        그 외에는 크기나 수정 시각이 바뀌면 다시 생성합니다.
+        """
+        meta = self._read_index_meta()
+        if meta is None:
+            return self.build_index()
+        size, mtime = self._source_state()
+        if meta["source_size"] == size and meta["source_mtime"] == mtime:
+            return 0
+        if (self.archive_path.lower().endswith('.jsonl') and size > meta["source_size"]
+                and self._source_tail(meta["source_size"]) == meta["source_tail"]):
+            return self._write_index(meta)
+        return self.build_index()
+
+    def _read_index_meta(self) -> Optional[Dict[str, Any]]:
+        """색인 메타 정보 (없거나, 형식이 다르거나, 기록 도중 중단된 색인이면 None)"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                meta = loads(f.readline())
+                index_size = os.fstat(f.fileno()).st_size
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("version") != INDEX_VERSION:
+            return None
+        if not all(isinstance(meta.get(key), int) for key in ("source_size", "source_mtime", "index_size")):
+            return None
+        if not isinstance(meta.get("source_tail"), str) or meta["index_size"] != index_size:
+            return None
+        return meta
+
+    def _write_index(self, previous: Optional[Dict[str, Any]]) -> int:
+        """색인 기록 (previous가 있으면 그 이후에 덧붙은 문서만 추가)"""
+        size, mtime = self._source_state()
+        count = 0
+        ensure_directory_exists(self.index_dir)
+        if previous is None:
+            # 중간에 실패해도 잘린 색인이 남지 않도록 임시 파일에 기록한 뒤 교체
+            path = f"{self.index_path}.{os.getpid()}.tmp"
+            f = open(path, 'wb')
+            f.write(_index_meta_line({}))
+            start_offset = 0
+        else:
+            path = self.index_path
+            f = open(path, 'r+b')
+            f.seek(previous["index_size"])
+            f.truncate()
+            start_offset = previous["source_size"]
+        try:
+            with f:
+                for entry in self._scan_entries(start_offset, size):
+                    f.write(dumps(asdict(entry)) + b"\n")
+                    count += 1
+                index_size = f.tell()
+                f.seek(0)
+                f.write(_index_meta_line({
+                    "version": INDEX_VERSION,
+                    "source_size": size,
+                    "source_mtime": mtime,
+                    "source_tail": self._source_tail(size),
+                    "index_size": index_size,
+                }))
+            if previous is None:
+                os.replace(path, self.index_path)
+        except BaseException:
+            if previous is None and os.path.exists(path):
+                os.remove(path)
+            raise
+        return count
+
+    def _read_entries(self) -> Optional[List[ArchiveEntry]]:
+        """색인 파일의 항목 목록 (항목이 손상되었으면 None)"""
+        meta = self._read_index_meta()
+        if meta is None:
+            return None
+        entries = []
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.readline()
+                for line in f:
+                    if line.strip():
+                        entries.append(ArchiveEntry(**loads(line)))
+        except (OSError, ValueError, TypeError):
+            return None
+        offsets = [entry.offset for entry in entries]
+        if offsets != sorted(set(offsets)) or (offsets and not 0 <= offsets[-1] < meta["source_size"]):
+            return None
+        return entries
+
+    def iter_index(self) -> Iterator[ArchiveEntry]:
+        """색인 항목 순회 (필요하면 먼저 색인 갱신, 색인을 저장할 수 없으면 보관 파일을 직접 훑음)"""
+        try:
+            self.update_index()
+            entries = self._read_entries()
+            if entries is None:
+                self.build_index()
+                entries = self._read_entries()
+        except OSError as e:
+            print(f"경고: 보관 파일 색인을 저장할 수 없어 색인 없이 읽습니다: {e}")
+            entries = None
+        if entries is None:
+            yield from self._scan_entries()
+            return
+        yield from entries
+
+    def find_entries(
+        self,
+        filename: Optional[str] = None,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None
+    ) -> Iterator[ArchiveEntry]:
+        """파일명 / 날짜 범위 조건에 맞는 색인 항목 검색"""
+        start = date_from.isoformat() if date_from else None
+        end = date_to.isoformat() if date_to else None
+        for entry in self.iter_index():
+            if filename is not None and entry.filename != filename:
+                continue
+            if start and (entry.date is None or entry.date < start):
+                continue
+            if end and (entry.date is None or entry.date > end):
+                continue
+            yield entry
+
+    def iter_pages(
+        self,
+        filename: Optional[str] = None,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None
+    ) -> Iterator[ArchivedPage]:
+        """페이지를 하나씩 읽어 반환 (조건이 있으면 색인으로 해당 문서 위치로 이동)"""
+        with open(self.archive_path, 'rb') as f:
+            if filename is None and date_from is None and date_to is None:
+                default_date = self._default_date()
+                tokenizer = _JsonStreamTokenizer(f, 0, self.chunk_size)
+                for _ in _iter_document_offsets(tokenizer):
+                    header: Dict[str, Any] = {}
+                    for page in _iter_document(tokenizer, header):
+                        saved_at = header.get("saved_at")
+                        yield ArchivedPage(header.get("filename", ""),
+                                           saved_at[:10] if saved_at else default_date, page)
+                return
+
+            for entry in self.find_entries(filename, date_from, date_to):
+                tokenizer = _JsonStreamTokenizer(f, entry.offset, self.chunk_size)
+                for page in _iter_document(tokenizer, {}):
+                    yield ArchivedPage(entry.filename, entry.date, page)
+
+    def iter_documents(
+        self,
+        filename: Optional[str] = None,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None
+    ) -> Iterator[ProcessedDocument]:
+        """문서를 하나씩 읽어 반환 (한 번에 문서 하나만 메모리에 유지)"""
+        if filename is None and date_from is None and date_to is None:
+            with open(self.archive_path, 'rb') as f:
+                tokenizer = _JsonStreamTokenizer(f, 0, self.chunk_size)
+                for _ in _iter_document_offsets(tokenizer):
+                    yield self._read_document(tokenizer)
+            return
+
+        yield from self.iter_documents_at(
+            entry.offset for entry in self.find_entries(filename, date_from, date_to)
+        )
+
+    def iter_documents_at(self, offsets: Iterable[int]) -> Iterator[ProcessedDocument]:
+        """색인에 기록된 위치(offset)의 문서들을 읽어 반환"""
+        with open(self.archive_path, 'rb') as f:
+            for offset in offsets:
+                yield self._read_document(_JsonStreamTokenizer(f, offset, self.chunk_size))
+
+    @staticmethod
+    def _read_document(tokenizer: _JsonStreamTokenizer) -> ProcessedDocument:
+        header: Dict[str, Any] = {}
+        pages = list(_iter_document(tokenizer, header))
+        header["pages"] = []
+        document = ProcessedDocument.from_dict(header)
+        document.set_pages(pages)
+        return document
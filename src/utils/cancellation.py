@@ -0,0 +1,55 @@
+import threading
+from typing import Callable, List, Optional
+
+
+class OperationCancelled(Exception):
+    """사용자가 작업을 취소함"""
+
+
+class CancellationToken:
+    """작업 취소 요청 (처리 단계 사이와 페이지 대기 중에 확인)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled("작업이 취소되었습니다.")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """취소되거나 timeout이 지날 때까지 대기 (취소되었으면 True)"""
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """취소될 때 호출할 함수 등록 (이미 취소되었으면 바로 호출), 등록 해제 함수 반환"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        self._run(callback)
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            print(f"경고: 취소 처리 중 오류: {e}")
@@ -0,0 +1,316 @@
+import csv
+import math
+import os
+import re
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from ..models.document import ProcessedDocument
+from .archive_reader import ArchiveReader
+
+# Parquet 내보내기를 위한 선택적 라이브러리
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# 내보내기 열 (원본 파일명, 페이지, 품번, 수량)
+EXPORT_COLUMNS = ["파일명", "페이지", "품번", "수량"]
+
+ExportRow = Tuple[Any, ...]
+
+# XML 1.0에서 허용하지 않는 문자 (탭 / 줄바꿈 제외 제어 문자, 대리 쌍 조각, U+FFFE / U+FFFF)
+_XML_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+def iter_item_rows(documents: Iterable[ProcessedDocument]) -> Iterator[ExportRow]:
+    """여러 문서의 주문 항목을 한 행씩 순회"""
+    for document in documents:
+        for page in document.pages:
+            for item in page.items:
+                yield (document.filename, page.page_number, item.product_code, item.quantity)
+
+
+def iter_documents_from_files(file_paths: Iterable[str]) -> Iterator[ProcessedDocument]:
+    """저장된 JSON / JSON Lines 결과 파일들에서 문서를 하나씩 불러오기"""
+    for file_path in file_paths:
+        yield from ArchiveReader(file_path).iter_documents()
+
+
+class BaseExporter(ABC):
+    """행 단위 스트리밍 내보내기 기본 클래스"""
+
+    extension = ""
+
+    def __init__(self, output_path: str, columns: Optional[List[str]] = None):
+        self.output_path = output_path
+        self.columns = columns or EXPORT_COLUMNS
+        self.row_count = 0
+
+    @abstractmethod
+    def open(self) -> None:
+        """출력 파일 열기 (머리글 기록)"""
+
+    @abstractmethod
+    def write_row(self, row: ExportRow) -> None:
+        """행 하나 기록"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """출력 파일 닫기"""
+
+    def abort(self) -> None:
+        """기록 중 오류가 났을 때 출력 정리 (기본은 그대로 닫음)"""
+        self.close()
+
+    def write_rows(self, rows: Iterable[ExportRow]) -> int:
+        """행들을 기록하고 기록된 행 수 반환"""
+        for row in rows:
+            self.write_row(row)
+        return self.row_count
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class CSVExporter(BaseExporter):
+    """CSV 내보내기 (엑셀 한글 호환을 위해 UTF-8 BOM 사용)"""
+
+    extension = ".csv"
+
+    def open(self) -> None:
+        self._file = open(self.output_path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_row(self, row: ExportRow) -> None:
+        self._writer.writerow(row)
+        self.row_count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XLSXExporter(BaseExporter):
+    """XLSX 내보내기 (시트 XML을 zip에 직접 스트리밍, 임시 파일에 기록한 뒤 완료되면 교체)"""
+
+    extension = ".xlsx"
+    # 엑셀 시트당 최대 행 수 (헤더 제외)
+    MAX_ROWS_PER_SHEET = 1048575
+
+    def open(self) -> None:
+        # 중간에 실패해도 잘린 파일이 정상 파일처럼 남지 않도록 임시 파일에 기록
+        self._temp_path = f"{self.output_path}.{os.getpid()}.tmp"
+        self._zip = zipfile.ZipFile(self._temp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._sheet = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+    def _start_sheet(self) -> None:
+        """새 워크시트 시작"""
+        self._sheet_count += 1
+        self._sheet = self._zip.open(f'xl/worksheets/sheet{self._sheet_count}.xml', 'w', force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            b'<sheetData>'
+        )
+        self._sheet_rows = 0
+        self._write_cells(self.columns)
+
+    def _end_sheet(self) -> None:
+        """현재 워크시트 마무리"""
+        self._sheet.write(b'</sheetData></worksheet>')
+        self._sheet.close()
+        self._sheet = None
+
+    def _write_cells(self, values) -> None:
+        cells = []
+        for value in values:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                # NaN / 무한대는 엑셀 숫자로 쓸 수 없으므로 빈 셀
+                cells.append(f'<c><v>{value}</v></c>' if math.isfinite(value) else '<c/>')
+            elif value is None:
+                cells.append('<c/>')
+            else:
+                text = _XML_ILLEGAL_CHARS.sub('', str(value))
+                cells.append(f'<c t="inlineStr"><is><t>{escape(text)}</t></is></c>')
+        self._sheet.write(f'<row>{"".join(cells)}</row>'.encode('utf-8'))
+
+    def write_row(self, row: ExportRow) -> None:
+        if self._sheet is None or self._sheet_rows >= self.MAX_ROWS_PER_SHEET:
+            if self._sheet is not None:
+                self._end_sheet()
+            self._start_sheet()
+        self._write_cells(row)
+        self._sheet_rows += 1
+        self.row_count += 1
+
+    def close(self) -> None:
+        if self._sheet is None and self._sheet_count == 0:
+            self._start_sheet()
+        if self._sheet is not None:
+            self._end_sheet()
+
+        sheet_ids = range(1, self._sheet_count + 1)
+        content_types = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in sheet_ids
+        )
+        sheets = ''.join(
+            f'<sheet name="주문항목{"" if i == 1 else i}" sheetId="{i}" r:id="rId{i}"/>'
+            for i in sheet_ids
+        )
+        relationships = ''.join(
+            f'<Relationship Id="rId{i}" '
+            f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in sheet_ids
+        )
+
+        self._zip.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{content_types}</Types>'
+        ))
+        self._zip.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        self._zip.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>'
+        ))
+        self._zip.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relationships}</Relationships>'
+        ))
+        self._zip.close()
+        os.replace(self._temp_path, self.output_path)
+
+    def abort(self) -> None:
+        """임시 파일을 지우고 기존 출력 파일은 그대로 둠"""
+        try:
+            if self._sheet is not None:
+                self._sheet.close()
+            self._zip.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+
+class ParquetExporter(BaseExporter):
+    """Parquet 내보내기 (pyarrow 필요, 일정 행 단위로 row group 기록)"""
+
+    extension = ".parquet"
+    BATCH_SIZE = 65536
+
+    def open(self) -> None:
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError(
+                "Parquet 내보내기를 위한 라이브러리가 설치되지 않았습니다.\n"
+                "pyarrow 설치: pip install pyarrow"
+            )
+        self._schema = None
+        self._writer = None
+        self._batch: List[List] = [[] for _ in self.columns]
+
+    def _flush(self) -> None:
+        if not self._batch[0]:
+            return
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(self._batch, self._schema)],
+            schema=self._schema
+        )
+        self._writer.write_table(table)
+        self._batch = [[] for _ in self.columns]
+
+    def write_row(self, row: ExportRow) -> None:
+        if self._schema is None:
+            # 첫 행의 값 형식으로 스키마 결정 (정수 열은 int64, 나머지는 문자열)
+            self._schema = pa.schema([
+                (name, pa.int64() if isinstance(value, int) else pa.string())
+                for name, value in zip(self.columns, row)
+            ])
+            self._writer = pq.ParquetWriter(self.output_path, self._schema)
+        for column, value in zip(self._batch, row):
+            column.append(value)
+        self.row_count += 1
+        if len(self._batch[0]) >= self.BATCH_SIZE:
+            self._flush()
+
+    def close(self) -> None:
+        if self._writer is None:
+            # 행이 없으면 문자열 열로 빈 파일 생성
+            self._schema = pa.schema([(name, pa.string()) for name in self.columns])
+            self._writer = pq.ParquetWriter(self.output_path, self._schema)
+        self._flush()
+        self._writer.close()
+
+
+EXPORTERS = {
+    "csv": CSVExporter,
+    "xlsx": XLSXExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def get_exporter(
+    output_path: str,
+    fmt: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> BaseExporter:
+    """출력 경로의 확장자(또는 지정 형식)에 맞는 내보내기 객체 생성"""
+    if fmt is None:
+        fmt = os.path.splitext(output_path)[1].lower().lstrip('.')
+    exporter_class = EXPORTERS.get(fmt.lower())
+    if exporter_class is None:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt} (지원: {', '.join(EXPORTERS)})")
+    return exporter_class(output_path, columns)
+
+
+def export_documents(
+    documents: Iterable[ProcessedDocument],
+    output_path: str,
+    fmt: Optional[str] = None
+) -> int:
+    """여러 문서의 주문 항목을 하나의 파일로 내보내고 행 수 반환"""
+    with get_exporter(output_path, fmt) as exporter:
+        return exporter.write_rows(iter_item_rows(documents))
+
+
+def export_rows(
+    rows: Iterable[tuple],
+    output_path: str,
+    columns: List[str],
+    fmt: Optional[str] = None
+) -> int:
+    """임의의 열 구성으로 행들을 내보내고 행 수 반환"""
+    with get_exporter(output_path, fmt, columns) as exporter:
+        return exporter.write_rows(rows)
@@ -1,7 +1,7 @@
 import os
-import json
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
+from .serialization import dumps, loads
 
 
 def is_pdf_file(file_path: str) -> bool:
@@ -16,24 +16,62 @@ def is_image_file(file_path: str) -> bool:
     return ext in image_extensions
 
 
-def save_json_result(data: Dict[str, Any], original_file_path: str) -> str:
+def save_json_result(
+    data: Dict[str, Any],
+    original_file_path: str,
+    output_dir: Optional[str] = None
+) -> str:
     """OCR 결과를 JSON 파일로 저장"""
     # 파일 이름 생성 (원본 문서 이름 + 타임스탬프)
     doc_name = os.path.basename(original_file_path).split('.')[0]
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = f"{doc_name}_ocr_{timestamp}.json"
+    if output_dir:
+        ensure_directory_exists(output_dir)
+        output_file = os.path.join(output_dir, output_file)
     
     # JSON 파일로 저장
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(dumps(data, pretty=True))
     
     return output_file
 
 
 def load_json_result(file_path: str) -> Dict[str, Any]:
     """JSON 파일에서 OCR 결과 불러오기"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
+
+
+def get_jsonl_result_path(output_dir: Optional[str] = None, date: Optional[datetime.date] = None) -> str:
+    """날짜별 JSON Lines 결과 파일 경로"""
+    date = date or datetime.date.today()
+    return os.path.join(output_dir or ".", f"ocr_results_{date.strftime('%Y%m%d')}.jsonl")
+
+
+def append_jsonl_result(data: Dict[str, Any], output_dir: Optional[str] = None) -> str:
+    """OCR 결과를 날짜별 JSON Lines 파일에 한 줄로 추가"""
+    if output_dir:
+        ensure_directory_exists(output_dir)
+    output_file = get_jsonl_result_path(output_dir)
+    
+    record = dict(data)
+    record["saved_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+    
+    # 한 번의 write로 기록해 동시 추가 시에도 줄이 섞이지 않도록 함
+    with open(output_file, 'ab') as f:
+        f.write(dumps(record) + b"\n")
+    
+    return output_file
+
+
+def iter_jsonl_results(file_path: str) -> Iterator[Dict[str, Any]]:
+    """JSON Lines 결과 파일을 한 줄(문서)씩 읽기"""
+    with open(file_path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield loads(line)
 
 
 def get_file_size_mb(file_path: str) -> float:
@@ -45,4 +83,13 @@ def get_file_size_mb(file_path: str) -> float:
 def ensure_directory_exists(dir_path: str) -> None:
     """디렉토리가 존재하지 않으면 생성"""
     if not os.path.exists(dir_path):
-        os.makedirs(dir_path, exist_ok=True)
\ No newline at end of file
+        os.makedirs(dir_path, exist_ok=True)
+
+
+def get_app_data_dir() -> str:
+    """앱 데이터 디렉토리 (DKLOK_DATA_DIR 환경 변수로 변경 가능)"""
+    data_dir = os.environ.get("DKLOK_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".dklok_order_sheet_tool"
+    )
+    ensure_directory_exists(data_dir)
+    return data_dir
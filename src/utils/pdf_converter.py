@@ -1,10 +1,17 @@
 import os
+import time
 import tempfile
-from typing import Tuple, List
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Tuple, List, Optional
+
+from .cancellation import CancellationToken
+from .file_utils import is_pdf_file
 
 # PDF 처리를 위한 대안 라이브러리들
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
@@ -21,11 +28,156 @@ try:
 except ImportError:
     PYPDF2_AVAILABLE = False
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# pdf2image가 Poppler를 찾지 못했을 때 안내
+POPPLER_HELP = (
+    "Poppler가 설치되지 않았거나 PATH에 등록되지 않았습니다.\n"
+    "해결 방법:\n"
+    "1. Windows: conda install -c conda-forge poppler\n"
+    "2. macOS: brew install poppler\n"
+    "3. Linux: sudo apt-get install poppler-utils\n"
+    "또는 PyMuPDF 사용을 권장합니다: pip install PyMuPDF"
+)
+
+
+@dataclass
+class PageProbe:
+    """렌더링하지 않고 읽은 페이지 정보"""
+    page_number: int
+    width: float                  # 포인트 (1/72인치)
+    height: float
+    has_text: Optional[bool] = None  # 텍스트 레이어 여부 (알 수 없으면 None)
+
+    def render_size(self, dpi: int) -> Tuple[int, int]:
+        """지정 DPI로 렌더링했을 때의 픽셀 크기"""
+        return int(round(self.width * dpi / 72)), int(round(self.height * dpi / 72))
+
+
+@dataclass
+class DocumentProbe:
+    """문서 구조만 읽은 사전 정보 (페이지 수, 크기, 텍스트 레이어, 예상 렌더링 크기)"""
+    path: str
+    document_type: str            # "PDF" 또는 "IMAGE"
+    dpi: int
+    pages: List[PageProbe] = field(default_factory=list)
+    encrypted: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def text_pages(self) -> int:
+        """텍스트 레이어가 있는 페이지 수"""
+        return sum(1 for page in self.pages if page.has_text)
+
+    @property
+    def render_megapixels(self) -> float:
+        """전체 페이지를 렌더링했을 때의 픽셀 수 (백만 단위, 렌더링 비용 추정용)"""
+        total = 0
+        for page in self.pages:
+            width, height = page.render_size(self.dpi)
+            total += width * height
+        return total / 1_000_000
+
+    def to_dict(self) -> dict:
+        """딕셔너리로 변환"""
+        return {
+            "path": self.path,
+            "document_type": self.document_type,
+            "page_count": self.page_count,
+            "text_pages": self.text_pages,
+            "encrypted": self.encrypted,
+            "dpi": self.dpi,
+            "render_megapixels": round(self.render_megapixels, 2),
+            "page_sizes": [[round(page.width, 1), round(page.height, 1)] for page in self.pages],
+            "elapsed_ms": round(self.elapsed_ms, 2)
+        }
+
+
+def _probe_pdf_pages(pdf_path: str) -> Tuple[List[PageProbe], bool]:
+    """PDF 페이지 크기 / 텍스트 레이어 여부 (콘텐츠는 해석하지 않음)"""
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(pdf_path) as doc:
+            pages = [
+                PageProbe(number, page.rect.width, page.rect.height, bool(page.get_fonts()))
+                for number, page in enumerate(doc, 1)
+            ]
+            return pages, bool(doc.needs_pass)
+    if PYPDF2_AVAILABLE:
+        with open(pdf_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            pages = []
+            for number, page in enumerate(reader.pages, 1):
+                box = page.mediabox
+                resources = page.get("/Resources")
+                resources = resources.get_object() if resources is not None else {}
+                pages.append(PageProbe(number, float(box.width), float(box.height), "/Font" in resources))
+            return pages, reader.is_encrypted
+    if PDF2IMAGE_AVAILABLE:
+        # pdfinfo는 첫 페이지 크기만 알려 주므로 모든 페이지에 사용
+        info = pdfinfo_from_path(pdf_path)
+        width, height = (float(value) for value in info.get("Page size", "612 x 792").split()[0:3:2])
+        return [PageProbe(number, width, height) for number in range(1, info["Pages"] + 1)], \
+            info.get("Encrypted", "no").startswith("yes")
+    raise RuntimeError("PDF 정보를 읽을 수 있는 라이브러리가 없습니다.")
+
+
+def _probe_image_pages(image_path: str) -> List[PageProbe]:
+    """이미지 헤더만 읽어 페이지(프레임) 크기 확인"""
+    if not PIL_AVAILABLE:
+        raise RuntimeError("이미지 정보를 읽으려면 Pillow가 필요합니다.")
+    with Image.open(image_path) as image:
+        # 이미지는 렌더링하지 않으므로 픽셀 크기를 72 DPI 기준 포인트로 사용
+        frames = getattr(image, "n_frames", 1)
+        return [PageProbe(number, image.width, image.height, False) for number in range(1, frames + 1)]
+
+
+def probe_document(path: str, dpi: int = 300) -> DocumentProbe:
+    """문서를 렌더링하지 않고 페이지 수 / 크기 / 텍스트 레이어 여부 확인"""
+    start = time.perf_counter()
+    if is_pdf_file(path):
+        pages, encrypted = _probe_pdf_pages(path)
+        probe = DocumentProbe(path, "PDF", dpi, pages, encrypted)
+    else:
+        pages = _probe_image_pages(path)
+        probe = DocumentProbe(path, "IMAGE", 72, pages)
+    probe.elapsed_ms = (time.perf_counter() - start) * 1000
+    return probe
+
+
+def page_ranges(page_count: int, chunk_pages: int) -> List[Tuple[int, int]]:
+    """페이지를 chunk_pages개씩 나눈 [시작, 끝) 범위 목록 (0부터 시작)"""
+    chunk_pages = max(1, chunk_pages)
+    return [(start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages)]
+
+
+def _render_pymupdf_pages(pdf_path: str, output_folder: str, start: int, end: int, dpi: int) -> List[str]:
+    """페이지 범위를 PNG로 렌더링 (프로세스마다 문서를 따로 열어야 하므로 모듈 함수)"""
+    image_paths = []
+    mat = fitz.Matrix(dpi/72, dpi/72)
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(start, end):
+            pix = doc.load_page(page_num).get_pixmap(matrix=mat)
+            image_path = os.path.join(output_folder, f'page_{page_num+1}.png')
+            pix.save(image_path)
+            image_paths.append(image_path)
+    return image_paths
+
 
 class PDFConverter:
     """PDF를 이미지로 변환하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, dpi: int = 300, render_workers: int = 0, chunk_pages: int = 8):
+        self.dpi = dpi
+        self.render_workers = render_workers or os.cpu_count() or 1  # PyMuPDF 렌더링 프로세스 수 (0이면 CPU 수)
+        self.chunk_pages = chunk_pages  # 작업자 하나가 한 번에 렌더링할 페이지 수
         self.available_backend = self._check_available_backend()
         if not self.available_backend:
             raise RuntimeError(
@@ -44,68 +196,119 @@ class PDFConverter:
         else:
             return ""
     
-    def convert_to_images(self, pdf_path: str, output_folder: str = None) -> Tuple[List[str], int]:
-        """PDF를 이미지로 변환"""
+    def convert_to_images(
+        self,
+        pdf_path: str,
+        output_folder: str = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Tuple[List[str], int]:
+        """PDF를 이미지로 변환 (취소되면 페이지 사이에서 OperationCancelled)"""
         if output_folder is None:
             output_folder = tempfile.mkdtemp()
         
         if self.available_backend == "pymupdf":
-            return self._convert_with_pymupdf(pdf_path, output_folder)
+            images = self.iter_pymupdf_images(pdf_path, output_folder)
         elif self.available_backend == "pdf2image":
-            return self._convert_with_pdf2image(pdf_path, output_folder)
+            images = self.iter_pdf2image_images(pdf_path, output_folder)
         else:
             raise RuntimeError("사용 가능한 PDF 처리 백엔드가 없습니다.")
-    
-    def _convert_with_pymupdf(self, pdf_path: str, output_folder: str) -> Tuple[List[str], int]:
-        """PyMuPDF를 사용하여 PDF를 이미지로 변환"""
-        doc = fitz.open(pdf_path)
         image_paths = []
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            # 높은 해상도로 렌더링 (300 DPI)
-            mat = fitz.Matrix(300/72, 300/72)
-            pix = page.get_pixmap(matrix=mat)
-            
-            image_path = os.path.join(output_folder, f'page_{page_num+1}.png')
-            pix.save(image_path)
-            image_paths.append(image_path)
-        
-        num_pages = len(doc)
-        doc.close()
-        return image_paths, num_pages
+        try:
+            for image_path in images:
+                image_paths.append(image_path)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+        except Exception as e:
+            if self.available_backend == "pdf2image" and "poppler" in str(e).lower():
+                raise RuntimeError(POPPLER_HELP) from e
+            raise
+        finally:
+            images.close()
+        return image_paths, len(image_paths)
+    
+    def render_pages(self, pdf_path: str, page_numbers: List[int], output_folder: str) -> Dict[int, str]:
+        """지정한 페이지만 렌더링 (페이지 번호는 1부터, 실패한 페이지 재처리용)"""
+        image_paths = {}
+        for page_num in sorted(set(page_numbers)):
+            if self.available_backend == "pymupdf":
+                paths = _render_pymupdf_pages(pdf_path, output_folder, page_num - 1, page_num, self.dpi)
+                image_paths[page_num] = paths[0]
+                continue
+            paths = convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                first_page=page_num,
+                last_page=page_num,
+                fmt="jpeg",
+                output_folder=output_folder,
+                output_file=f"retry_{page_num}",
+                paths_only=True
+            )
+            image_paths[page_num] = os.path.join(output_folder, f'page_{page_num}.jpg')
+            os.replace(paths[0], image_paths[page_num])
+        return image_paths
     
-    def _convert_with_pdf2image(self, pdf_path: str, output_folder: str) -> Tuple[List[str], int]:
-        """pdf2image를 사용하여 PDF를 이미지로 변환"""
+    def probe(self, path: str) -> DocumentProbe:
+        """렌더링 없이 문서 구조만 읽은 사전 정보 (PDF / 이미지)"""
+        return probe_document(path, self.dpi)
+    
+    def extract_page_texts(self, pdf_path: str) -> List[Optional[str]]:
+        """페이지별 텍스트 레이어 추출 (추출할 수 없으면 빈 목록)"""
         try:
-            # PDF 페이지 수 확인
+            if PYMUPDF_AVAILABLE:
+                with fitz.open(pdf_path) as doc:
+                    return [page.get_text() for page in doc]
             if PYPDF2_AVAILABLE:
                 with open(pdf_path, 'rb') as f:
                     pdf_reader = PyPDF2.PdfReader(f)
-                    num_pages = len(pdf_reader.pages)
-            else:
-                num_pages = 1  # 기본값
-            
-            # PDF를 이미지로 변환
-            images = convert_from_path(pdf_path, dpi=300)
-            image_paths = []
-            
-            for i, image in enumerate(images):
-                image_path = os.path.join(output_folder, f'page_{i+1}.jpg')
-                image.save(image_path, 'JPEG')
-                image_paths.append(image_path)
-            
-            return image_paths, len(images)
-            
+                    return [page.extract_text() for page in pdf_reader.pages]
         except Exception as e:
-            if "poppler" in str(e).lower():
-                raise RuntimeError(
-                    "Poppler가 설치되지 않았거나 PATH에 등록되지 않았습니다.\n"
-                    "해결 방법:\n"
-                    "1. Windows: conda install -c conda-forge poppler\n"
-                    "2. macOS: brew install poppler\n"
-                    "3. Linux: sudo apt-get install poppler-utils\n"
-                    "또는 PyMuPDF 사용을 권장합니다: pip install PyMuPDF"
-                )
-            else:
-                raise e
\ No newline at end of file
+            print(f"경고: 텍스트 레이어 추출 실패: {e}")
+        return []
+    
+    def iter_pymupdf_images(self, pdf_path: str, output_folder: str) -> Iterator[str]:
+        """PyMuPDF로 렌더링한 페이지 이미지 경로를 페이지 순서대로 반환 (여러 페이지면 작업자 프로세스로 나눠 렌더링)"""
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+        ranges = page_ranges(page_count, self.chunk_pages)
+        workers = min(self.render_workers, len(ranges))
+        if workers <= 1:
+            for start, end in ranges:
+                yield from _render_pymupdf_pages(pdf_path, output_folder, start, end, self.dpi)
+            return
+        
+        # PyMuPDF 문서는 스레드 간에 공유할 수 없어 프로세스마다 따로 열어 렌더링
+        # (GUI 스레드와 함께 fork하지 않도록 spawn 사용)
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        try:
+            chunks = executor.map(
+                _render_pymupdf_pages,
+                *zip(*[(pdf_path, output_folder, start, end, self.dpi) for start, end in ranges])
+            )
+            for image_paths in chunks:
+                yield from image_paths
+        finally:
+            # 중간에 멈추면(취소) 아직 시작하지 않은 범위는 렌더링하지 않음
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_pdf2image_images(self, pdf_path: str, output_folder: str) -> Iterator[str]:
+        """pdf2image로 페이지 범위씩 파일에 바로 렌더링 (메모리에 페이지 이미지를 모아 두지 않음)"""
+        page_count = pdfinfo_from_path(pdf_path)["Pages"]
+        for start, end in page_ranges(page_count, self.chunk_pages):
+            paths = convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                first_page=start + 1,
+                last_page=end,
+                fmt="jpeg",
+                output_folder=output_folder,
+                output_file=f"chunk_{start + 1}",
+                paths_only=True,
+                thread_count=max(1, min(self.render_workers, end - start))
+            )
+            # pdftoppm 출력 파일명(chunk_N-NN.jpg)을 PyMuPDF와 같은 page_N 형식으로 변경
+            for page_num, path in enumerate(sorted(paths), start + 1):
+                image_path = os.path.join(output_folder, f'page_{page_num}.jpg')
+                os.replace(path, image_path)
+                yield image_path
@@ -0,0 +1,30 @@
+import json
+from typing import Any, Union
+
+# 빠른 JSON 처리를 위한 선택적 라이브러리
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def get_json_backend() -> str:
+    """사용 중인 JSON 백엔드 이름"""
+    return "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """데이터를 UTF-8 JSON 바이트로 직렬화 (pretty=False면 한 줄 압축 형식)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """JSON 바이트/문자열을 파싱"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,56 @@
+import pytest
+
+from src.core import aggregation
+from src.core.aggregation import CONSOLIDATED_COLUMNS, aggregate_documents, iter_consolidated_rows
+from src.models.document import DocumentPage, ProcessedDocument
+from src.models.order_item import OrderItem
+from src.utils.exporters import export_rows
+
+
+def _make_documents():
+    first = ProcessedDocument("a.pdf", "PDF", 2, [
+        DocumentPage(1, [OrderItem("DMCA-8N-SA", 2), OrderItem("dmca–8n-sa", 3)], {}),
+        DocumentPage(2, [OrderItem("DMCA-8N-SA", 1), OrderItem("PART-OO1", 4, matched_code="PART-001")], {}),
+    ])
+    second = ProcessedDocument("b.pdf", "PDF", 1, [
+        DocumentPage(3, [OrderItem("PART-001", 1), OrderItem("DMCA-8N-SA", 5)], {}),
+    ])
+    return [first, second]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def backend(request, monkeypatch):
+    """numpy / 순수 파이썬 경로 모두 테스트"""
+    if request.param and not aggregation.NUMPY_AVAILABLE:
+        pytest.skip("numpy 미설치")
+    monkeypatch.setattr(aggregation, "NUMPY_AVAILABLE", request.param)
+
+
+def test_aggregate_documents(backend):
+    """여러 페이지·문서의 같은 품번 통합 테스트"""
+    rows = list(iter_consolidated_rows(aggregate_documents(_make_documents())))
+    assert rows == [
+        ("DMCA-8N-SA", 11, 4, "a.pdf(p.1,2); b.pdf(p.3)"),
+        ("PART-001", 5, 2, "a.pdf(p.2); b.pdf(p.3)"),
+    ]
+
+
+def test_aggregate_without_catalog(backend):
+    """카탈로그 매칭 품번을 사용하지 않는 통합 테스트"""
+    codes = [item.product_code for item in aggregate_documents(_make_documents(), use_catalog=False)]
+    assert codes == ["DMCA-8N-SA", "PART-OO1", "PART-001"]
+
+
+def test_aggregate_empty(backend):
+    """빈 입력 통합 테스트"""
+    assert aggregate_documents([]) == []
+
+
+def test_export_consolidated(tmp_path):
+    """통합 결과 CSV 내보내기 테스트"""
+    path = tmp_path / "consolidated.csv"
+    items = aggregate_documents(_make_documents())
+    assert export_rows(iter_consolidated_rows(items), str(path), CONSOLIDATED_COLUMNS) == 2
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    assert lines[0] == "품번,합계 수량,건수,출처"
+    assert lines[1] == 'DMCA-8N-SA,11,4,"a.pdf(p.1,2); b.pdf(p.3)"'
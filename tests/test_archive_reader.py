@@ -0,0 +1,105 @@
+import datetime
+import json
+import os
+from src.utils.archive_reader import ArchiveReader
+from src.utils.file_utils import append_jsonl_result
+
+
+def make_document(filename, pages=2):
+    """테스트용 문서 딕셔너리 생성"""
+    return {
+        "document_type": "PDF",
+        "total_pages": pages,
+        "filename": filename,
+        "pages": [
+            {"page": n, "content": [{"품번": f"P-{n}\"]}}", "수량": n}], "raw_content": {}}
+            for n in range(1, pages + 1)
+        ],
+        "processing_cost": 0.01
+    }
+
+
+def test_iter_pages_from_jsonl(tmp_path):
+    """JSON Lines 보관 파일에서 페이지를 순서대로 읽기 (작은 버퍼 사용)"""
+    for name in ("a.pdf", "b.pdf"):
+        archive = append_jsonl_result(make_document(name), str(tmp_path))
+
+    pages = list(ArchiveReader(archive, chunk_size=8, index_dir=str(tmp_path / "index")).iter_pages())
+    assert [(p.filename, p.page.page_number) for p in pages] == [
+        ("a.pdf", 1), ("a.pdf", 2), ("b.pdf", 1), ("b.pdf", 2)
+    ]
+    assert pages[1].page.items[0].product_code == 'P-2"]}'
+
+
+def test_index_seek_and_update(tmp_path):
+    """색인으로 파일명 / 날짜 범위 검색 및 추가분 색인 갱신"""
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        archive = append_jsonl_result(make_document(name), str(tmp_path))
+    reader = ArchiveReader(archive, index_dir=str(tmp_path / "index"))
+
+    assert reader.build_index() == 3
+    documents = list(reader.iter_documents(filename="b.pdf"))
+    assert [d.filename for d in documents] == ["b.pdf"]
+    assert documents[0].total_items == 2
+
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    assert list(reader.iter_pages(date_from=tomorrow)) == []
+
+    append_jsonl_result(make_document("d.pdf", pages=1), str(tmp_path))
+    assert reader.update_index() == 1
+    assert [e.filename for e in reader.iter_index()] == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+
+
+def test_pretty_json_archive(tmp_path):
+    """기존 들여쓰기 JSON 결과 파일 읽기 (파일명 날짜 사용)"""
+    path = tmp_path / "order_ocr_20240105_120000.json"
+    path.write_text(json.dumps(make_document("order.pdf"), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    reader = ArchiveReader(str(path), chunk_size=16, index_dir=str(tmp_path / "index"))
+    document = next(reader.iter_documents())
+    assert document.filename == "order.pdf"
+    assert document.processing_cost == 0.01
+    assert [e.date for e in reader.iter_index()] == ["2024-01-05"]
+
+
+def test_index_kept_out_of_archive_directory(tmp_path):
+    """색인은 보관 파일 옆이 아니라 색인 디렉토리에 경로별로 저장되는지 테스트"""
+    archive_dir = tmp_path / "results"
+    archive = append_jsonl_result(make_document("a.pdf"), str(archive_dir))
+    reader = ArchiveReader(archive, index_dir=str(tmp_path / "index"))
+    assert [e.filename for e in reader.iter_index()] == ["a.pdf"]
+    assert [p.name for p in archive_dir.iterdir()] == [os.path.basename(archive)]
+    assert os.path.dirname(reader.index_path) == str(tmp_path / "index")
+    assert ArchiveReader(str(tmp_path / "other" / os.path.basename(archive)),
+                         index_dir=str(tmp_path / "index")).index_path != reader.index_path
+
+
+def test_damaged_or_stale_index_is_rebuilt(tmp_path):
+    """손상된 색인이나 같은 크기로 바뀐 보관 파일은 색인을 다시 만드는지 테스트"""
+    archive = append_jsonl_result(make_document("a.pdf"), str(tmp_path))
+    reader = ArchiveReader(archive, index_dir=str(tmp_path / "index"))
+    reader.build_index()
+
+    with open(reader.index_path, 'ab') as f:
+        f.write(b'{"offset": "broken"\n')
+    assert [e.filename for e in reader.iter_index()] == ["a.pdf"]
+
+    with open(archive, 'r+b') as f:
+        content = f.read()
+        f.seek(0)
+        f.write(content.replace(b'"a.pdf"', b'"z.pdf"'))
+    stat = os.stat(archive)
+    os.utime(archive, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert [e.filename for e in reader.iter_index()] == ["z.pdf"]
+
+
+def test_unwritable_index_dir_falls_back_to_scan(tmp_path, capsys):
+    """색인을 저장할 수 없어도 경고만 출력하고 보관 파일을 직접 읽는지 테스트"""
+    for name in ("a.pdf", "b.pdf"):
+        archive = append_jsonl_result(make_document(name), str(tmp_path))
+    blocked = tmp_path / "blocked"
+    blocked.write_text("not a directory")
+    reader = ArchiveReader(archive, index_dir=str(blocked))
+    documents = list(reader.iter_documents(filename="b.pdf"))
+    assert [d.filename for d in documents] == ["b.pdf"]
+    assert "경고: 보관 파일 색인을 저장할 수 없어" in capsys.readouterr().out
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.core import backends as backends_module
+from src.core.backends import (CAP_CACHEABLE, CAP_IMAGE, BackendRegistry, BackendScheduler, CacheBackend,
+                               OCRBackend, OCRCache, ReplayBackend, TextLayerBackend, create_backend, registry)
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+from src.utils.file_utils import append_jsonl_result
+
+
+class FakeVisionBackend(OCRBackend):
+    """호출 횟수와 최대 동시 처리 수를 기록하는 테스트용 백엔드"""
+    name = "fake"
+    capabilities = frozenset({CAP_IMAGE, CAP_CACHEABLE})
+    max_concurrency = 2
+
+    def __init__(self, cost=0.01, delay=0.0):
+        super().__init__()
+        self.cost = cost
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._counter_lock = threading.Lock()
+
+    def estimate_cost(self, page):
+        return self.cost
+
+    def process_page(self, page):
+        with self._counter_lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._counter_lock:
+            self.active -= 1
+        return OCRResult([OrderItem(f"P-{page.page_number}", page.page_number)], self.cost)
+
+
+def _image(tmp_path, name="page.png", content=b"image-bytes"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_registry_entry_points(monkeypatch):
+    """entry point 백엔드 등록 및 알 수 없는 백엔드 오류 테스트"""
+    class FakeEntryPoint:
+        name = "third_party"
+
+        def load(self):
+            return FakeVisionBackend
+
+    monkeypatch.setattr(backends_module, "entry_points", lambda group: [FakeEntryPoint()])
+    local_registry = BackendRegistry()
+    assert isinstance(local_registry.create("third_party"), FakeVisionBackend)
+    with pytest.raises(ValueError):
+        local_registry.create("missing")
+    assert {"mock", "openai", "cache", "replay", "text_layer"} <= set(registry.names())
+
+
+def test_scheduler_prefers_cheaper_backend(tmp_path):
+    """비용이 낮은 백엔드 우선 선택 및 캐시 저장 테스트"""
+    cheap, expensive = FakeVisionBackend(cost=0.001), FakeVisionBackend(cost=0.05)
+    cache = CacheBackend(OCRCache(str(tmp_path / "cache")))
+    scheduler = BackendScheduler([expensive, cache, cheap])
+    page = PageInput(1, _image(tmp_path))
+
+    result = scheduler.process(page)
+    assert result.backend == "fake" and result.cost == 0.001
+    assert (cheap.calls, expensive.calls) == (1, 0)
+
+    # 같은 이미지는 캐시에서 비용 없이 반환
+    cached = scheduler.process(PageInput(2, _image(tmp_path, "copy.png")))
+    assert cached.backend == "cache:fake" and cached.cost == 0.0
+    assert [item.product_code for item in cached.items] == ["P-1"]
+    assert cheap.calls == 1
+
+
+def test_cache_key_includes_model(tmp_path):
+    """모델이 바뀌면 캐시를 사용하지 않고, 설정과 다른 모델의 결과는 저장하지 않는지 테스트"""
+    page = PageInput(1, _image(tmp_path))
+    mini = OCRCache(str(tmp_path / "cache"), RuntimeConfig(model_name="gpt-4o-mini"))
+    mini.put(page, OCRResult([OrderItem("P-1", 1)], 0.01, model="gpt-4o-mini"))
+    assert mini.get(page).items[0].product_code == "P-1"
+    assert OCRCache(str(tmp_path / "cache"), RuntimeConfig(model_name="gpt-4o")).get(page) is None
+
+    full = OCRCache(str(tmp_path / "cache"), RuntimeConfig(model_name="gpt-4o"))
+    full.put(page, OCRResult([OrderItem("P-2", 1)], 0.001, model="gpt-4o-mini"))
+    assert full.get(page) is None
+
+
+def test_create_backend_keeps_constructor_errors(monkeypatch):
+    """생성 중 발생한 TypeError를 설정 없이 다시 생성하는 것으로 숨기지 않는지 테스트"""
+    created = []
+
+    def broken_factory(config=None):
+        created.append(config)
+        raise TypeError("생성 오류")
+
+    monkeypatch.setitem(registry._factories, "broken", broken_factory)
+    monkeypatch.setitem(registry._factories, "plain", lambda: FakeVisionBackend())
+    config = RuntimeConfig()
+    with pytest.raises(TypeError):
+        create_backend("broken", config)
+    assert created == [config]
+    assert isinstance(create_backend("plain", config), FakeVisionBackend)
+
+
+def test_backend_without_process_page_cannot_be_created():
+    """process_page를 구현하지 않은 백엔드는 생성할 수 없는지 테스트"""
+    class IncompleteBackend(OCRBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_text_layer_and_replay_backends(tmp_path):
+    """텍스트 레이어 / 보관 결과 재사용 백엔드 테스트"""
+    text_backend = TextLayerBackend()
+    assert not text_backend.can_process(PageInput(1, "page.png"))
+    result = text_backend.run(PageInput(1, None, "DMCA-8N-SA 7"))
+    assert result.items[0].product_code == "DMCA-8N-SA" and result.backend == "text_layer"
+
+    archive = append_jsonl_result({
+        "filename": "order.pdf", "document_type": "PDF", "total_pages": 1, "processing_cost": 0.01,
+        "pages": [{"page": 1, "content": [{"품번": "OLD-1", "수량": 3}], "raw_content": {}}],
+    }, str(tmp_path))
+    replay = ReplayBackend([archive])
+    assert replay.run(PageInput(1, "x.png", filename="order.pdf")).items[0].product_code == "OLD-1"
+    assert replay.run(PageInput(2, "x.png", filename="order.pdf")) is None
+
+
+def test_processor_parallel_pages_keep_order(tmp_path):
+    """페이지 병렬 처리 시 동시 처리 한도와 페이지 순서 유지 테스트"""
+    backend = FakeVisionBackend(delay=0.05)
+    processor = DocumentProcessor(catalog=None, backends=[backend])
+    progress = []
+    pages = processor._process_pages(
+        [PageInput(number, f"missing_{number}.png") for number in range(1, 7)],
+        lambda done, total: progress.append((done, total))
+    )
+    assert [page.page_number for page in pages] == [1, 2, 3, 4, 5, 6]
+    assert [page.items[0].product_code for page in pages] == [f"P-{n}" for n in range(1, 7)]
+    assert backend.peak == 2
+    assert progress[-1] == (6, 6)
+    assert pages[0].raw_content["backend"] == "fake"
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, CacheBackend, OCRBackend, OCRCache
+from src.core.budget import (ACTION_DOWNGRADE, ACTION_HALT, ACTION_OK, ACTION_SLOW, BudgetedBackend,
+                             BudgetExceededError, BudgetLimits, SpendGovernor, SpendLedger, apply_budget,
+                             create_governor)
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+
+
+class PricedBackend(OCRBackend):
+    """페이지마다 정해진 비용이 드는 테스트용 백엔드"""
+    capabilities = frozenset({CAP_IMAGE})
+
+    def __init__(self, name, cost):
+        super().__init__()
+        self.name = name
+        self.cost = cost
+        self.calls = 0
+
+    def estimate_cost(self, page):
+        return self.cost
+
+    def process_page(self, page):
+        self.calls += 1
+        return OCRResult([OrderItem(f"{self.name.upper()}-{page.page_number}", 1)], self.cost, model=self.name)
+
+
+PAGE = PageInput(1, "page.png")
+
+
+def test_ledger_persists_daily_and_customer_totals(tmp_path):
+    """지출 기록이 재시작 후에도 일별 / 고객별로 합산되는지 테스트"""
+    path = str(tmp_path / "ledger.jsonl")
+    ledger = SpendLedger(path)
+    ledger.record(0.5, "acme", "gpt-4o")
+    ledger.record(0.25, "acme", date=datetime.date.today().replace(day=1))
+    ledger.record(1.0, "other")
+    with open(path, 'ab') as f:
+        f.write(b'{"date": "2026-')  # 기록 중 종료되어 잘린 줄
+
+    reopened = SpendLedger(path)
+    assert reopened.day_total() == pytest.approx(1.5 if datetime.date.today().day != 1 else 1.75)
+    assert reopened.customer_total("acme") == pytest.approx(0.75)
+    assert reopened.customer_total("other") == pytest.approx(1.0)
+
+
+def test_governor_actions_by_usage(tmp_path):
+    """사용률에 따라 정상 → 속도 제한 → 저렴한 모델 → 중단으로 바뀌는지 테스트"""
+    governor = SpendGovernor(BudgetLimits(run=1.0), SpendLedger(str(tmp_path / "ledger.jsonl")))
+    assert governor.acquire(0.5) == ACTION_OK
+    governor.release(0.5, 0.5)
+    assert governor.acquire(0.25) == ACTION_SLOW
+    governor.release(0.25, 0.25)
+    assert governor.acquire(0.1) == ACTION_DOWNGRADE
+    governor.release(0.1, 0.1)
+    assert governor.acquire(0.2) == ACTION_HALT
+    assert governor.ledger.day_total() == pytest.approx(0.85)
+
+
+def test_governor_reserves_in_flight_cost(tmp_path):
+    """처리 중인 요청의 예상 비용까지 더해 한도를 확인하는지 테스트"""
+    governor = SpendGovernor(BudgetLimits(run=1.0), SpendLedger(str(tmp_path / "ledger.jsonl")))
+    assert governor.acquire(0.6) == ACTION_OK
+    assert governor.acquire(0.6) == ACTION_HALT
+    governor.release(0.6)  # 실패해 비용이 들지 않음
+    assert governor.acquire(0.6) == ACTION_OK
+
+
+def test_budgeted_backend_downgrades_and_halts(tmp_path):
+    """한도에 가까워지면 저렴한 백엔드로 처리하고, 넘으면 중단하는지 테스트"""
+    governor = SpendGovernor(BudgetLimits(run=1.0), SpendLedger(str(tmp_path / "ledger.jsonl")), slow_delay=0)
+    inner, cheaper = PricedBackend("full", 0.6), PricedBackend("mini", 0.3)
+    backend = BudgetedBackend(inner, governor, cheaper)
+
+    assert backend.run(PAGE).backend == "full"
+    result = backend.run(PAGE)  # 원래 모델로는 1.2/1.0 → 저렴한 모델로 0.9/1.0
+    assert result.backend == "mini" and result.timing["budget"] == ACTION_DOWNGRADE
+    with pytest.raises(BudgetExceededError):
+        backend.run(PAGE)
+    assert (inner.calls, cheaper.calls) == (1, 1)
+    assert governor.run_spent == pytest.approx(0.9) and governor.halted == 1
+
+
+def test_apply_budget_wraps_image_backends(tmp_path):
+    """한도가 있을 때만 이미지 처리 백엔드에 적용하는지 테스트"""
+    config = RuntimeConfig(mock_mode=True, budget_day=5.0, customer="acme")
+    governor = create_governor(config, SpendLedger(str(tmp_path / "ledger.jsonl")))
+    assert governor.limits == BudgetLimits(day=5.0) and governor.customer == "acme"
+    assert create_governor(RuntimeConfig()) is None
+
+    cache = CacheBackend(OCRCache(str(tmp_path / "cache")))
+    backends = apply_budget([cache, PricedBackend("full", 0.1)], governor, config)
+    assert backends[0] is cache
+    assert isinstance(backends[1], BudgetedBackend)
+    assert apply_budget(backends, None) is backends
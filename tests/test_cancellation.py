@@ -0,0 +1,134 @@
+import threading
+import time
+
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, OCRBackend
+from src.core.checkpoint import CheckpointJournal
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_service import OCRResult
+from src.models.document import DocumentPage, ProcessedDocument
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+from src.utils.cancellation import CancellationToken
+
+
+class SlowBackend(OCRBackend):
+    """페이지마다 지연 시간이 있는 테스트용 백엔드"""
+    name = "slow"
+    capabilities = frozenset({CAP_IMAGE})
+    max_concurrency = 2
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def estimate_cost(self, page):
+        return 0.02
+
+    def process_page(self, page):
+        time.sleep(self.delay(page.page_number))
+        return OCRResult([OrderItem(f"P-{page.page_number}", 1)], 0.01)
+
+
+def _processor(tmp_path, backend):
+    return DocumentProcessor(catalog=None, backends=[backend], config=RuntimeConfig(),
+                             checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+
+
+def test_token():
+    """취소 토큰 상태 / 대기 테스트"""
+    token = CancellationToken()
+    assert not token.cancelled and not token.wait(0.01)
+    threading.Timer(0.05, token.cancel).start()
+    assert token.wait(5)
+    assert token.cancelled
+
+
+def test_cancel_returns_completed_pages_promptly(tmp_path):
+    """취소하면 처리 중인 페이지를 기다리지 않고 완료된 페이지만 반환하는지 테스트"""
+    backend = SlowBackend(lambda number: 0.01 if number == 1 else 2.0)
+    processor = _processor(tmp_path, backend)
+    token = CancellationToken()
+    threading.Timer(0.3, token.cancel).start()
+
+    start = time.perf_counter()
+    pages = processor._process_pages([PageInput(number, f"missing_{number}.png") for number in range(1, 6)],
+                                     cancel_token=token)
+    assert time.perf_counter() - start < 1.0
+    assert pages[0].items[0].product_code == "P-1"
+    statuses = [page.raw_content.get("status") for page in pages]
+    assert statuses == [None, "cancelled", "cancelled", "cancelled", "cancelled"]
+    # 처리 중이던 요청(2, 3페이지)은 비용이 청구되므로 예상 비용으로 기록, 대기 중이던 페이지는 비용 없음
+    assert [page.raw_content["cost"] for page in pages[1:]] == [0.02, 0.02, 0.0, 0.0]
+    assert pages[1].raw_content["cost_estimated"]
+
+
+def test_cancelled_document_can_be_retried(tmp_path):
+    """취소된 문서의 남은 페이지를 다시 처리할 수 있는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    delay = {"seconds": 2.0}
+    processor = _processor(tmp_path, SlowBackend(lambda number: delay["seconds"]))
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+    document = processor.process_document(str(image), cancel_token=token)
+    assert document.cancelled and document.total_items == 0
+    assert document.processing_cost == 0.02
+
+    delay["seconds"] = 0.0
+    processor.retry_failed_pages(document, str(image))
+    assert not document.cancelled and document.total_items == 1
+
+
+class BlockingBackend(OCRBackend):
+    """취소될 때까지 응답하지 않다가, 취소된 뒤에야 결과를 돌려주는 테스트용 백엔드"""
+    name = "blocking"
+    capabilities = frozenset({CAP_IMAGE})
+
+    def __init__(self):
+        super().__init__()
+        self.finished = threading.Event()
+
+    def estimate_cost(self, page):
+        return 0.02
+
+    def process_page(self, page):
+        page.cancel_token.wait(10)
+        time.sleep(0.3)  # 중단 요청을 무시하고 조금 뒤에 응답
+        self.finished.set()
+        return OCRResult([OrderItem(f"P-{page.page_number}", 1)], 0.01)
+
+
+def test_cancel_stops_in_flight_page_without_journal_writes(tmp_path):
+    """처리 중인 요청에 취소가 전달되어 바로 반환되고, 취소 뒤에 끝난 페이지는 처리 기록에 남지 않는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = BlockingBackend()
+    processor = _processor(tmp_path, backend)
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    start = time.perf_counter()
+    document = processor.process_document(str(image), cancel_token=token)
+    assert time.perf_counter() - start < 1.0
+    assert document.cancelled
+    assert backend.finished.wait(5)
+    time.sleep(0.1)
+    checkpoint = processor.checkpoints.open(str(image), processor.checkpoint_fingerprint)
+    assert checkpoint.pages == {}
+
+
+def test_journaled_in_flight_page_cost_is_counted_once(tmp_path):
+    """취소 직전에 끝나 처리 기록에 남은 페이지는 다시 처리할 때 예상 비용 대신 실제 비용만 남는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = SlowBackend(lambda number: 0.0)
+    processor = _processor(tmp_path, backend)
+    document = ProcessedDocument("order.png", "Image", 1, [DocumentPage(
+        1, [], {"status": "cancelled", "cost": 0.02, "cost_estimated": True})], processing_cost=0.02)
+    checkpoint = processor.checkpoints.open(str(image), processor.checkpoint_fingerprint)
+    checkpoint.record_page(DocumentPage(1, [OrderItem("P-1", 1)], {"cost": 0.01}))
+
+    processor.retry_failed_pages(document, str(image))
+    assert not document.cancelled and document.total_items == 1
+    assert round(document.processing_cost, 6) == 0.01
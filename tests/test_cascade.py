@@ -0,0 +1,102 @@
+from src.core.backends import CAP_IMAGE, MockBackend, OCRBackend, registry
+from src.core.cascade import (REASON_CATALOG_MISMATCH, REASON_INVALID_ROWS, REASON_LOW_CONFIDENCE, CascadeBackend,
+                              CascadePolicy, apply_cascade, escalation_reasons)
+from src.core.catalog import ProductCatalog
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+
+
+class FixedBackend(OCRBackend):
+    """정해진 결과를 반환하는 테스트용 모델 단계"""
+    name = "fixed"
+    capabilities = frozenset({CAP_IMAGE})
+
+    def __init__(self, model, rows, cost, confidence=None):
+        super().__init__()
+        self.model = model
+        self.rows = rows
+        self.cost = cost
+        self.confidence = confidence
+        self.calls = 0
+
+    def process_page(self, page):
+        self.calls += 1
+        return OCRResult.from_parse_result(OrderItem.parse_page(self.rows), self.cost, self.model, self.confidence)
+
+
+GOOD_ROWS = [{"품번": "DMCA-8N-SA", "수량": 7}]
+BAD_ROWS = [{"품번": "DMCA-8N-SA", "수량": "미정"}]
+
+
+def test_escalation_reasons():
+    """검증 실패 이유 테스트"""
+    policy = CascadePolicy(min_confidence=0.8)
+    catalog = ProductCatalog(["PART-001"])
+    result = OCRResult.from_parse_result(OrderItem.parse_page(BAD_ROWS + GOOD_ROWS), 0.0, confidence=0.5)
+    assert escalation_reasons(result, policy, catalog) == [
+        REASON_INVALID_ROWS, REASON_CATALOG_MISMATCH, REASON_LOW_CONFIDENCE
+    ]
+    good = OCRResult.from_parse_result(OrderItem.parse_page(GOOD_ROWS), 0.0, confidence=0.9)
+    assert escalation_reasons(good, policy) == []
+    assert escalation_reasons(OCRResult([], 0.0), policy) == ["empty"]
+
+
+def test_cascade_stops_at_first_valid_tier():
+    """저렴한 모델 결과가 유효하면 상위 모델을 호출하지 않는지 테스트"""
+    cheap = FixedBackend("nano", GOOD_ROWS, 0.001)
+    strong = FixedBackend("large", GOOD_ROWS, 0.02)
+    result = CascadeBackend([cheap, strong]).run(PageInput(1, "page.png"))
+    assert result.model == "nano" and result.cost == 0.001
+    assert strong.calls == 0
+    assert [step["model"] for step in result.cascade] == ["nano"]
+
+
+def test_cascade_escalates_and_sums_cost():
+    """검증 실패 시 상위 모델로 다시 처리하고 비용을 합산하는지 테스트"""
+    cheap = FixedBackend("nano", BAD_ROWS, 0.001)
+    strong = FixedBackend("large", GOOD_ROWS, 0.02, confidence=0.95)
+    result = CascadeBackend([cheap, strong]).run(PageInput(1, "page.png"))
+    assert result.model == "large"
+    assert result.cost == 0.021
+    assert [step["reasons"] for step in result.cascade] == [[REASON_INVALID_ROWS], []]
+
+
+def test_cascade_escalates_empty_result_only_for_order_pages():
+    """표지 / 약관처럼 주문 항목이 없을 페이지의 빈 결과는 상위 모델로 넘기지 않는지 테스트"""
+    cover = PageInput(1, "page.png", text="견적 요청서 표지\n거래 조건 및 약관 안내\n담당자 연락처 참조")
+    order = PageInput(2, "page.png", text="주문 내역\n품번 수량\nDMCA-8N-SA 미정\n합계는 별도 안내")
+
+    cheap = FixedBackend("nano", [], 0.001)
+    strong = FixedBackend("large", GOOD_ROWS, 0.02)
+    result = CascadeBackend([cheap, strong]).run(cover)
+    assert result.model == "nano" and strong.calls == 0
+    assert result.cascade[0]["reasons"] == []
+
+    result = CascadeBackend([cheap, strong]).run(order)
+    assert result.model == "large" and strong.calls == 1
+    assert result.cascade[0]["reasons"] == ["empty"]
+
+    # 분류기가 표가 있는 스캔 페이지로 보면 텍스트가 없어도 상위 모델로 넘김
+    strong.calls = 0
+    result = CascadeBackend([cheap, strong]).run(PageInput(3, "missing.png"))
+    assert result.model == "large" and strong.calls == 1
+    assert escalation_reasons(OCRResult([], 0.0), CascadePolicy(), expects_items=False) == []
+
+
+def test_cascade_keeps_best_attempt_when_all_fail():
+    """모든 단계가 실패하면 실패 이유가 가장 적은 결과를 사용하는지 테스트"""
+    cheap = FixedBackend("nano", GOOD_ROWS, 0.001, confidence=0.3)
+    strong = FixedBackend("large", BAD_ROWS, 0.02, confidence=0.3)
+    result = CascadeBackend([cheap, strong]).run(PageInput(1, "page.png"))
+    assert result.model == "nano"
+    assert result.cost == 0.021
+
+
+def test_apply_cascade_uses_registry():
+    """레지스트리로 모델별 단계 생성 테스트"""
+    backends = apply_cascade([MockBackend()], ["nano", "large"])
+    assert isinstance(backends[0], CascadeBackend)
+    assert [tier.service.model_name for tier in backends[0].tiers] == ["nano", "large"]
+    assert apply_cascade([MockBackend()], ["only"])[0].name == "mock"
+    assert "mock" in registry.names()
@@ -0,0 +1,55 @@
+from src.core.catalog import ProductCatalog, weighted_distance
+from src.models.order_item import OrderItem
+
+
+CODES = ["DMCA-4N-SA", "DMCA-8N-SA", "DMCA-12N-SA", "DMC-8N-S", "PART-001"]
+
+
+def test_exact_match():
+    """정확히 일치하는 품번 테스트"""
+    catalog = ProductCatalog(CODES)
+    match = catalog.match("dmca-8n-sa")
+    assert match.matched_code == "DMCA-8N-SA"
+    assert match.exact
+
+
+def test_ocr_confusion_correction():
+    """0/O, 8/B, 대시 혼동 보정 테스트"""
+    catalog = ProductCatalog(CODES)
+    assert catalog.match("DMCA-BN-SA").matched_code == "DMCA-8N-SA"
+    assert catalog.match("DMCA-BN-SA").distance == 0.5
+    assert catalog.match("PART-OO1").matched_code == "PART-001"
+    assert catalog.match("DMCA12N-SA").matched_code == "DMCA-12N-SA"
+    assert catalog.match("ZZZ-999").matched_code is None
+
+
+def test_match_keeps_input_code():
+    """매칭 결과에 입력한 품번이 그대로 남는지 테스트 (미등록 / 유사 품번 매칭)"""
+    catalog = ProductCatalog(CODES)
+    missed = catalog.match("ZZZ-999")
+    assert (missed.code, missed.matched_code) == ("ZZZ-999", None)
+    fuzzy = catalog.match("DMCA-9N-SA")
+    assert fuzzy.code == "DMCA-9N-SA" and fuzzy.matched_code is not None and not fuzzy.exact
+
+
+def test_weighted_distance():
+    """가중 편집 거리 테스트"""
+    assert weighted_distance("DMCA-8N", "DMCA-8N") == 0
+    assert weighted_distance("DMCA-BN", "DMCA-8N") == 0.5
+    assert weighted_distance("DMCA8N", "DMCA-8N") == 0.5
+    assert weighted_distance("DMCA-9N", "DMCA-8N") == 1.0
+
+
+def test_from_csv_and_annotate(tmp_path):
+    """CSV 카탈로그 로드 및 항목 표시 테스트"""
+    path = tmp_path / "catalog.csv"
+    path.write_text("품번,설명\nDMCA-4N-SA,커넥터\nDMCA-8N-SA,커넥터\n", encoding="utf-8")
+    catalog = ProductCatalog.from_csv(str(path))
+    assert len(catalog) == 2
+
+    items = [OrderItem("DMCA-4N-SA", 1), OrderItem("DMCA-BN-SA", 2), OrderItem("XYZ", 3)]
+    stats = catalog.annotate(items)
+    assert stats == {"exact": 1, "corrected": 1, "unmatched": 1}
+    assert items[1].to_dict() == {"품번": "DMCA-BN-SA", "수량": 2, "카탈로그_품번": "DMCA-8N-SA", "매칭_거리": 0.5}
+    assert OrderItem.from_dict(items[1].to_dict()) == items[1]
+    assert items[2].to_dict() == {"품번": "XYZ", "수량": 3}
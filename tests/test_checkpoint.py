@@ -0,0 +1,103 @@
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, OCRBackend
+from src.core.checkpoint import CheckpointJournal, DocumentCheckpoint
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.document import DocumentPage
+from src.models.order_item import OrderItem
+
+
+class CrashingBackend(OCRBackend):
+    """지정한 페이지에서 실패하는 테스트용 백엔드"""
+    name = "crashing"
+    capabilities = frozenset({CAP_IMAGE})
+    max_concurrency = 1
+
+    def __init__(self, fail_page=None):
+        super().__init__()
+        self.fail_page = fail_page
+        self.processed = []
+
+    def estimate_cost(self, page):
+        return 0.01
+
+    def process_page(self, page):
+        if page.page_number == self.fail_page:
+            raise ConnectionError("중단")
+        self.processed.append(page.page_number)
+        return OCRResult([OrderItem(f"P-{page.page_number}", 1)], 0.01)
+
+
+def _processor(tmp_path, backend, **config):
+    return DocumentProcessor(catalog=None, backends=[backend], config=RuntimeConfig(**config),
+                             checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+
+
+def test_checkpoint_survives_truncated_line(tmp_path):
+    """기록 중 잘린 줄을 무시하고 다음 기록을 이어 쓰는지 테스트"""
+    path = str(tmp_path / "doc.jsonl")
+    checkpoint = DocumentCheckpoint(path, "settings")
+    checkpoint.record_page(DocumentPage(1, [OrderItem("A-1", 2)], {"cost": 0.01}))
+    with open(path, 'ab') as f:
+        f.write(b'{"page": {"page": 2, "cont')
+
+    checkpoint = DocumentCheckpoint(path, "settings")
+    assert list(checkpoint.pages) == [1]
+    checkpoint.record_page(DocumentPage(3, [], {"cost": 0.0}))
+    reopened = DocumentCheckpoint(path, "settings")
+    assert sorted(reopened.pages) == [1, 3]
+    assert reopened.pages[1].items[0].product_code == "A-1"
+
+    # 설정이 바뀌면 이전 기록은 사용하지 않음
+    assert DocumentCheckpoint(path, "other").pages == {}
+
+
+def test_resume_skips_completed_pages(tmp_path):
+    """중단 후 다시 처리하면 끝난 페이지는 건너뛰는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = CrashingBackend(fail_page=3)
+    processor = _processor(tmp_path, backend)
+    page_inputs = [PageInput(number, f"missing_{number}.png") for number in range(1, 6)]
+    checkpoint = processor.checkpoints.open(str(image), processor.checkpoint_fingerprint)
+    pages = processor._process_pages(page_inputs, checkpoint=checkpoint)
+    assert backend.processed == [1, 2, 4, 5]
+    assert pages[2].raw_content["status"] == "failed"
+
+    backend.fail_page = None
+    checkpoint = processor.checkpoints.open(str(image), processor.checkpoint_fingerprint)
+    pages = processor._process_pages(page_inputs, checkpoint=checkpoint)
+    assert backend.processed == [1, 2, 4, 5, 3]
+    assert [page.items[0].product_code for page in pages] == [f"P-{n}" for n in range(1, 6)]
+
+
+def test_resume_skips_completed_files(tmp_path):
+    """처리를 마친 파일은 기본적으로 다시 처리하지 않고, 다시 처리를 요청하면 처리하는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = CrashingBackend()
+    processor = _processor(tmp_path, backend)
+    first = processor.process_document(str(image))
+    assert processor.completed_document(str(image)).total_items == first.total_items == 1
+
+    again = processor.process_document(str(image))
+    assert backend.processed == [1]
+    assert again.all_items[0].product_code == "P-1"
+
+    # --reprocess (reuse_completed=False)면 끝난 파일도 다시 처리
+    fresh = _processor(tmp_path, backend, reuse_completed=False)
+    assert fresh.completed_document(str(image)) is None
+    fresh.process_document(str(image))
+    assert backend.processed == [1, 1]
+
+
+def test_fingerprint_includes_catalog_and_cascade(tmp_path):
+    """카탈로그 / 모델 단계가 바뀌면 이전 처리 기록을 사용하지 않는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = CrashingBackend()
+    _processor(tmp_path, backend).process_document(str(image))
+    for overrides in ({"catalog_path": "codes.csv"}, {"cascade_models": "gpt-4o-mini,gpt-4o"}):
+        processor = _processor(tmp_path, backend, **overrides)
+        assert processor.completed_document(str(image)) is None
@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+from src.core.backends import (CAP_CACHEABLE, CAP_IMAGE, BackendScheduler, CacheBackend, CircuitOpenError, OCRBackend,
+                               OCRCache)
+from src.config.runtime import RuntimeConfig
+from src.core.circuit_breaker import (STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker,
+                                      CircuitBreakerBackend, apply_circuit_breakers)
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+
+
+class FlakyBackend(OCRBackend):
+    """실패 여부와 지연 시간을 바꿀 수 있는 테스트용 백엔드"""
+    name = "flaky"
+    capabilities = frozenset({CAP_IMAGE})
+
+    def __init__(self, fail=False, delay=0.0, cost=0.01, name=None):
+        super().__init__()
+        self.fail = fail
+        self.delay = delay
+        self.cost = cost
+        if name:
+            self.name = name
+        self.calls = 0
+
+    def estimate_cost(self, page):
+        return self.cost
+
+    def process_page(self, page):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("API 오류")
+        return OCRResult([OrderItem(f"{self.name.upper()}-{page.page_number}", 1)], self.cost)
+
+
+PAGE = PageInput(1, "page.png")
+
+
+def test_breaker_opens_and_fails_fast():
+    """연속 실패 후 차단되어 백엔드를 호출하지 않는지 테스트"""
+    inner = FlakyBackend(fail=True)
+    backend = CircuitBreakerBackend(inner, CircuitBreaker("flaky", failure_threshold=3, reset_timeout=60))
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            backend.run(PAGE)
+    assert backend.breaker.state == STATE_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        backend.run(PAGE)
+    assert inner.calls == 3
+    assert backend.breaker.stats.rejected == 1
+
+
+def test_breaker_half_open_recovery():
+    """복구 확인 요청이 성공하면 다시 정상 상태가 되는지 테스트"""
+    inner = FlakyBackend(fail=True)
+    breaker = CircuitBreaker("flaky", failure_threshold=1, reset_timeout=0.05)
+    backend = CircuitBreakerBackend(inner, breaker)
+    with pytest.raises(ConnectionError):
+        backend.run(PAGE)
+    assert breaker.state == STATE_OPEN
+
+    time.sleep(0.06)
+    assert breaker.state == STATE_HALF_OPEN
+    # 복구 확인 중 실패하면 바로 다시 차단
+    with pytest.raises(ConnectionError):
+        backend.run(PAGE)
+    assert breaker.state == STATE_OPEN
+
+    time.sleep(0.06)
+    inner.fail = False
+    assert backend.run(PAGE).items[0].product_code == "FLAKY-1"
+    assert breaker.state == STATE_CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    """지연 시간 기준을 넘은 응답을 실패로 세는지 테스트"""
+    breaker = CircuitBreaker("flaky", failure_threshold=2, latency_threshold=0.01)
+    backend = CircuitBreakerBackend(FlakyBackend(delay=0.03), breaker)
+    backend.run(PAGE)
+    backend.run(PAGE)
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats.slow_calls == 2
+
+
+def test_shared_breaker_follows_latest_settings():
+    """같은 백엔드의 공유 차단기를 다른 설정으로 다시 적용하면 기준값이 바뀌고 상태는 유지되는지 테스트"""
+    backend = FlakyBackend(fail=True, name="flaky-settings")
+    first = apply_circuit_breakers([backend], config=RuntimeConfig(breaker_failure_threshold=5))[0]
+    first.breaker.record_failure()
+
+    second = apply_circuit_breakers([backend], config=RuntimeConfig(
+        breaker_failure_threshold=2, breaker_reset_timeout=1.5, breaker_latency_threshold=3.0))[0]
+    assert second.breaker is first.breaker
+    assert (second.breaker.failure_threshold, second.breaker.reset_timeout) == (2, 1.5)
+    assert second.breaker.latency_threshold == 3.0
+    second.breaker.record_failure()
+    assert second.breaker.state == STATE_OPEN
+
+
+def test_degraded_fallback_and_defer():
+    """차단 시 대체 백엔드 / 보류 처리 테스트"""
+    fallback = FlakyBackend(name="cheap")
+    backend = CircuitBreakerBackend(FlakyBackend(fail=True), CircuitBreaker("flaky", failure_threshold=1), fallback)
+    result = backend.run(PAGE)
+    assert result.items[0].product_code == "CHEAP-1"
+    assert result.timing["degraded"] == STATE_OPEN
+
+    deferred = CircuitBreakerBackend(FlakyBackend(fail=True), CircuitBreaker("flaky", failure_threshold=1),
+                                     defer=True)
+    result = deferred.run(PAGE)
+    assert result.status == "deferred" and result.items == [] and result.cost == 0.0
+
+
+def test_scheduler_skips_open_breaker():
+    """차단된 백엔드를 건너뛰고 다음 백엔드로 처리하는지 테스트"""
+    breaker = CircuitBreaker("flaky", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    blocked = CircuitBreakerBackend(FlakyBackend(cost=0.001), breaker)
+    scheduler = BackendScheduler([blocked, FlakyBackend(cost=0.05, name="backup")])
+    assert scheduler.process(PAGE).items[0].product_code == "BACKUP-1"
+
+    with pytest.raises(CircuitOpenError):
+        BackendScheduler([blocked]).process(PAGE)
+
+
+def test_deferred_result_is_not_cached(tmp_path):
+    """보류된 빈 결과는 캐시하지 않아 다음 처리에서 다시 시도하는지 테스트"""
+    image = tmp_path / "page.png"
+    image.write_bytes(b"image")
+    page = PageInput(1, str(image))
+    inner = FlakyBackend(fail=True)
+    inner.capabilities = frozenset({CAP_IMAGE, CAP_CACHEABLE})
+    cache = CacheBackend(OCRCache(str(tmp_path / "cache")))
+    deferred = CircuitBreakerBackend(inner, CircuitBreaker("flaky", failure_threshold=1), defer=True)
+    scheduler = BackendScheduler([cache, deferred])
+    assert scheduler.process(page).status == "deferred"
+    assert cache.process_page(page) is None
+
+    inner.fail = False
+    assert BackendScheduler([cache, inner]).process(page).items[0].product_code == "FLAKY-1"
+    cached = cache.process_page(page)
+    assert cached.status == "ok" and cached.items[0].product_code == "FLAKY-1"
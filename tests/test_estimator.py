@@ -0,0 +1,75 @@
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.core.estimator import CostEstimator, LatencyHistory, format_duration, image_tokens
+from src.utils.pdf_converter import DocumentProbe, PageProbe
+
+
+def test_image_tokens_by_model():
+    """모델별 이미지 토큰 계산 테스트"""
+    # 300 DPI Letter(2550x3300) → 768x994 → 2x2 타일
+    assert image_tokens(2550, 3300, "gpt-4o") == 85 + 170 * 4
+    assert image_tokens(2550, 3300, "gpt-4o-mini") == 2833 + 5667 * 4
+    assert image_tokens(512, 512, "gpt-4o") == 85 + 170
+    assert image_tokens(320, 320, "gpt-4.1-mini") == 162
+    assert image_tokens(5000, 5000, "gpt-4.1-nano") == int(1536 * 2.46) + 1
+    assert image_tokens(0, 100, "gpt-4o") == 0
+
+
+def test_estimate_probe_cost_and_time(tmp_path):
+    """텍스트 레이어 페이지 제외, 동시 요청 / 분당 한도 반영 테스트"""
+    config = RuntimeConfig(model_name="gpt-4o", input_cost=2.5, output_cost=10.0, max_concurrency=2,
+                           hedge_budget=0.0)
+    probe = DocumentProbe("order.pdf", "PDF", 300, [
+        PageProbe(1, 612, 792, has_text=True),
+        PageProbe(2, 612, 792, has_text=False),
+        PageProbe(3, 612, 792, has_text=False),
+        PageProbe(4, 612, 792, has_text=False),
+    ])
+    history = LatencyHistory(str(tmp_path / "latency.json"))
+    for seconds in (2.0, 4.0, 3.0):
+        history.record("openai", seconds)
+    estimator = CostEstimator(config, history)
+
+    estimate = estimator.estimate_probe(probe)
+    page_cost = config.calculate_cost(150 + 765, 300)
+    assert estimate.ocr_pages == 3 and estimate.prompt_tokens == 3 * (150 + 765)
+    assert estimate.cost == pytest.approx(3 * page_cost)
+    assert estimate.max_cost == pytest.approx(4 * page_cost)
+    # 3페이지 / 동시 2개 → 2회 × 관측 중앙값 3초 (+ 렌더링)
+    assert 6.0 < estimate.seconds < 7.0
+
+    limited = CostEstimator(config.with_overrides(requests_per_minute=6), history).estimate_probe(probe)
+    assert limited.seconds > 30.0
+
+
+def test_max_cost_covers_every_cascade_tier():
+    """모델 단계 처리 시 예상 비용은 첫 단계, 최대 비용은 모든 단계 호출 기준인지 테스트"""
+    config = RuntimeConfig(model_name="gpt-4o", hedge_budget=0.5, cascade_models="gpt-4.1-nano,gpt-4o")
+    probe = DocumentProbe("order.pdf", "PDF", 300, [PageProbe(1, 612, 792, has_text=False)])
+    estimate = CostEstimator(config).estimate_probe(probe)
+
+    def page_cost(model):
+        return config.calculate_cost(150 + image_tokens(2550, 3300, model), 300, model)
+
+    assert estimate.cost == pytest.approx(page_cost("gpt-4.1-nano"))
+    assert estimate.max_cost == pytest.approx((page_cost("gpt-4.1-nano") + page_cost("gpt-4o")) * 1.5)
+    assert estimate.max_cost > page_cost("gpt-4o") * 1.5
+
+
+def test_latency_history_persists(tmp_path):
+    """지연 시간 기록 저장 / 불러오기 테스트"""
+    path = str(tmp_path / "latency.json")
+    history = LatencyHistory(path)
+    assert history.median("openai") is None
+    history.record("openai", 5.0)
+    history.save()
+    assert LatencyHistory(path).median("openai") == 5.0
+
+
+def test_estimate_file_errors_and_duration():
+    """없는 파일 오류 기록 및 시간 형식 테스트"""
+    batch = CostEstimator(RuntimeConfig()).estimate(["missing.pdf"])
+    assert batch.files[0].error and batch.pages == 0
+    assert format_duration(3725) == "1시간 2분 5초"
+    assert format_duration(0) == "0초"
@@ -7,8 +7,8 @@ import pyperclip
 
 @pytest.fixture
 def app():
-    """QApplication 인스턴스 생성"""
-    return QApplication([])
+    """QApplication 인스턴스 생성 (이미 있으면 재사용)"""
+    return QApplication.instance() or QApplication([])
 
 
 @pytest.fixture
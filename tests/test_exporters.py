@@ -0,0 +1,110 @@
+import csv
+import zipfile
+from xml.etree import ElementTree
+import pytest
+from src.models.order_item import OrderItem
+from src.models.document import ProcessedDocument, DocumentPage
+from src.utils.exporters import export_documents, iter_item_rows, get_exporter, BaseExporter, EXPORT_COLUMNS
+
+
+def make_documents():
+    """테스트용 문서 목록 생성"""
+    doc_a = ProcessedDocument(
+        filename="a.pdf",
+        document_type="PDF",
+        total_pages=2,
+        pages=[
+            DocumentPage(1, [OrderItem("DMCA-4N-SA", 22)], {}),
+            DocumentPage(2, [OrderItem("DMCA-8N-SA", 7), OrderItem("A&B<1>", 3)], {}),
+        ]
+    )
+    doc_b = ProcessedDocument(
+        filename="b.jpg",
+        document_type="Image",
+        total_pages=1,
+        pages=[DocumentPage(1, [OrderItem("PART-001", 10)], {})]
+    )
+    return [doc_a, doc_b]
+
+
+def test_iter_item_rows():
+    """문서 항목 행 순회 테스트"""
+    rows = list(iter_item_rows(make_documents()))
+    assert rows[0] == ("a.pdf", 1, "DMCA-4N-SA", 22)
+    assert rows[2] == ("a.pdf", 2, "A&B<1>", 3)
+    assert rows[3] == ("b.jpg", 1, "PART-001", 10)
+
+
+def test_export_csv(tmp_path):
+    """CSV 내보내기 테스트"""
+    output = tmp_path / "orders.csv"
+    count = export_documents(iter(make_documents()), str(output))
+    assert count == 4
+
+    with open(output, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == EXPORT_COLUMNS
+    assert rows[1] == ["a.pdf", "1", "DMCA-4N-SA", "22"]
+    assert len(rows) == 5
+
+
+def test_export_xlsx(tmp_path):
+    """XLSX 내보내기 테스트"""
+    output = tmp_path / "orders.xlsx"
+    count = export_documents(make_documents(), str(output))
+    assert count == 4
+
+    with zipfile.ZipFile(output) as zf:
+        sheet = zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        assert "xl/workbook.xml" in zf.namelist()
+    assert sheet.count("<row>") == 5
+    assert "A&amp;B&lt;1&gt;" in sheet
+    assert "<c><v>22</v></c>" in sheet
+
+
+def test_export_xlsx_cleans_values(tmp_path):
+    """XML에 쓸 수 없는 제어 문자 / NaN / 무한대가 있어도 올바른 시트가 만들어지는지 테스트"""
+    output = tmp_path / "orders.xlsx"
+    with get_exporter(str(output)) as exporter:
+        exporter.write_row(("a\x00b\x1fc.pdf", 1, "DMCA\x0b-8N", float("nan")))
+        exporter.write_row(("b.pdf", 2, "PART-001", float("inf")))
+
+    with zipfile.ZipFile(output) as zf:
+        sheet = zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    ElementTree.fromstring(sheet)
+    assert "<t>abc.pdf</t>" in sheet and "<t>DMCA-8N</t>" in sheet
+    assert "nan" not in sheet and "inf" not in sheet
+    assert sheet.count("<c/>") == 2
+
+
+def test_export_xlsx_failure_keeps_previous_file(tmp_path):
+    """기록 중 오류가 나면 잘린 파일을 남기지 않고 기존 파일을 그대로 두는지 테스트"""
+    output = tmp_path / "orders.xlsx"
+    export_documents(make_documents(), str(output))
+    previous = output.read_bytes()
+
+    def failing_rows():
+        yield ("a.pdf", 1, "DMCA-4N-SA", 22)
+        raise RuntimeError("원본 읽기 실패")
+
+    with pytest.raises(RuntimeError):
+        with get_exporter(str(output)) as exporter:
+            exporter.write_rows(failing_rows())
+    assert output.read_bytes() == previous
+    assert [path.name for path in tmp_path.iterdir()] == ["orders.xlsx"]
+
+
+def test_unsupported_format():
+    """지원하지 않는 형식 오류 테스트"""
+    with pytest.raises(ValueError):
+        get_exporter("orders.txt")
+
+
+def test_incomplete_exporter_cannot_be_created(tmp_path):
+    """open / write_row / close를 모두 구현하지 않은 내보내기 클래스는 생성할 수 없는지 테스트"""
+    class RowOnlyExporter(BaseExporter):
+        def write_row(self, row):
+            pass
+
+    with pytest.raises(TypeError):
+        RowOnlyExporter(str(tmp_path / "orders.out"))
@@ -0,0 +1,38 @@
+from src.utils.file_utils import (save_json_result, load_json_result,
+                                  append_jsonl_result, iter_jsonl_results)
+from src.utils.serialization import dumps, loads
+
+
+def test_dumps_compact_keeps_unicode():
+    """압축 직렬화 시 한글이 그대로 유지되는지 테스트"""
+    data = {"품번": "DMCA-4N-SA", "수량": 22}
+    encoded = dumps(data)
+    assert b"\n" not in encoded
+    assert "품번".encode("utf-8") in encoded
+    assert loads(encoded) == data
+
+
+def test_save_and_load_json_result(tmp_path):
+    """JSON 결과 저장/불러오기 테스트"""
+    data = {"filename": "a.pdf", "pages": []}
+    output_file = save_json_result(data, "/some/where/a.pdf", str(tmp_path))
+    assert output_file.startswith(str(tmp_path))
+    assert load_json_result(output_file) == data
+
+
+def test_jsonl_append_and_stream(tmp_path):
+    """JSON Lines 추가 및 스트리밍 읽기 테스트"""
+    first = append_jsonl_result({"filename": "a.pdf"}, str(tmp_path))
+    second = append_jsonl_result({"filename": "b.pdf"}, str(tmp_path))
+    assert first == second
+
+    records = list(iter_jsonl_results(first))
+    assert [record["filename"] for record in records] == ["a.pdf", "b.pdf"]
+    assert "saved_at" in records[0]
+
+
+def test_jsonl_ignores_blank_lines(tmp_path):
+    """빈 줄은 건너뛰는지 테스트"""
+    path = tmp_path / "results.jsonl"
+    path.write_bytes(b'{"filename": "a.pdf"}\n\n{"filename": "b.pdf"}\n')
+    assert len(list(iter_jsonl_results(str(path)))) == 2
@@ -0,0 +1,106 @@
+import threading
+import time
+
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, CacheBackend, OCRBackend, OCRCache
+from src.core.checkpoint import CheckpointJournal
+from src.core.document_processor import DocumentProcessor
+from src.core.estimator import LatencyHistory
+from src.core.hedging import HedgedBackend, HedgingPolicy, LatencyTracker, apply_hedging
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.order_item import OrderItem
+
+
+class SlowOnceBackend(OCRBackend):
+    """지정한 호출 번호만 느리게 응답하는 테스트용 백엔드"""
+    name = "slow_once"
+    capabilities = frozenset({CAP_IMAGE})
+    max_concurrency = 2
+
+    def __init__(self, slow_calls=(), delay=0.01, slow_delay=1.0):
+        super().__init__()
+        self.slow_calls = set(slow_calls)
+        self.delay = delay
+        self.slow_delay = slow_delay
+        self.calls = 0
+        self._counter_lock = threading.Lock()
+
+    def estimate_cost(self, page):
+        return 0.01
+
+    def process_page(self, page):
+        with self._counter_lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.slow_delay if call in self.slow_calls else self.delay)
+        return OCRResult([OrderItem(f"CALL-{call}", 1)], 0.01)
+
+
+POLICY = HedgingPolicy(percentile=0.9, budget_ratio=0.5, min_samples=5, min_delay=0.02)
+
+
+def test_latency_tracker_percentile():
+    """지연 시간 백분위 계산 테스트"""
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(0.9) is None
+    for value in range(1, 21):
+        tracker.record(value / 10)
+    assert len(tracker) == 10
+    assert tracker.percentile(0.0) == 1.1
+    assert tracker.percentile(1.0) == 2.0
+
+
+def test_hedge_wins_on_slow_request():
+    """느린 요청에 헤지 요청이 먼저 응답하는 경우 테스트"""
+    backend = HedgedBackend(SlowOnceBackend(slow_calls={6}), POLICY)
+    for number in range(1, 6):
+        result = backend.run(PageInput(number, "page.png"))
+        assert not result.timing["hedged"]
+
+    start = time.perf_counter()
+    result = backend.run(PageInput(6, "page.png"))
+    assert time.perf_counter() - start < 0.5
+    assert result.items[0].product_code == "CALL-7"
+    assert result.timing["hedged"] and result.timing["hedge_won"]
+    assert result.cost == 0.02
+    assert (backend.stats.requests, backend.stats.hedges, backend.stats.wins) == (6, 1, 1)
+
+
+def test_hedge_budget_limits_extra_requests():
+    """헤지 예산을 넘으면 중복 요청하지 않는지 테스트"""
+    policy = HedgingPolicy(percentile=0.9, budget_ratio=0.01, min_samples=5, min_delay=0.02)
+    backend = HedgedBackend(SlowOnceBackend(slow_calls={6}, slow_delay=0.1), policy)
+    for number in range(1, 7):
+        result = backend.run(PageInput(number, "page.png"))
+    assert not result.timing["hedged"]
+    assert (backend.stats.hedges, backend.stats.budget_skips) == (0, 1)
+
+
+def test_apply_hedging_skips_lookup_backends(tmp_path):
+    """캐시 백엔드에는 헤지를 적용하지 않는지 테스트"""
+    cache = CacheBackend(OCRCache(str(tmp_path)))
+    wrapped = apply_hedging([cache, SlowOnceBackend()], POLICY)
+    assert wrapped[0] is cache
+    assert isinstance(wrapped[1], HedgedBackend) and wrapped[1].name == "slow_once"
+    assert apply_hedging([cache], None) == [cache]
+
+
+def test_processor_close_stops_hedge_threads(tmp_path):
+    """처리가 끝나 DocumentProcessor.close()를 부르면 헤지 스레드가 정리되는지 테스트"""
+    hedged = HedgedBackend(SlowOnceBackend(), POLICY)
+    processor = DocumentProcessor(catalog=None, backends=[hedged], config=RuntimeConfig(),
+                                  latency_history=LatencyHistory(str(tmp_path / "latency.json")),
+                                  checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+    assert hedged.run(PageInput(1, "page.png")) is not None
+    assert any(thread.name.startswith("hedge-slow_once") for thread in threading.enumerate())
+
+    processor.close()
+    deadline = time.time() + 2.0
+    while time.time() < deadline and any(thread.name.startswith("hedge-slow_once")
+                                         for thread in threading.enumerate()):
+        time.sleep(0.01)
+    assert not any(thread.name.startswith("hedge-slow_once") for thread in threading.enumerate())
+    # 정리한 뒤에도 다시 요청하면 새 스레드로 처리
+    assert hedged.run(PageInput(2, "page.png")) is not None
+    hedged.close()
@@ -0,0 +1,99 @@
+import os
+import time
+
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, OCRBackend
+from src.core.checkpoint import CheckpointJournal
+from src.core.document_processor import DocumentProcessor
+from src.core.estimator import LatencyHistory
+from src.core.hot_folder import INOTIFY_AVAILABLE, HotFolder, InotifyWatcher, PollingWatcher, StableFileTracker
+from src.core.ocr_service import OCRResult
+from src.models.order_item import OrderItem
+from src.utils.file_utils import load_json_result
+
+
+class NamedBackend(OCRBackend):
+    """파일명에 bad가 들어 있으면 실패하는 테스트용 백엔드"""
+    name = "named"
+    capabilities = frozenset({CAP_IMAGE})
+
+    def estimate_cost(self, page):
+        return 0.01
+
+    def process_page(self, page):
+        if "bad" in os.path.basename(page.image_path):
+            raise ConnectionError("연결 끊김")
+        return OCRResult([OrderItem("A-1", 2)], 0.01)
+
+
+def test_tracker_waits_until_file_stops_changing(tmp_path):
+    """크기가 바뀌는 동안에는 넘기지 않고, 일정 시간 그대로면 넘기는지 테스트"""
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(b"")
+    tracker = StableFileTracker(settle_seconds=0.2)
+    tracker.add(str(path))
+    time.sleep(0.25)
+    assert tracker.ready() == []  # 빈 파일은 아직 쓰는 중
+
+    path.write_bytes(b"%PDF-1.4")
+    assert tracker.ready() == []
+    time.sleep(0.25)
+    assert tracker.ready() == [str(path)]
+    assert len(tracker) == 0
+
+
+def test_polling_watcher_skips_temporary_files(tmp_path):
+    """임시 / 숨김 / 다른 형식 파일과 하위 폴더는 처리 대상에서 제외하는지 테스트"""
+    for name in ("order.pdf", "scan.png.part", ".fax.png", "notes.txt", "~lock.pdf"):
+        (tmp_path / name).write_bytes(b"data")
+    (tmp_path / "done").mkdir()
+    (tmp_path / "done" / "old.pdf").write_bytes(b"data")
+
+    assert PollingWatcher(str(tmp_path)).poll(0) == [str(tmp_path / "order.pdf")]
+
+
+@pytest.mark.skipif(not INOTIFY_AVAILABLE, reason="inotify 없음")
+def test_inotify_watcher_reports_written_and_moved_files(tmp_path):
+    """쓰기가 끝난 파일과 이름을 바꿔 들어온 파일을 감지하는지 테스트"""
+    (tmp_path / "before.pdf").write_bytes(b"data")
+    watcher = InotifyWatcher(str(tmp_path))
+    try:
+        assert watcher.poll(0) == [str(tmp_path / "before.pdf")]
+        (tmp_path / "fax.png").write_bytes(b"data")
+        (tmp_path / "scan.pdf.part").write_bytes(b"data")
+        os.rename(tmp_path / "scan.pdf.part", tmp_path / "scan.pdf")
+        assert watcher.poll(1.0) == [str(tmp_path / "fax.png"), str(tmp_path / "scan.pdf")]
+        assert watcher.poll(0) == []
+    finally:
+        watcher.close()
+
+
+def test_hot_folder_moves_originals_with_results(tmp_path):
+    """처리한 원본을 결과와 함께 done / failed 폴더로 옮기고 상태 파일을 쓰는지 테스트"""
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    processor = DocumentProcessor(catalog=None, backends=[NamedBackend()], config=RuntimeConfig(),
+                                  latency_history=LatencyHistory(str(tmp_path / "latency.json")),
+                                  checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+    folder = HotFolder(str(inbox), processor, workers=2, settle_seconds=0, use_inotify=False)
+    (inbox / "good.png").write_bytes(b"image")
+    (inbox / "bad.png").write_bytes(b"image")
+
+    deadline = time.monotonic() + 10
+    while folder.processed + folder.failed < 2 and time.monotonic() < deadline:
+        folder.step(0.05)
+    folder.close()
+
+    assert sorted(os.listdir(inbox)) == ["done", "failed", "status.json"]
+    done = sorted(os.listdir(inbox / "done"))
+    failed = sorted(os.listdir(inbox / "failed"))
+    assert done[0] == "good.png" and done[1].startswith("good_ocr_")
+    assert failed[0] == "bad.png" and failed[1].startswith("bad_ocr_")
+    result = load_json_result(str(inbox / "failed" / failed[1]))
+    assert result["pages"][0]["raw_content"]["status"] == "failed"
+
+    status = load_json_result(str(inbox / "status.json"))
+    assert (status["processed"], status["failed"], status["queue_depth"]) == (1, 1, 0)
+    assert status["pages"] == 2 and status["watcher"] == "polling"
@@ -0,0 +1,125 @@
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, OCRBackend
+from src.core.checkpoint import CheckpointJournal
+from src.core.document_processor import DocumentProcessor
+from src.core.estimator import LatencyHistory
+from src.core.job_server import JOB_DONE, JobService, QueueFullError, create_job_server
+from src.core.ocr_service import OCRResult
+from src.models.order_item import OrderItem
+
+
+class GatedBackend(OCRBackend):
+    """gate가 열릴 때까지 기다렸다가 처리하는 테스트용 백엔드"""
+    name = "gated"
+    capabilities = frozenset({CAP_IMAGE})
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def estimate_cost(self, page):
+        return 0.01
+
+    def process_page(self, page):
+        self.gate.wait(5)
+        return OCRResult([OrderItem(f"P-{page.page_number}", 3)], 0.01)
+
+
+def _processor(tmp_path, backend):
+    return DocumentProcessor(catalog=None, backends=[backend], config=RuntimeConfig(),
+                             latency_history=LatencyHistory(str(tmp_path / "latency.json")),
+                             checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = create_job_server(_processor(tmp_path, GatedBackend()), port=0, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+
+def _request(server, path, data=None, method=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    request = urllib.request.Request(url, data=data, method=method)
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status, response.read()
+
+
+def test_upload_stream_and_result(server):
+    """업로드한 파일의 페이지 결과를 스트리밍으로 받고 결과 / 상태를 조회하는지 테스트"""
+    status, body = _request(server, "/jobs?filename=order.png", b"image")
+    job = json.loads(body)
+    assert status == 202 and job["status"] in ("queued", "running")
+
+    status, body = _request(server, f"/jobs/{job['id']}/pages")
+    events = [json.loads(line) for line in body.splitlines()]
+    assert [event["event"] for event in events] == ["page", "end"]
+    assert events[0]["page"]["content"] == [{"품번": "P-1", "수량": 3}]
+    assert events[1]["job"]["status"] == JOB_DONE
+
+    status, body = _request(server, f"/jobs/{job['id']}/result")
+    assert status == 200 and json.loads(body)["filename"] == "order.png"
+
+    health = json.loads(_request(server, "/health")[1])
+    assert health["status"] == "ok" and health["jobs"] == {JOB_DONE: 1}
+    assert health["pages"] == 1 and health["backends"] == ["gated"]
+
+
+def test_rejects_bad_requests(server):
+    """파일명이 없거나 없는 작업을 조회하면 오류를 돌려주는지 테스트"""
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(server, "/jobs?filename=notes.txt", b"text")
+    assert error.value.code == 400
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(server, "/jobs/0123abcd")
+    assert error.value.code == 404
+
+
+def test_rejects_negative_content_length(server):
+    """Content-Length가 음수면 본문을 읽지 않고 바로 400을 돌려주는지 테스트"""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        connection.putrequest("POST", "/jobs?filename=order.png")
+        connection.putheader("Content-Length", "-1")
+        connection.endheaders()
+        assert connection.getresponse().status == 400
+    finally:
+        connection.close()
+
+
+def test_queue_is_bounded_and_jobs_cancel(tmp_path):
+    """대기열이 가득 차면 거부하고, 대기 중인 작업은 취소되는지 테스트"""
+    backend = GatedBackend()
+    backend.gate.clear()
+    service = JobService(_processor(tmp_path, backend), workers=1, max_queue=1,
+                         upload_dir=str(tmp_path / "uploads"))
+    try:
+        running = service.submit("a.png", b"a")
+        deadline = time.monotonic() + 5
+        while running.status != "running" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        waiting = service.submit("b.png", b"b")
+        with pytest.raises(QueueFullError):
+            service.submit("c.png", b"c")
+        assert service.health()["queue_depth"] == 1
+
+        service.cancel(waiting.id)
+        backend.gate.set()
+    finally:
+        service.close()
+    assert running.status == JOB_DONE
+    assert waiting.status == "cancelled" and waiting.document is None
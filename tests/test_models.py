@@ -1,6 +1,7 @@
 import pytest
-from src.models.order_item import OrderItem
+from src.models.order_item import OrderItem, normalize_quantity
 from src.models.document import ProcessedDocument, DocumentPage
+from src.models.item_store import ItemStore
 
 
 def test_order_item_creation():
@@ -47,4 +48,99 @@ def test_processed_document():
     
     assert doc.total_items == 2
     assert len(doc.all_items) == 2
-    assert doc.all_items[0].product_code == "PART-A"
\ No newline at end of file
+    assert doc.all_items[0].product_code == "PART-A"
+
+def test_order_item_slots():
+    """OrderItem은 인스턴스 __dict__ 없이 슬롯만 사용"""
+    item = OrderItem("ABC-123", 10)
+    assert not hasattr(item, "__dict__")
+
+
+def test_item_store_interning():
+    """ItemStore 품번 중복 저장 방지 및 순회 테스트"""
+    doc = ProcessedDocument(
+        filename="test.pdf",
+        document_type="PDF",
+        total_pages=2,
+        pages=[
+            DocumentPage(1, [OrderItem("PART-A", 10), OrderItem("PART-B", 5)], {}),
+            DocumentPage(2, [OrderItem("PART-A", 3)], {}),
+        ]
+    )
+    store = ItemStore.from_documents([doc, doc])
+
+    assert len(store) == 6
+    assert store.codes == ["PART-A", "PART-B"]
+    assert store.total_quantity == 36
+    assert list(store)[2] == OrderItem("PART-A", 3)
+    assert list(store.iter_rows())[2] == ("test.pdf", 2, "PART-A", 3)
+
+
+def test_processed_document_cache_follows_page_updates():
+    """집계 값은 캐시되고 set_pages / replace_page로 페이지를 바꾸면 다시 계산되는지 테스트"""
+    doc = ProcessedDocument("test.pdf", "PDF", 2, [
+        DocumentPage(1, [OrderItem("PART-A", 10)], {}),
+        DocumentPage(2, [], {"status": "failed"}),
+    ])
+
+    assert doc.total_items == 1
+    assert doc.total_quantity == 10
+    assert doc.item_store is doc.item_store
+    items = doc.all_items
+    assert isinstance(items, list)
+    items.append(OrderItem("EXTRA", 1))
+    assert len(doc.all_items) == 1  # 반환된 리스트를 바꿔도 문서는 그대로
+
+    doc.replace_page(DocumentPage(2, [OrderItem("PART-B", 5)], {}))
+    assert doc.total_items == 2
+    assert doc.total_quantity == 15
+    assert [item.product_code for item in doc.all_items] == ["PART-A", "PART-B"]
+
+    doc.set_pages([DocumentPage(1, [OrderItem("PART-C", 1)], {})])
+    assert doc.all_items == [OrderItem("PART-C", 1)]
+    assert list(doc.item_store) == [OrderItem("PART-C", 1)]
+    assert ProcessedDocument.from_dict(doc.to_dict()).to_dict() == doc.to_dict()
+
+
+def test_normalize_quantity():
+    """수량 정규화 테스트"""
+    assert normalize_quantity("1,200") == 1200
+    assert normalize_quantity("12 EA") == 12
+    assert normalize_quantity("１２") == 12
+    assert normalize_quantity("３ 개") == 3
+    assert normalize_quantity(7.0) == 7
+    assert normalize_quantity("미정") is None
+    assert normalize_quantity("1,2") is None
+    assert normalize_quantity(-3) is None
+    assert normalize_quantity(None) is None
+
+
+def test_parse_page_flags_invalid_rows():
+    """페이지 일괄 파싱 시 잘못된 행은 0으로 바꾸지 않고 표시"""
+    data = '[{"품번": "A-1", "수량": 5}, {"품번": "B-2", "수량": "1,200"},' \
+           ' {"품번": "C-3", "수량": "??"}, {"수량": 3}, "text"]'
+    result = OrderItem.parse_page(data)
+
+    assert result.items == [OrderItem("A-1", 5), OrderItem("B-2", 1200)]
+    assert [row["reason"] for row in result.invalid_rows] == [
+        "invalid_quantity", "missing_product_code", "not_an_object"
+    ]
+    assert result.stats.to_dict() == {
+        "total_rows": 5, "valid_rows": 2, "invalid_rows": 3, "normalized_rows": 1
+    }
+
+
+def test_parse_page_invalid_json():
+    """JSON이 아닌 응답 처리 테스트"""
+    result = OrderItem.parse_page("not json")
+    assert result.items == []
+    assert result.invalid_rows[0]["reason"] == "invalid_json"
+
+
+def test_parse_page_rejects_non_array_json():
+    """배열이 아닌 JSON(null / 숫자 / 문자열)을 예외 없이 잘못된 응답으로 처리하는지 테스트"""
+    for text in ("null", "42", '"DMCA-8N-SA"'):
+        result = OrderItem.parse_page(text)
+        assert result.items == []
+        assert result.invalid_rows[0]["reason"] == "not_an_array"
+        assert result.stats.invalid_rows == 1
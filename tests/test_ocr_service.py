@@ -1,6 +1,12 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
-from src.core.ocr_service import MockOCRService, OCRService
+from src.config.runtime import RuntimeConfig
+from src.core.ocr_service import MockOCRService, OCRService, RealOCRService
 from src.models.order_item import OrderItem
+from src.utils.cancellation import CancellationToken, OperationCancelled
 
 
 def test_mock_ocr_service():
@@ -19,4 +25,35 @@ def test_ocr_service_factory():
     assert service.service is not None
     
     # 모킹 모드이므로 MockOCRService여야 함
-    assert isinstance(service.service, MockOCRService)
\ No newline at end of file
+    assert isinstance(service.service, MockOCRService)
+
+
+def test_real_service_aborts_request_on_cancel(tmp_path):
+    """취소하면 응답을 기다리던 API 요청의 연결을 끊고 바로 돌아오는지 테스트"""
+    release = threading.Event()
+
+    class StalledHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            release.wait(10)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StalledHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    image = tmp_path / "page.png"
+    image.write_bytes(b"image")
+    service = RealOCRService(config=RuntimeConfig(api_key="test"))
+    service.api_url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+    try:
+        start = time.perf_counter()
+        with pytest.raises(OperationCancelled):
+            service.process_image_detailed(str(image), token)
+        assert time.perf_counter() - start < 2.0
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pytest
+
+from src.utils import pdf_converter
+from src.utils.pdf_converter import PDFConverter, page_ranges
+
+
+def test_page_ranges():
+    """페이지 범위 분할 테스트"""
+    assert page_ranges(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert page_ranges(3, 8) == [(0, 3)]
+    assert page_ranges(0, 8) == []
+    assert page_ranges(2, 0) == [(0, 1), (1, 2)]
+
+
+def test_pymupdf_parallel_render_keeps_page_order(tmp_path):
+    """작업자 프로세스로 렌더링해도 페이지 순서가 유지되는지 테스트"""
+    fitz = pytest.importorskip("fitz")
+    pdf_path = str(tmp_path / "order.pdf")
+    with fitz.open() as doc:
+        for number in range(5):
+            doc.new_page().insert_text((72, 72), f"PAGE {number + 1}")
+        doc.save(pdf_path)
+
+    converter = PDFConverter(dpi=50, render_workers=2, chunk_pages=2)
+    image_paths, page_count = converter.convert_to_images(pdf_path, str(tmp_path))
+    assert page_count == 5
+    assert [os.path.basename(path) for path in image_paths] == [f"page_{n}.png" for n in range(1, 6)]
+    assert all(os.path.exists(path) for path in image_paths)
+
+
+def test_pdf2image_renders_in_page_range_chunks(tmp_path, monkeypatch):
+    """pdf2image 백엔드가 페이지 범위씩 파일로만 렌더링하는지 테스트"""
+    calls = []
+
+    def fake_convert(pdf_path, **options):
+        calls.append(options)
+        paths = []
+        for page in range(options["first_page"], options["last_page"] + 1):
+            path = os.path.join(options["output_folder"], f"{options['output_file']}-{page:02d}.jpg")
+            open(path, "wb").close()
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(pdf_converter, "pdfinfo_from_path", lambda pdf_path: {"Pages": 5})
+    monkeypatch.setattr(pdf_converter, "convert_from_path", fake_convert)
+    converter = PDFConverter(dpi=100, render_workers=4, chunk_pages=2)
+    image_paths = list(converter.iter_pdf2image_images("order.pdf", str(tmp_path)))
+
+    assert [os.path.basename(path) for path in image_paths] == [f"page_{n}.jpg" for n in range(1, 6)]
+    assert [(call["first_page"], call["last_page"]) for call in calls] == [(1, 2), (3, 4), (5, 5)]
+    assert all(call["paths_only"] and call["thread_count"] <= 2 for call in calls)
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in image_paths)
+
+
+@pytest.mark.skipif(not shutil.which("pdftoppm"), reason="Poppler가 설치되지 않음")
+def test_pdf2image_render_with_poppler(tmp_path):
+    """Poppler로 실제 PDF를 페이지 범위씩 렌더링하는 테스트"""
+    from PIL import Image
+    pdf_path = str(tmp_path / "order.pdf")
+    pages = [Image.new("RGB", (200, 100), "white") for _ in range(3)]
+    pages[0].save(pdf_path, save_all=True, append_images=pages[1:])
+
+    output_folder = tmp_path / "images"
+    output_folder.mkdir()
+    image_paths = list(PDFConverter(dpi=50, chunk_pages=2).iter_pdf2image_images(pdf_path, str(output_folder)))
+    assert [os.path.basename(path) for path in image_paths] == ["page_1.jpg", "page_2.jpg", "page_3.jpg"]
+
+
+def test_probe_pdf_and_image(tmp_path):
+    """렌더링 없이 PDF / 이미지 페이지 수와 크기를 읽는지 테스트"""
+    from PIL import Image
+    pdf_path = str(tmp_path / "order.pdf")
+    pages = [Image.new("RGB", (300, 150), "white"), Image.new("RGB", (150, 300), "white")]
+    pages[0].save(pdf_path, save_all=True, append_images=pages[1:], resolution=150)
+
+    probe = pdf_converter.probe_document(pdf_path, dpi=300)
+    assert probe.document_type == "PDF" and probe.page_count == 2
+    assert [(page.width, page.height) for page in probe.pages] == [(144, 72), (72, 144)]
+    assert probe.pages[0].render_size(300) == (600, 300)
+    assert probe.text_pages == 0 and not probe.encrypted
+
+    image_path = str(tmp_path / "scan.png")
+    Image.new("RGB", (800, 600), "white").save(image_path)
+    image_probe = pdf_converter.probe_document(image_path)
+    assert image_probe.document_type == "IMAGE" and image_probe.page_count == 1
+    assert image_probe.render_megapixels == 0.48
+    assert image_probe.to_dict()["page_sizes"] == [[800, 600]]
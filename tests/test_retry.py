@@ -0,0 +1,67 @@
+from src.config.runtime import RuntimeConfig
+from src.core.backends import CAP_IMAGE, OCRBackend
+from src.core.checkpoint import CheckpointJournal
+from src.core.document_processor import DocumentProcessor
+from src.core.ocr_service import OCRResult
+from src.core.triage import PageInput
+from src.models.document import ProcessedDocument
+from src.models.order_item import OrderItem
+
+
+class FlakyPageBackend(OCRBackend):
+    """지정한 페이지들에서 실패하는 테스트용 백엔드"""
+    name = "flaky_page"
+    capabilities = frozenset({CAP_IMAGE})
+    max_concurrency = 2
+
+    def __init__(self, fail_pages=()):
+        super().__init__()
+        self.fail_pages = set(fail_pages)
+        self.processed = []
+
+    def estimate_cost(self, page):
+        return 0.01
+
+    def process_page(self, page):
+        if page.page_number in self.fail_pages:
+            raise TimeoutError(f"{page.page_number}페이지 시간 초과")
+        self.processed.append(page.page_number)
+        return OCRResult([OrderItem(f"P-{page.page_number}", page.page_number)], 0.01)
+
+
+def _processor(tmp_path, backend):
+    return DocumentProcessor(catalog=None, backends=[backend], config=RuntimeConfig(),
+                             checkpoints=CheckpointJournal(str(tmp_path / "checkpoints")))
+
+
+def test_failed_page_keeps_other_pages(tmp_path):
+    """한 페이지가 실패해도 나머지 페이지 결과가 유지되는지 테스트"""
+    processor = _processor(tmp_path, FlakyPageBackend(fail_pages={2}))
+    pages = processor._process_pages([PageInput(number, f"missing_{number}.png") for number in range(1, 5)])
+    assert [page.page_number for page in pages] == [1, 2, 3, 4]
+    assert pages[1].items == [] and pages[1].raw_content["status"] == "failed"
+    assert pages[1].raw_content["error_type"] == "TimeoutError"
+    assert [page.items[0].product_code for page in pages if page.items] == ["P-1", "P-3", "P-4"]
+
+
+def test_retry_failed_pages_merges_into_document(tmp_path):
+    """실패한 페이지만 다시 처리해 기존 문서에 합치는지 테스트"""
+    image = tmp_path / "order.png"
+    image.write_bytes(b"image")
+    backend = FlakyPageBackend(fail_pages={1})
+    processor = _processor(tmp_path, backend)
+
+    document = processor.process_document(str(image))
+    assert [page.page_number for page in document.pages_to_retry] == [1]
+    assert processor.completed_document(str(image)) is None
+
+    # 저장된 결과 파일에서 불러온 문서도 다시 처리 가능
+    document = ProcessedDocument.from_dict(document.to_dict())
+    backend.fail_pages.clear()
+    retried = processor.retry_failed_pages(document, str(image))
+    assert retried is document and document.pages_to_retry == []
+    assert document.total_items == 1 and document.all_items[0].product_code == "P-1"
+    assert document.processing_cost == 0.01
+    assert processor.completed_document(str(image)).total_items == 1
+    assert processor.retry_failed_pages(document, str(image)) is document
+    assert backend.processed == [1]
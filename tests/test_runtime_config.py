@@ -0,0 +1,76 @@
+import json
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.config.runtime import RuntimeConfig
+from src.config.settings import AppSettings, FileSettingsStore
+from src.core.backends import OpenAIBackend, create_backends
+from src.core.document_processor import DocumentProcessor
+
+
+def _describe(config):
+    """작업자 프로세스에서 설정 값 확인"""
+    return config.model_name, config.max_concurrency, config.calculate_cost(1000000, 0)
+
+
+def test_config_from_settings_and_overrides(tmp_path):
+    """앱 설정 스냅샷 생성 및 작업별 값 변경 테스트"""
+    settings = AppSettings(FileSettingsStore(str(tmp_path / "settings.json")))
+    settings.model_name = "gpt-4o"
+    settings.max_concurrency = 6
+    config = RuntimeConfig.from_settings(settings)
+    assert (config.model_name, config.max_concurrency, config.dpi) == ("gpt-4o", 6, 300)
+
+    changed = config.with_overrides(model="gpt-4.1-nano", max_concurrency="2", dpi=None, mock_mode="false")
+    assert (changed.model_name, changed.max_concurrency, changed.dpi, changed.mock_mode) == \
+        ("gpt-4.1-nano", 2, 300, False)
+    assert config.model_name == "gpt-4o"  # 원본은 그대로
+    with pytest.raises(AttributeError):
+        config.model_name = "other"
+    with pytest.raises(ValueError):
+        config.with_overrides(unknown=1)
+
+
+def test_settings_cost_uses_runtime_config(tmp_path):
+    """앱 설정의 단가 / 비용 계산이 RuntimeConfig와 같은 값을 주는지 테스트"""
+    settings = AppSettings(FileSettingsStore(str(tmp_path / "settings.json")))
+    settings.model_name = "gpt-4o"
+    settings.input_cost_per_million = 3.0
+    config = RuntimeConfig.from_settings(settings)
+    for model_name in (None, "gpt-4o", "gpt-4.1-nano", "unknown-model"):
+        assert settings.model_prices(model_name) == config.model_prices(model_name)
+        assert settings.calculate_cost(1000, 500, model_name) == config.calculate_cost(1000, 500, model_name)
+    assert settings.model_prices() == config.model_prices() == (3.0, 0.4)
+    assert settings.format_cost(0.5) == config.format_cost(0.5)
+
+
+def test_config_load_file_and_env(tmp_path, monkeypatch):
+    """작업 설정 파일 < 환경 변수 < 인자 우선순위 테스트"""
+    path = tmp_path / "job.json"
+    path.write_text(json.dumps({"dpi": 200, "model": "gpt-4.1-mini", "max_concurrency": 3}), encoding="utf-8")
+    monkeypatch.setenv("DKLOK_DPI", "150")
+    config = RuntimeConfig.load(str(path), max_concurrency=8)
+    assert (config.dpi, config.model_name, config.max_concurrency) == (150, "gpt-4.1-mini", 8)
+
+
+def test_config_is_picklable_for_process_pool():
+    """설정을 프로세스 풀 작업자에 전달할 수 있는지 테스트"""
+    config = RuntimeConfig(model_name="gpt-4o-mini", max_concurrency=5, input_cost=0.15)
+    assert pickle.loads(pickle.dumps(config)) == config
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        assert executor.submit(_describe, config).result() == ("gpt-4o-mini", 5, 0.15)
+
+
+def test_config_passed_to_pipeline():
+    """처리기 / 백엔드가 전달받은 설정을 사용하는지 테스트"""
+    config = RuntimeConfig(api_key="sk-test", mock_mode=False, max_concurrency=7, dpi=150)
+    backends = create_backends(["openai"], config=config)
+    assert isinstance(backends[0], OpenAIBackend) and backends[0].max_concurrency == 7
+    assert backends[0].service.config is config
+
+    processor = DocumentProcessor(catalog=None, config=RuntimeConfig(mock_mode=True, dpi=150))
+    assert processor.pdf_converter.dpi == 150
+    assert [backend.name for backend in processor.scheduler.backends] == ["cache", "mock"]
@@ -0,0 +1,57 @@
+import datetime
+from src.core.search_index import SearchIndex
+from src.models.order_item import OrderItem
+from src.models.document import ProcessedDocument, DocumentPage
+from src.utils.file_utils import append_jsonl_result
+
+
+def make_document(filename, codes):
+    """테스트용 문서 생성"""
+    items = [OrderItem(code, n + 1) for n, code in enumerate(codes)]
+    return ProcessedDocument(filename, "PDF", 1, [DocumentPage(1, items, {})])
+
+
+def test_substring_and_prefix_search(tmp_path):
+    """부분 일치 / 앞부분 일치 검색 테스트"""
+    index = SearchIndex(str(tmp_path / "history.db"))
+    index.add_document(make_document("a.pdf", ["DMCA-8N-SA", "DMCA-12N-SA"]), date="2025-01-10")
+    index.add_document(make_document("b.pdf", ["XDMCA-8N-SA", "PART-001"]), date="2025-03-02")
+
+    hits = index.search("dmca–8n-sa")
+    assert sorted(hit.filename for hit in hits) == ["a.pdf", "b.pdf"]
+
+    hits = index.search("DMCA", prefix=True)
+    assert sorted(hit.product_code for hit in hits) == ["DMCA-12N-SA", "DMCA-8N-SA"]
+
+    hits = index.search("8N", date_from=datetime.date(2025, 3, 1))
+    assert [(hit.filename, hit.page, hit.quantity) for hit in hits] == [("b.pdf", 1, 1)]
+
+
+def test_add_archive_skips_duplicates(tmp_path, monkeypatch):
+    """보관 파일은 한 번만 색인되는지 테스트"""
+    monkeypatch.setenv("DKLOK_DATA_DIR", str(tmp_path / "data"))
+    archive = append_jsonl_result(make_document("a.pdf", ["DMCA-4N-SA"]).to_dict(), str(tmp_path))
+    index = SearchIndex(str(tmp_path / "history.db"))
+
+    assert index.add_archive(archive) == 1
+    assert index.add_archive(archive) == 0
+    assert index.search("4N-SA")[0].date == datetime.date.today().isoformat()
+
+
+def test_same_document_is_indexed_once(tmp_path, monkeypatch):
+    """같은 문서를 다시 색인하거나 결과 파일로 색인해도 항목이 한 벌만 남는지 테스트"""
+    monkeypatch.setenv("DKLOK_DATA_DIR", str(tmp_path / "data"))
+    index = SearchIndex(str(tmp_path / "history.db"))
+    document = make_document("a.pdf", ["DMCA-8N-SA"])
+    document.source_key = "abc123:def456"
+
+    assert index.add_document(document, doc_key=document.source_key) == 1
+    # 다시 처리해 항목이 바뀐 문서는 이전 항목을 교체
+    document.set_pages([DocumentPage(1, [OrderItem("DMCA-8N-SA", 5), OrderItem("PART-001", 2)], {})])
+    assert index.add_document(document, doc_key=document.source_key) == 2
+    archive = append_jsonl_result(document.to_dict(), str(tmp_path))
+    assert index.add_archive(archive) == 0
+
+    hits = index.search("8N-SA")
+    assert [(hit.filename, hit.quantity) for hit in hits] == [("a.pdf", 5)]
+    assert index.entry_count == 2
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+
+from src.config.runtime import RuntimeConfig
+from src.config.settings import AppSettings, FileSettingsStore
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# CLI 시작 시 불러오는 모듈 전체의 import 시간 상한 (초, 느린 CI 환경 고려)
+IMPORT_TIME_LIMIT = 1.0
+
+# main을 불러오기만 했을 때는 없어야 하는 모듈 (해당 모드 함수에서 불러옴)
+LAZY_MODULES = [
+    "src.core.document_processor", "src.core.job_server", "src.core.hot_folder", "src.core.search_index",
+    "src.utils.exporters", "src.utils.archive_reader", "src.core.cascade", "src.core.hedging",
+    "src.core.budget", "src.core.estimator", "src.core.aggregation",
+    "http.server", "sqlite3", "ctypes", "requests",
+]
+
+
+def _import_profile(tmp_path):
+    """새 인터프리터에서 main을 불러오고 import 시간 / 불러온 모듈 목록 반환"""
+    code = "import sys, main; print(','.join(sorted(sys.modules)))"
+    env = dict(os.environ, DKLOK_DATA_DIR=str(tmp_path))
+    env.pop("QT_QPA_PLATFORM", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    # -X importtime 출력: "import time: self | cumulative | module"
+    total_us = sum(
+        int(line.split("|")[1])
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[1].strip().isdigit()
+        and not line.split("|")[2].startswith("  ")  # 최상위 모듈만 (하위 모듈은 들여쓰기됨)
+    )
+    return total_us / 1_000_000, completed.stdout.strip().split(",")
+
+
+def test_cli_import_does_not_load_qt(tmp_path):
+    """CLI 진입점을 불러올 때 PyQt5 / GUI 모듈을 불러오지 않는지, import 시간이 상한 이내인지 테스트"""
+    seconds, modules = _import_profile(tmp_path)
+    assert not [name for name in modules if name.startswith("PyQt5")]
+    assert not [name for name in modules if name.startswith("src.gui")]
+    assert [name for name in LAZY_MODULES if name in modules] == []
+    assert seconds < IMPORT_TIME_LIMIT
+
+
+def test_bad_env_value_falls_back_to_default(tmp_path, monkeypatch, capsys):
+    """잘못된 DKLOK_* 숫자 값이 있어도 설정을 불러오고 경고 후 기본값을 사용하는지 테스트"""
+    monkeypatch.setenv("DKLOK_MAX_CONCURRENCY", "many")
+    monkeypatch.setenv("DKLOK_INPUT_COST", "abc")
+    monkeypatch.setenv("DKLOK_DPI", "high")
+    settings = AppSettings(FileSettingsStore(str(tmp_path / "settings.json")))
+    assert settings.max_concurrency == 4 and settings.input_cost_per_million == 0.1
+    assert "max_concurrency" in capsys.readouterr().out
+
+    config = RuntimeConfig.load()
+    assert config.max_concurrency == 4 and config.dpi == 300
+    assert "DKLOK_DPI" in capsys.readouterr().out
+
+
+def test_file_settings_store_roundtrip(tmp_path, monkeypatch):
+    """설정 파일 저장 / 불러오기 및 환경 변수 우선 적용 테스트"""
+    path = str(tmp_path / "settings.json")
+    settings = AppSettings(FileSettingsStore(path))
+    settings.max_concurrency = 8
+    settings.mock_mode = False
+    settings.save_settings()
+
+    loaded = AppSettings(FileSettingsStore(path))
+    assert loaded.max_concurrency == 8 and loaded.mock_mode is False
+
+    # 환경 변수 값이 우선하고, 저장할 때 파일에 기록되지 않음
+    monkeypatch.setenv("DKLOK_API_KEY", "sk-env")
+    from_env = AppSettings(FileSettingsStore(path))
+    assert from_env.api_key == "sk-env"
+    from_env.save_settings()
+    assert "sk-env" not in open(path, encoding="utf-8").read()
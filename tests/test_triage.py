@@ -0,0 +1,120 @@
+import pytest
+
+from src.core.ocr_service import OCRResult
+from src.core.triage import (PAGE_BLANK, PAGE_NON_TABLE, PAGE_SCANNED, PAGE_TEXT, PageClassifier,
+                             PageInput, PageRouter, create_default_router, parse_text_layer,
+                             text_layer_handler)
+from src.models.order_item import OrderItem
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _save_image(path, draw_func=None):
+    image = Image.new("L", (850, 1100), 255)
+    if draw_func:
+        draw_func(ImageDraw.Draw(image))
+    image.save(path)
+    return str(path)
+
+
+def _draw_table(draw):
+    for y in range(100, 900, 80):
+        draw.line([(50, y), (800, y)], fill=0, width=3)
+    for x in (50, 400, 800):
+        draw.line([(x, 100), (x, 900)], fill=0, width=3)
+
+
+def _draw_text_blocks(draw):
+    for y in range(100, 600, 40):
+        for x in range(80, 700, 60):
+            draw.rectangle([x, y, x + 30, y + 12], fill=0)
+
+
+def test_classify_pages(tmp_path):
+    """텍스트 / 빈 페이지 / 표 / 표 없음 분류 테스트"""
+    classifier = PageClassifier()
+    blank = _save_image(tmp_path / "blank.png")
+    table = _save_image(tmp_path / "table.png", _draw_table)
+    letter = _save_image(tmp_path / "letter.png", _draw_text_blocks)
+
+    assert classifier.classify(PageInput(1, blank, "DMCA-8N-SA 7\nDMCA-4N-SA 22")).page_type == PAGE_TEXT
+    assert classifier.classify(PageInput(1, blank)).page_type == PAGE_BLANK
+    assert classifier.classify(PageInput(1, table)).page_type == PAGE_SCANNED
+    assert classifier.classify(PageInput(1, letter)).page_type == PAGE_NON_TABLE
+    # 읽을 수 없는 이미지는 OCR로 보냄
+    assert classifier.classify(PageInput(1, str(tmp_path / "missing.png"))).page_type == PAGE_SCANNED
+
+
+def test_parse_text_layer():
+    """텍스트 레이어 행 파싱 테스트"""
+    text = "주문서\nNo 품번 수량\n1 DMCA-8N-SA 커넥터 7\n2 DMCA-12N-SA 12 EA\n합계 19"
+    assert parse_text_layer(text) == ([
+        {"품번": "DMCA-8N-SA", "수량": "7"},
+        {"품번": "DMCA-12N-SA", "수량": "12 EA"},
+    ], [])
+
+
+def test_parse_text_layer_ignores_price_columns():
+    """머리글의 수량 열 위치로 뒤의 단가 / 금액 열을 건너뛰고, 수량이 없는 품번 줄은 OCR로 넘기는지 테스트"""
+    text = "품번 품명 수량 단가 금액\nDMCA-8N-SA 316 Union 5 EA 1,250 6,250\nDMCA-4N-SA 3 12 36"
+    rows, invalid_rows = parse_text_layer(text)
+    assert rows == [{"품번": "DMCA-8N-SA", "수량": "5 EA"}, {"품번": "DMCA-4N-SA", "수량": "3"}]
+    assert invalid_rows == []
+
+    text = "DMCA-8N-SA 7\nDMCA-4N-SA 미정"
+    rows, invalid_rows = parse_text_layer(text)
+    assert rows == [{"품번": "DMCA-8N-SA", "수량": "7"}]
+    assert invalid_rows == [{"row": 2, "data": {"line": "DMCA-4N-SA 미정"}, "reason": "no_quantity"}]
+    assert text_layer_handler(PageInput(1, "page.png", text)) is None
+
+
+def test_parse_text_layer_ambiguous_numbers_go_to_ocr():
+    """머리글 없이 품번 뒤에 숫자가 여러 개면(규격 숫자 등) 수량으로 추측하지 않고 OCR로 넘기는지 테스트"""
+    text = "DMCA-8N-SA 316 Union 10"
+    rows, invalid_rows = parse_text_layer(text)
+    assert rows == []
+    assert invalid_rows == [{"row": 1, "data": {"line": text}, "reason": "ambiguous_quantity"}]
+    assert text_layer_handler(PageInput(1, "page.png", text)) is None
+    # 머리글로 수량 열이 마지막 열임을 알 수 있으면 마지막 숫자를 수량으로 사용
+    assert parse_text_layer("품번 규격 품명 수량\n" + text) == ([{"품번": "DMCA-8N-SA", "수량": "10"}], [])
+
+
+def test_default_router(tmp_path):
+    """기본 경로 및 OCR 대체 테스트"""
+    calls = []
+
+    def ocr_handler(page):
+        calls.append(page.page_number)
+        return OCRResult([OrderItem("OCR-1", 1)], 0.01)
+
+    router = create_default_router(ocr_handler)
+    blank = _save_image(tmp_path / "blank.png")
+
+    result, triage = router.process(PageInput(1, blank, "DMCA-8N-SA 7 EA\n" * 3))
+    assert [item.product_code for item in result.items] == ["DMCA-8N-SA"] * 3
+    assert triage["route"] == "text_layer" and result.cost == 0.0
+
+    result, triage = router.process(PageInput(2, blank))
+    assert triage["route"] == "skip" and result.items == []
+
+    # 텍스트 레이어에서 항목을 찾지 못하면 OCR로 처리
+    result, triage = router.process(PageInput(3, blank, "이 페이지는 표지입니다. 주문 내역은 다음 페이지."))
+    assert triage["route"] == "ocr" and triage["fallback"]
+    assert calls == [3]
+
+
+def test_register_route(tmp_path):
+    """새 페이지 유형 경로 등록 테스트"""
+    class StampClassifier(PageClassifier):
+        def _classify(self, page):
+            decision = super()._classify(page)
+            if decision.page_type == PAGE_BLANK:
+                decision.page_type = "stamp"
+            return decision
+
+    router = PageRouter(lambda page: OCRResult([], 0.01), StampClassifier())
+    router.register("stamp", "stamp_check", lambda page: OCRResult([OrderItem("STAMP-1", 1)], 0.0))
+    result, triage = router.process(PageInput(1, _save_image(tmp_path / "blank.png")))
+    assert triage["page_type"] == "stamp" and triage["route"] == "stamp_check"
+    assert result.items[0].product_code == "STAMP-1"